@@ -0,0 +1,278 @@
+"""
+Agendador de Treinamento - Classificação de Vias
+================================================
+
+Executa o treinamento final e as dobras da validação cruzada de todos os
+modelos como tarefas independentes em um único pool de processos, com
+limite explícito de threads por tarefa (n_jobs dos estimadores e threads
+de BLAS/OpenMP via threadpoolctl). Isso evita a sobreinscrição de núcleos
+de RandomForest(n_jobs=-1) dentro de cross_val_score(n_jobs=-1) e deixa o
+tempo total próximo ao da tarefa mais longa.
+
+Cada modelo pode ter um orçamento de tempo (wall-clock): quando o
+treinamento e as dobras concluídas ultrapassam o orçamento, as dobras
+ainda não iniciadas são canceladas e o modelo é marcado.
+
+Com um cache de modelos (cache_modelos.ModelCache), o resultado de cada
+modelo é memoizado pelos dados, hiperparâmetros e configuração da validação
+cruzada, e modelos inalterados não geram tarefas.
+
+Com refit=False o treinamento final não é agendado: as dobras devolvem os
+estimadores treinados (como cross_validate(return_estimator=True)) e o
+modelo final é o estimador da última dobra concluída, treinado com
+(cv - 1) / cv dos dados de treino (80% com 5 dobras). A regra é fixa: a
+nota de validação da própria dobra não é usada na escolha.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
+
+# Dados de treino de cada processo do pool (definidos por _init_worker)
+_X = None
+_y = None
+_scorer = None
+
+# Dobras internas da calibração de SVC(probability=True) no libsvm
+SVC_CALIBRATION_FOLDS = 5
+
+
+def fits_per_call(estimator):
+    """
+    Número de treinamentos executados por uma chamada de fit: SVC com
+    probability=True treina mais SVC_CALIBRATION_FOLDS modelos para a
+    calibração de Platt.
+    """
+    return 1 + (SVC_CALIBRATION_FOLDS if getattr(estimator, 'probability', False) else 0)
+
+
+def _init_worker(X, y, scoring=None):
+    global _X, _y, _scorer
+    _X, _y = X, y
+    _scorer = get_scorer(scoring) if scoring is not None else None
+
+
+def _run_task(task):
+    """
+    Executa uma tarefa: ('fit', None) treina no conjunto completo;
+    ('cv', dobra) treina na parte de treino da dobra e retorna a nota na
+    parte de validação (scoring, ou a acurácia de estimator.score como em
+    cross_val_score) e, com return_estimator, também o estimador treinado.
+    """
+    name, kind, fold, estimator, train_idx, val_idx, threads, return_estimator = task
+
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=threads)
+
+    start_wall = time.time()
+    start_cpu = time.process_time()
+    with threadpool_limits(limits=threads):
+        if kind == 'fit':
+            estimator.fit(_X, _y)
+            result = estimator
+        else:
+            estimator.fit(_X[train_idx], _y[train_idx])
+            if _scorer is None:
+                result = estimator.score(_X[val_idx], _y[val_idx])
+            else:
+                result = _scorer(estimator, _X[val_idx], _y[val_idx])
+
+    return {
+        'name': name, 'kind': kind, 'fold': fold, 'result': result,
+        'estimator': estimator if kind == 'cv' and return_estimator else None,
+        'start': start_wall, 'end': time.time(),
+        'cpu': time.process_time() - start_cpu
+    }
+
+
+class TrainingScheduler:
+    """
+    Treina e valida vários modelos como tarefas em um pool compartilhado.
+    """
+
+    def __init__(self, n_jobs=-1, threads_per_task=1, time_budget=None, cv=5, refit=True,
+                 scoring=None, cache=None):
+        """
+        Parâmetros:
+        -----------
+        n_jobs : int
+            Número de processos do pool (-1 usa todos os núcleos; 1 executa
+            as tarefas em sequência no próprio processo)
+        threads_per_task : int
+            Limite de threads de cada tarefa (n_jobs do estimador e BLAS)
+        time_budget : float or dict, opcional
+            Orçamento de tempo por modelo em segundos (único ou {nome: segundos})
+        cv : int
+            Número de dobras da validação cruzada estratificada
+        refit : bool
+            Se True, treina o modelo final no conjunto completo; se False,
+            reaproveita o estimador da última dobra concluída ((cv - 1) / cv
+            dos dados)
+        scoring : str, opcional
+            Métrica de validação (nome de sklearn.metrics.get_scorer); None
+            usa a acurácia (estimator.score)
+        cache : ModelCache, opcional
+            Cache dos resultados por modelo
+        """
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self.threads_per_task = threads_per_task
+        self.time_budget = time_budget
+        self.cv = cv
+        self.refit = refit
+        self.scoring = scoring
+        self.cache = cache
+        self.folds = []
+        self.summary = {}
+
+    def budget_for(self, name):
+        if isinstance(self.time_budget, dict):
+            return self.time_budget.get(name)
+        return self.time_budget
+
+    def tasks(self, models, y):
+        """
+        Tarefas de treinamento final (primeiro) e de cada dobra.
+        """
+        self.folds = list(StratifiedKFold(n_splits=self.cv).split(np.zeros(len(y)), y))
+
+        tasks = []
+        if self.refit:
+            tasks += [(name, 'fit', None, clone(model), None, None, self.threads_per_task, False)
+                      for name, model in models.items()]
+        for name, model in models.items():
+            tasks += [(name, 'cv', i, clone(model), train_idx, val_idx, self.threads_per_task,
+                       not self.refit)
+                      for i, (train_idx, val_idx) in enumerate(self.folds)]
+        return tasks
+
+    def run(self, models, X, y):
+        """
+        Executa todas as tarefas.
+
+        Parâmetros:
+        -----------
+        models : dict
+            {nome: estimador não treinado}
+        X, y : np.array
+            Dados de treino
+
+        Retorna:
+        --------
+        dict
+            {nome: {'model', 'model_fold', 'cv_scores', 'n_fits', 'fit_time',
+                    'cv_time', 'cpu_time', 'wall_time', 'cpu_utilisation',
+                    'budget_exceeded', 'cached'}}
+            model_fold é None para o modelo treinado no conjunto completo;
+            os tempos de um resultado do cache são os da execução original
+        """
+        X = np.asarray(X)
+        y = np.asarray(y)
+
+        cached, keys = {}, {}
+        if self.cache is not None:
+            for name, model in models.items():
+                # 'ultima_dobra': regra do modelo final com refit=False
+                keys[name] = self.cache.fingerprint('agendador', model, X, y, self.cv,
+                                                    self.refit or 'ultima_dobra', self.scoring)
+                entry = self.cache.get(keys[name])
+                if entry is not None:
+                    cached[name] = {**entry, 'cached': True}
+        pending_models = {name: model for name, model in models.items() if name not in cached}
+
+        tasks = self.tasks(pending_models, y)
+        outputs = {name: [] for name in pending_models}
+        exceeded = set()
+
+        start = time.time()
+        if tasks and self.n_jobs == 1:
+            _init_worker(X, y, self.scoring)
+            for task in tasks:
+                if task[0] in exceeded:
+                    continue
+                output = _run_task(task)
+                outputs[output['name']].append(output)
+                if self._over_budget(output['name'], outputs[output['name']]):
+                    exceeded.add(output['name'])
+        elif tasks:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                     initargs=(X, y, self.scoring)) as pool:
+                pending = {pool.submit(_run_task, task): task[0] for task in tasks}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.pop(future)
+                        output = future.result()
+                        name = output['name']
+                        outputs[name].append(output)
+
+                        if name not in exceeded and self._over_budget(name, outputs[name]):
+                            exceeded.add(name)
+                            for f in [f for f, n in pending.items() if n == name]:
+                                if f.cancel():
+                                    pending.pop(f)
+        wall_total = time.time() - start
+
+        results = {}
+        for name, model in models.items():
+            if name in cached:
+                results[name] = cached[name]
+                continue
+            results[name] = self._model_summary(outputs[name], name in exceeded, fits_per_call(model))
+            if self.cache is not None and name not in exceeded:
+                self.cache.put(keys[name], results[name])
+
+        executed = [results[name] for name in pending_models]
+        cpu_total = sum(r['cpu_time'] for r in executed)
+        self.summary = {
+            'wall_time': wall_total,
+            'cpu_time': cpu_total,
+            'n_fits': sum(r['n_fits'] for r in executed),
+            'n_cached': len(cached),
+            'n_workers': self.n_jobs,
+            'threads_per_task': self.threads_per_task,
+            'longest_task': max((o['end'] - o['start'] for out in outputs.values() for o in out), default=0.0),
+            'pool_utilisation': cpu_total / (wall_total * self.n_jobs * self.threads_per_task) if tasks else 0.0
+        }
+        return results
+
+    def _over_budget(self, name, outputs):
+        budget = self.budget_for(name)
+        if budget is None:
+            return False
+        return sum(o['end'] - o['start'] for o in outputs) > budget
+
+    @staticmethod
+    def _model_summary(outputs, budget_exceeded, fits_per_call):
+        fit = [o for o in outputs if o['kind'] == 'fit']
+        folds = sorted((o for o in outputs if o['kind'] == 'cv'), key=lambda o: o['fold'])
+
+        model, model_fold = (fit[0]['result'], None) if fit else (None, None)
+        fold_estimators = [o for o in folds if o['estimator'] is not None]
+        if model is None and fold_estimators:
+            # Regra fixa (última dobra), sem escolher pela nota da própria dobra
+            last = fold_estimators[-1]
+            model, model_fold = last['estimator'], last['fold']
+
+        fit_time = sum(o['end'] - o['start'] for o in fit)
+        cv_time = sum(o['end'] - o['start'] for o in folds)
+        cpu_time = sum(o['cpu'] for o in outputs)
+
+        return {
+            'model': model,
+            'model_fold': model_fold,
+            'cv_scores': np.array([o['result'] for o in folds]),
+            'n_fits': len(outputs) * fits_per_call,
+            'fit_time': fit_time,
+            'cv_time': cv_time,
+            'cpu_time': cpu_time,
+            'wall_time': (max(o['end'] for o in outputs) - min(o['start'] for o in outputs)) if outputs else 0.0,
+            'cpu_utilisation': cpu_time / (fit_time + cv_time) if fit_time + cv_time > 0 else 0.0,
+            'budget_exceeded': budget_exceeded,
+            'cached': False
+        }
@@ -2,8 +2,13 @@
 Análise Exploratória dos Dados - Classificação de Vias
 ========================================================
 
-Script complementar para análise e visualização dos dados brutos coletados
-dos sensores de acelerômetro.
+Script complementar para análise e visualização dos dados coletados dos
+sensores de acelerômetro.
+
+Os dados vêm de cache_dados.load_sensor_data: já limpos, com os valores
+faltantes interpolados linearmente, em float32 e só com relative_time e as
+colunas dos sensores. As estatísticas descrevem esses dados interpolados, e
+não as amostras brutas dos CSVs.
 """
 
 import pandas as pd
@@ -12,6 +17,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 
+from cache_dados import load_sensor_data
+
 # Configuração de estilo
 sns.set_style('whitegrid')
 plt.rcParams['figure.figsize'] = (15, 10)
@@ -25,14 +32,14 @@ def load_and_analyze(file_path, label, color):
     print(f"Análise: {label}")
     print('='*70)
     
-    # Carrega dados
-    df = pd.read_csv(file_path)
+    # Carrega dados limpos (cache binário dos CSVs)
+    df = load_sensor_data(file_path)
     
     # Informações básicas
     print(f"\nNúmero de amostras: {len(df)}")
     print(f"Duração (ms): {df['relative_time'].max() - df['relative_time'].min()}")
     
-    # Remove NaN para análise
+    # Dados já interpolados e sem NaN (load_sensor_data); dropna é só uma salvaguarda
     df_clean = df.dropna()
     
     # Estatísticas descritivas
@@ -255,6 +262,7 @@ def main():
     print("\n" + "="*70)
     print("ANÁLISE EXPLORATÓRIA DOS DADOS")
     print("="*70)
+    print("Estatísticas dos dados limpos e interpolados (float32), não das amostras brutas")
     
     # Caminhos dos arquivos
     base_path = '/home/augustomotta/Documentos/mestrado/Trabalho 2'
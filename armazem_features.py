@@ -0,0 +1,384 @@
+"""
+Armazém de Features - Classificação de Vias
+===========================================
+
+Persiste as matrizes de features janeladas em formato binário (.npy), uma
+entrada por configuração, indexada por:
+- hash do conteúdo de cada arquivo de origem (e sua classe)
+- window_size, overlap e frequência da grade de tempo (se houver)
+- versão do conjunto de features (extracao_features.FEATURE_SET_VERSION)
+
+Execuções e experimentos com uma configuração já vista carregam a matriz
+com memory-mapping em vez de recalcular as janelas. Cada entrada guarda
+também o feature_mapping (S1..Sn -> nome original da feature).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cache_dados import file_hash
+from extracao_features import FEATURE_SET_VERSION
+
+# Diretório padrão do armazém
+STORE_DIR = './resultados/cache/features'
+
+# CSV gerado por classificacao_vias.main (usado se o armazém estiver vazio)
+DADOS_ORGANIZADOS_CSV = './resultados/dados_processados/dados_organizados.csv'
+
+
+class FeatureStore:
+    """
+    Armazém de matrizes de features indexadas pela configuração que as gerou.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        """
+        Inicializa o armazém.
+
+        Parâmetros:
+        -----------
+        store_dir : str
+            Diretório onde as entradas são gravadas
+        """
+        self.store_dir = Path(store_dir)
+        self.index_path = self.store_dir / 'index.json'
+
+    def entry_params(self, processor, file_paths_and_labels):
+        """
+        Parâmetros que identificam uma entrada do armazém.
+
+        Parâmetros:
+        -----------
+        processor : DataProcessor
+            Processador com a configuração das janelas
+        file_paths_and_labels : list of tuples
+            Lista de tuplas (caminho_arquivo, rótulo_classe)
+
+        Retorna:
+        --------
+        dict
+            Parâmetros serializáveis em JSON
+        """
+        return {
+            'arquivos': [[Path(file_path).name, file_hash(file_path), label]
+                         for file_path, label in file_paths_and_labels],
+            'window_size': processor.window_size,
+            'overlap': processor.overlap,
+            'sample_rate_hz': processor.sample_rate_hz,
+            'versao_features': FEATURE_SET_VERSION
+        }
+
+    @staticmethod
+    def entry_key(params):
+        """
+        Chave da entrada: hash dos parâmetros.
+        """
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def get(self, key, mmap=True):
+        """
+        Carrega uma entrada do armazém.
+
+        Retorna:
+        --------
+        tuple or None
+            (DataFrame S1..Sn + Classe, feature_mapping), ou None se a entrada
+            não existir
+        """
+        entry = self._read_entry(key, mmap_mode='r' if mmap else None)
+        if entry is None:
+            return None
+        features, codes, meta = entry
+
+        df = pd.DataFrame(features, columns=meta['colunas'], copy=False)
+
+        # Colunas inteiras (dominant_freq) voltam ao tipo original
+        int_cols = [col for col, dtype in meta['tipos'].items() if dtype.startswith('int')]
+        if int_cols:
+            df = df.astype({col: meta['tipos'][col] for col in int_cols})
+
+        df['Classe'] = np.asarray(meta['classes'], dtype=object)[codes]
+        return df, meta['feature_mapping']
+
+    def get_arrays(self, key):
+        """
+        Carrega uma entrada como arrays, sem montar o DataFrame.
+
+        A matriz de features é aberta com memory-mapping (só as linhas lidas
+        vão para a memória), para treinamento fora da memória. Entradas com
+        percursos anexados (append) têm uma parte por percurso, concatenadas
+        na memória.
+
+        Retorna:
+        --------
+        tuple or None
+            (features (memmap n_janelas x n_features), códigos int8 das
+            classes, rótulos das classes, meta), ou None se a entrada não
+            existir
+        """
+        entry = self._read_entry(key, mmap_mode='r')
+        if entry is None:
+            return None
+        features, codes, meta = entry
+        return features, codes, np.asarray(meta['classes'], dtype=object), meta
+
+    def _read_entry(self, key, mmap_mode):
+        """
+        Features, códigos das classes e meta de uma entrada (None se não existir).
+        """
+        entry_dir = self.store_dir / key
+        if not (entry_dir / 'meta.json').exists():
+            return None
+
+        with open(entry_dir / 'meta.json') as f:
+            meta = json.load(f)
+
+        parts = meta.get('partes', [['features.npy', 'classes.npy']])
+        features = [np.load(entry_dir / features_file, mmap_mode=mmap_mode) for features_file, _ in parts]
+        codes = [np.load(entry_dir / codes_file, mmap_mode=mmap_mode) for _, codes_file in parts]
+        if len(parts) == 1:
+            return features[0], codes[0], meta
+        return np.concatenate(features), np.concatenate(codes), meta
+
+    def put(self, key, df, feature_mapping, params):
+        """
+        Grava uma matriz de features no armazém.
+
+        Parâmetros:
+        -----------
+        key : str
+            Chave da entrada (entry_key)
+        df : pd.DataFrame
+            DataFrame S1..Sn + Classe
+        feature_mapping : dict
+            Mapeamento S1..Sn -> nome original da feature
+        params : dict
+            Parâmetros da entrada (entry_params)
+        """
+        entry_dir = self.store_dir / key
+        tmp_dir = entry_dir.with_name(entry_dir.name + f'.tmp{os.getpid()}')
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        feature_cols = [col for col in df.columns if col != 'Classe']
+        classes, codes = np.unique(df['Classe'].to_numpy(dtype=str), return_inverse=True)
+
+        np.save(tmp_dir / 'features.npy', np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.float64)))
+        np.save(tmp_dir / 'classes.npy', codes.astype(np.int8))
+
+        meta = {
+            'parametros': params,
+            'colunas': feature_cols,
+            'tipos': {col: str(df[col].dtype) for col in feature_cols},
+            'classes': classes.tolist(),
+            'feature_mapping': feature_mapping,
+            'linhas': len(df)
+        }
+        with open(tmp_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+        try:
+            tmp_dir.rename(entry_dir)
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._update_index(key, params, len(df))
+
+    def _update_index(self, key, params, n_rows):
+        index = self._read_index()
+        index['entradas'][key] = {'parametros': params, 'linhas': n_rows, 'criado_em': time.time()}
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+
+    def _read_index(self):
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                return json.load(f)
+        return {'entradas': {}}
+
+    def find(self, window_size, overlap, sample_rate_hz=None):
+        """
+        Chave da entrada com a configuração de janelas pedida e a versão
+        atual das features.
+
+        Se houver mais de uma (conjuntos de arquivos diferentes), vale a
+        usada mais recentemente.
+
+        Parâmetros:
+        -----------
+        window_size, overlap : int
+            Tamanho da janela e sobreposição em número de amostras
+        sample_rate_hz : float, opcional
+            Frequência da grade de tempo (None para o alinhamento pelo índice)
+
+        Retorna:
+        --------
+        str or None
+            Chave da entrada, ou None se nenhuma tiver essa configuração
+        """
+        config = {'window_size': window_size, 'overlap': overlap, 'sample_rate_hz': sample_rate_hz,
+                  'versao_features': FEATURE_SET_VERSION}
+        entradas = [(entrada['criado_em'], key) for key, entrada in self._read_index()['entradas'].items()
+                    if all(entrada['parametros'].get(name) == value for name, value in config.items())
+                    and (self.store_dir / key / 'meta.json').exists()]
+        return max(entradas)[1] if entradas else None
+
+    def organize(self, processor, file_paths_and_labels, n_jobs=1):
+        """
+        Equivalente a processor.organize_data, reaproveitando o armazém.
+
+        Se a configuração já foi processada, a matriz é carregada do disco;
+        caso contrário é calculada e gravada. Em ambos os casos
+        processor.feature_mapping é preenchido.
+
+        Retorna:
+        --------
+        pd.DataFrame
+            DataFrame organizado (S1, S2, ..., Sn, Classe)
+        """
+        params = self.entry_params(processor, file_paths_and_labels)
+        key = self.entry_key(params)
+
+        entry = self.get(key)
+        if entry is not None:
+            df, processor.feature_mapping = entry
+            print(f"\nFeatures carregadas do armazém ({key}): {len(df)} janelas")
+            self._update_index(key, params, len(df))
+            return df
+
+        df = processor.organize_data(file_paths_and_labels, n_jobs=n_jobs)
+        self.put(key, df, processor.feature_mapping, params)
+        print(f"\nFeatures gravadas no armazém ({key})")
+        return df
+
+    def append(self, processor, file_paths_and_labels, new_files):
+        """
+        Anexa novos arquivos (percursos) a uma entrada do armazém.
+
+        Só as janelas dos arquivos novos são extraídas e gravadas: a entrada
+        de file_paths_and_labels + new_files reúne as partes (.npy) da
+        entrada de file_paths_and_labels, ligadas por hard link sem cópia, e
+        uma parte nova com as janelas novas. A entrada base não é alterada e a
+        nova é montada em um diretório temporário renomeado ao final, como em
+        put. O resultado é idêntico a organize sobre a lista completa (as
+        janelas de cada arquivo são independentes).
+
+        Parâmetros:
+        -----------
+        processor : DataProcessor
+            Processador com a configuração das janelas
+        file_paths_and_labels : list of tuples
+            Arquivos já presentes no armazém
+        new_files : list of tuples
+            Arquivos novos (caminho_arquivo, rótulo_classe)
+
+        Retorna:
+        --------
+        tuple
+            (DataFrame com todas as janelas, DataFrame só com as janelas novas)
+        """
+        params = self.entry_params(processor, list(file_paths_and_labels) + list(new_files))
+        key = self.entry_key(params)
+
+        base_params = self.entry_params(processor, file_paths_and_labels)
+        base_key = self.entry_key(base_params)
+        if not (self.store_dir / base_key / 'meta.json').exists():
+            self.organize(processor, file_paths_and_labels)
+
+        new_df = processor.organize_data(new_files)
+
+        # Se a lista completa já estiver no armazém, a entrada é reaproveitada
+        if not (self.store_dir / key / 'meta.json').exists():
+            self._append_rows(base_key, key, new_df, params)
+
+        df, processor.feature_mapping = self.get(key)
+        self._update_index(key, params, len(df))
+        print(f"\n{len(new_df)} janelas anexadas ao armazém ({key})")
+        return df, new_df
+
+    def _append_rows(self, base_key, key, new_df, params):
+        """
+        Grava a entrada key: partes da entrada base_key + uma parte com new_df.
+        """
+        base_dir = self.store_dir / base_key
+        with open(base_dir / 'meta.json') as f:
+            meta = json.load(f)
+
+        entry_dir = self.store_dir / key
+        tmp_dir = entry_dir.with_name(entry_dir.name + f'.tmp{os.getpid()}')
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        parts = meta.get('partes', [['features.npy', 'classes.npy']])
+        for part in parts:
+            for file_name in part:
+                _link_or_copy(base_dir / file_name, tmp_dir / file_name)
+
+        # Classes novas recebem os próximos códigos (os das partes antigas não mudam)
+        labels = new_df['Classe'].to_numpy(dtype=str)
+        meta['classes'] += sorted(set(labels) - set(meta['classes']))
+        codes = pd.Index(meta['classes']).get_indexer(labels).astype(np.int8)
+
+        new_part = [f'features_{len(parts)}.npy', f'classes_{len(parts)}.npy']
+        np.save(tmp_dir / new_part[0],
+                np.ascontiguousarray(new_df[meta['colunas']].to_numpy(dtype=np.float64)))
+        np.save(tmp_dir / new_part[1], codes)
+
+        meta['parametros'] = params
+        meta['partes'] = parts + [new_part]
+        meta['linhas'] += len(new_df)
+        with open(tmp_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+        try:
+            tmp_dir.rename(entry_dir)
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _link_or_copy(src, dst):
+    """
+    Hard link de src em dst (cópia se o sistema de arquivos não suportar).
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def carregar_dados_organizados(window_size=100, overlap=50, sample_rate_hz=None, store_dir=STORE_DIR,
+                               csv_path=DADOS_ORGANIZADOS_CSV):
+    """
+    Carrega os dados organizados com a configuração de janelas pedida
+    (armazém ou, na falta dele, o CSV).
+
+    O padrão é a configuração de classificacao_vias.main, que também gera o
+    CSV; outras configurações precisam estar no armazém.
+
+    Parâmetros:
+    -----------
+    window_size, overlap : int
+        Tamanho da janela e sobreposição em número de amostras
+    sample_rate_hz : float, opcional
+        Frequência da grade de tempo (None para o alinhamento pelo índice)
+
+    Retorna:
+    --------
+    pd.DataFrame
+        DataFrame com as colunas S1..Sn e Classe
+    """
+    store = FeatureStore(store_dir)
+    key = store.find(window_size, overlap, sample_rate_hz)
+    if key is not None:
+        return store.get(key)[0]
+
+    if (window_size, overlap, sample_rate_hz) != (100, 50, None):
+        raise FileNotFoundError(f"Nenhuma entrada do armazém com window_size={window_size}, "
+                                f"overlap={overlap}, sample_rate_hz={sample_rate_hz}")
+    return pd.read_csv(csv_path)
@@ -0,0 +1,466 @@
+"""
+Cache Binário dos Dados dos Sensores - Classificação de Vias
+============================================================
+
+Carregador único dos arquivos CSV em `dados/`, com cache colunar em disco.
+
+Na primeira leitura de cada arquivo os dados são limpos (interpolação linear
+dos sensores e remoção de NaN) e salvos como um arquivo .npy por coluna, com
+os sensores em float32. As execuções seguintes carregam as colunas com
+memory-mapping, sem reprocessar o CSV.
+
+A chave do cache combina o hash do conteúdo do arquivo de origem com os
+parâmetros de limpeza, de modo que uma nova versão do CSV (ou uma mudança na
+limpeza) gera automaticamente uma nova entrada.
+
+Alternativamente à interpolação pelo índice das linhas, os sensores podem ser
+alinhados em uma grade de tempo uniforme (align_sensors), interpolando cada
+sensor pelo seu próprio relative_time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from extracao_features import SENSORS
+
+# Diretório padrão do cache
+CACHE_DIR = './resultados/cache/dados'
+
+# Incrementar sempre que a lógica de limpeza mudar
+CLEANING_VERSION = 1
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Parâmetros:
+    -----------
+    file_path : str
+        Caminho do arquivo
+    chunk_size : int
+        Tamanho dos blocos lidos por vez (bytes)
+
+    Retorna:
+    --------
+    str
+        Hash hexadecimal do conteúdo
+    """
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def clean_sensor_data(df):
+    """
+    Limpa os dados brutos dos sensores.
+
+    Remove linhas vazias, preenche valores faltantes de cada sensor por
+    interpolação linear e remove os NaN restantes.
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        Dados brutos lidos do CSV
+
+    Retorna:
+    --------
+    pd.DataFrame
+        Dados limpos
+    """
+    # Remove linhas completamente vazias
+    df = df.dropna(how='all')
+
+    # Preenche valores faltantes usando interpolação linear
+    for sensor in SENSORS:
+        df[sensor] = df[sensor].interpolate(method='linear')
+
+    # Remove quaisquer NaN restantes
+    return df.dropna()
+
+
+def _sensor_series(times, values):
+    """
+    Amostras válidas de um sensor, ordenadas e sem instantes repetidos.
+    """
+    valid = ~np.isnan(values)
+    t, v = times[valid].astype(np.float64), values[valid].astype(np.float64)
+
+    # Mantém a primeira leitura de cada instante
+    keep = np.concatenate([[True], np.diff(t) > 0]) if len(t) else np.empty(0, dtype=bool)
+    return t[keep], v[keep]
+
+
+def _interp_grid(grid, t, v):
+    """
+    Interpolação linear vetorizada de (t, v) nos instantes da grade.
+
+    Usa searchsorted para localizar, de uma vez, o intervalo de cada ponto da
+    grade. Supõe t[0] <= grid <= t[-1].
+    """
+    if len(t) == 1:
+        return np.full(len(grid), v[0])
+
+    idx = np.clip(np.searchsorted(t, grid, side='right') - 1, 0, len(t) - 2)
+    t0, t1 = t[idx], t[idx + 1]
+    return v[idx] + (grid - t0) / (t1 - t0) * (v[idx + 1] - v[idx])
+
+
+def align_sensors(df, sample_rate_hz, dtype='float32'):
+    """
+    Reamostra cada sensor em uma grade de tempo uniforme.
+
+    Os arquivos brutos são esparsos e intercalados: cada linha de relative_time
+    costuma trazer apenas um dos sensores. Em vez de interpolar pelo índice da
+    linha, cada sensor é interpolado linearmente pelo seu próprio relative_time
+    nos instantes t0 + k / sample_rate_hz, entre o último início e o primeiro
+    fim dos sensores (sem extrapolação).
+
+    Parâmetros:
+    -----------
+    df : pd.DataFrame
+        Dados brutos lidos do CSV
+    sample_rate_hz : float
+        Frequência da grade de saída (Hz)
+    dtype : str
+        Tipo numérico das colunas dos sensores
+
+    Retorna:
+    --------
+    pd.DataFrame
+        Dados alinhados (relative_time em ms + sensores)
+    """
+    times = df['relative_time'].to_numpy(dtype=np.float64)
+    series = [_sensor_series(times, df[sensor].to_numpy(dtype=np.float64)) for sensor in SENSORS]
+
+    if any(len(t) == 0 for t, _ in series):
+        return _aligned_frame(np.empty(0), [np.empty(0)] * len(SENSORS), dtype)
+
+    dt = 1000.0 / sample_rate_hz
+    start = max(t[0] for t, _ in series)
+    end = min(t[-1] for t, _ in series)
+    grid = start + np.arange(int(np.floor((end - start) / dt)) + 1) * dt
+
+    return _aligned_frame(grid, [_interp_grid(grid, t, v) for t, v in series], dtype)
+
+
+def _aligned_frame(grid, columns, dtype):
+    return pd.DataFrame(
+        {'relative_time': grid,
+         **{sensor: col.astype(dtype) for sensor, col in zip(SENSORS, columns)}}
+    )
+
+
+def iter_aligned_chunks(file_path, sample_rate_hz, chunk_rows=50_000, dtype='float32'):
+    """
+    Versão em blocos de align_sensors, com memória limitada.
+
+    Para cada sensor são mantidas apenas as amostras a partir da última
+    anterior ao próximo ponto da grade; um ponto só é emitido quando todos os
+    sensores já têm amostras depois dele. O resultado concatenado é idêntico
+    ao de align_sensors sobre o arquivo inteiro.
+
+    Parâmetros:
+    -----------
+    file_path : str
+        Caminho para o arquivo CSV
+    sample_rate_hz : float
+        Frequência da grade de saída (Hz)
+    chunk_rows : int
+        Número de linhas do CSV lidas por bloco
+    dtype : str
+        Tipo numérico das colunas dos sensores
+
+    Retorna:
+    --------
+    generator of pd.DataFrame
+        Blocos consecutivos de dados alinhados
+    """
+    dt = 1000.0 / sample_rate_hz
+    pending = [(np.empty(0), np.empty(0)) for _ in SENSORS]
+    start = None
+    next_k = 0
+
+    for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+        times = chunk['relative_time'].to_numpy(dtype=np.float64)
+
+        for s, sensor in enumerate(SENSORS):
+            t_new, v_new = _sensor_series(times, chunk[sensor].to_numpy(dtype=np.float64))
+            t_old, v_old = pending[s]
+            if len(t_old) and len(t_new) and t_new[0] <= t_old[-1]:
+                # Instante repetido na fronteira do bloco: mantém a primeira leitura
+                keep = t_new > t_old[-1]
+                t_new, v_new = t_new[keep], v_new[keep]
+            pending[s] = (np.concatenate([t_old, t_new]), np.concatenate([v_old, v_new]))
+
+        if any(len(t) == 0 for t, _ in pending):
+            continue
+        if start is None:
+            start = max(t[0] for t, _ in pending)
+
+        # Pontos da grade estritamente antes da última amostra de todos os sensores
+        end = min(t[-1] for t, _ in pending)
+        grid = start + np.arange(next_k, int(np.floor((end - start) / dt)) + 1) * dt
+        grid = grid[grid < end]
+        if len(grid) == 0:
+            continue
+
+        yield _aligned_frame(grid, [_interp_grid(grid, t, v) for t, v in pending], dtype)
+        next_k += len(grid)
+
+        # Descarta amostras que não delimitam mais nenhum ponto futuro
+        next_t = start + next_k * dt
+        for s, (t, v) in enumerate(pending):
+            first = max(np.searchsorted(t, next_t, side='right') - 1, 0)
+            pending[s] = (t[first:], v[first:])
+
+    # Fim do arquivo: pontos restantes até o fim do sensor que termina primeiro
+    if start is not None:
+        end = min(t[-1] for t, _ in pending)
+        grid = start + np.arange(next_k, int(np.floor((end - start) / dt)) + 1) * dt
+        if len(grid):
+            yield _aligned_frame(grid, [_interp_grid(grid, t, v) for t, v in pending], dtype)
+
+
+def iter_clean_chunks(file_path, chunk_rows=50_000, dtype='float32'):
+    """
+    Lê e limpa um CSV de sensores em blocos, com memória limitada.
+
+    Produz exatamente as mesmas linhas de clean_sensor_data seguida da
+    conversão para `dtype`, mas sem carregar o arquivo inteiro. Entre blocos
+    são mantidos, para cada sensor, o último valor válido (âncora da
+    interpolação) e as linhas cujo valor ainda depende de uma amostra futura.
+
+    Parâmetros:
+    -----------
+    file_path : str
+        Caminho para o arquivo CSV
+    chunk_rows : int
+        Número de linhas do CSV lidas por bloco
+    dtype : str
+        Tipo numérico das colunas dos sensores
+
+    Retorna:
+    --------
+    generator of pd.DataFrame
+        Blocos consecutivos de dados limpos (relative_time + sensores)
+    """
+    n_sensors = len(SENSORS)
+    anchor_pos = np.full(n_sensors, -1, dtype=np.int64)
+    anchor_val = np.zeros(n_sensors)
+
+    carry_pos = np.empty(0, dtype=np.int64)
+    carry_time = np.empty(0, dtype=np.int64)
+    carry_vals = np.empty((0, n_sensors))
+    next_pos = 0
+
+    def emit(time, vals):
+        # Linhas com NaN restante (antes do primeiro valor de algum sensor) são descartadas
+        keep = ~np.isnan(vals).any(axis=1)
+        return pd.DataFrame(
+            {'relative_time': time[keep],
+             **{sensor: vals[keep, s].astype(dtype) for s, sensor in enumerate(SENSORS)}}
+        )
+
+    for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+        # Remove linhas completamente vazias
+        chunk = chunk.dropna(how='all')
+
+        # Posição de cada linha no arquivo (a interpolação ignora relative_time)
+        pos = np.concatenate([carry_pos, np.arange(next_pos, next_pos + len(chunk))])
+        time = np.concatenate([carry_time, chunk['relative_time'].to_numpy()])
+        vals = np.concatenate([carry_vals, chunk[SENSORS].to_numpy(dtype=np.float64)])
+        next_pos += len(chunk)
+
+        last_valid = np.empty(n_sensors, dtype=np.int64)
+        for s in range(n_sensors):
+            col = vals[:, s]
+            valid = ~np.isnan(col)
+            last_valid[s] = pos[valid][-1] if valid.any() else anchor_pos[s]
+            if last_valid[s] < 0:
+                continue
+
+            xp, fp = pos[valid], col[valid]
+            if anchor_pos[s] >= 0 and (len(xp) == 0 or anchor_pos[s] < xp[0]):
+                xp = np.concatenate([[anchor_pos[s]], xp])
+                fp = np.concatenate([[anchor_val[s]], fp])
+
+            # Interpola apenas os valores já delimitados por duas amostras válidas
+            fill = ~valid & (pos > xp[0]) & (pos < last_valid[s])
+            col[fill] = np.interp(pos[fill], xp, fp)
+
+            anchor_pos[s], anchor_val[s] = xp[-1], fp[-1]
+
+        # Linhas até a última amostra do sensor mais atrasado já estão completas
+        done = pos <= last_valid.min()
+        if done.any():
+            yield emit(time[done], vals[done])
+
+        carry_pos, carry_time, carry_vals = pos[~done], time[~done], vals[~done]
+
+    # Fim do arquivo: valores após a última amostra repetem o último valor válido
+    for s in range(n_sensors):
+        if anchor_pos[s] >= 0:
+            col = carry_vals[:, s]
+            col[np.isnan(col) & (carry_pos > anchor_pos[s])] = anchor_val[s]
+
+    if len(carry_pos):
+        yield emit(carry_time, carry_vals)
+
+
+def cache_params(dtype='float32', sample_rate_hz=None):
+    """
+    Parâmetros de limpeza que compõem a chave do cache.
+    """
+    return {
+        'versao_limpeza': CLEANING_VERSION,
+        'sensores': SENSORS,
+        'interpolacao': 'linear',
+        'alinhamento': 'indice' if sample_rate_hz is None else f'tempo_{sample_rate_hz}hz',
+        'dtype': np.dtype(dtype).name
+    }
+
+
+def cache_key(file_path, params):
+    """
+    Chave do cache: hash do conteúdo do arquivo + parâmetros de limpeza.
+    """
+    h = hashlib.sha256()
+    h.update(file_hash(file_path).encode())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def _write_cache(df, entry_dir, params, dtype):
+    """
+    Grava o DataFrame limpo como um .npy por coluna.
+
+    A escrita é feita em um diretório temporário renomeado ao final, para que
+    execuções interrompidas nunca deixem uma entrada incompleta.
+    """
+    tmp_dir = entry_dir.with_name(entry_dir.name + f'.tmp{os.getpid()}')
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = {'relative_time': df['relative_time'].to_numpy()}
+    for sensor in SENSORS:
+        columns[sensor] = df[sensor].to_numpy(dtype=dtype)
+
+    for name, values in columns.items():
+        np.save(tmp_dir / f'{name}.npy', np.ascontiguousarray(values))
+
+    meta = {'parametros': params, 'colunas': list(columns), 'linhas': len(df)}
+    with open(tmp_dir / 'meta.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    try:
+        tmp_dir.rename(entry_dir)
+    except OSError:
+        # Outro processo gravou a mesma entrada primeiro
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_cache_entry(entry_dir, mmap=True):
+    """
+    Lê uma entrada do cache, com memory-mapping das colunas.
+    """
+    with open(entry_dir / 'meta.json') as f:
+        meta = json.load(f)
+
+    mmap_mode = 'r' if mmap else None
+    columns = {name: np.load(entry_dir / f'{name}.npy', mmap_mode=mmap_mode)
+               for name in meta['colunas']}
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_sensor_data(file_path, cache_dir=CACHE_DIR, dtype='float32', use_cache=True, mmap=True,
+                     sample_rate_hz=None):
+    """
+    Carrega os dados limpos de um CSV de sensores, usando o cache colunar.
+
+    Parâmetros:
+    -----------
+    file_path : str
+        Caminho para o arquivo CSV
+    cache_dir : str
+        Diretório do cache
+    dtype : str
+        Tipo numérico das colunas dos sensores
+    use_cache : bool
+        Se False, ignora o cache e sempre processa o CSV
+    mmap : bool
+        Se True, as colunas são abertas com memory-mapping (somente leitura)
+    sample_rate_hz : float, opcional
+        Se informado, os sensores são alinhados em uma grade de tempo com essa
+        frequência (align_sensors) em vez de interpolados pelo índice da linha
+
+    Retorna:
+    --------
+    pd.DataFrame
+        Dados limpos com as colunas relative_time e dos sensores
+    """
+    if not use_cache:
+        return _clean(file_path, dtype, sample_rate_hz)
+
+    return read_cache_entry(cache_entry(file_path, cache_dir, dtype, sample_rate_hz), mmap=mmap)
+
+
+def cache_entry(file_path, cache_dir=CACHE_DIR, dtype='float32', sample_rate_hz=None):
+    """
+    Diretório da entrada do cache de um arquivo, criada se ainda não existir.
+
+    Resolver a entrada exige o hash do CSV inteiro; processos que leem o
+    mesmo arquivo várias vezes podem resolvê-la uma vez e usar
+    read_cache_entry.
+    """
+    params = cache_params(dtype, sample_rate_hz)
+    entry_dir = Path(cache_dir) / f'{Path(file_path).stem}-{cache_key(file_path, params)}'
+
+    if not (entry_dir / 'meta.json').exists():
+        _write_cache(_clean(file_path, dtype, sample_rate_hz), entry_dir, params, dtype)
+    return entry_dir
+
+
+def cache_entry_length(entry_dir):
+    """
+    Número de amostras de uma entrada do cache (do meta.json, sem abrir as colunas).
+    """
+    with open(Path(entry_dir) / 'meta.json') as f:
+        return json.load(f)['linhas']
+
+
+def sensor_data_length(file_path, cache_dir=CACHE_DIR, dtype='float32', use_cache=True,
+                       sample_rate_hz=None):
+    """
+    Número de amostras dos dados limpos (mesmos parâmetros de load_sensor_data).
+
+    Lido do meta.json da entrada do cache, sem abrir as colunas; se a entrada
+    ainda não existir, ela é criada.
+    """
+    if not use_cache:
+        return len(_clean(file_path, dtype, sample_rate_hz))
+    return cache_entry_length(cache_entry(file_path, cache_dir, dtype, sample_rate_hz))
+
+def _clean(file_path, dtype, sample_rate_hz):
+    """
+    Lê e limpa o CSV completo (interpolação pelo índice ou grade de tempo).
+    """
+    df = pd.read_csv(file_path)
+    if sample_rate_hz is not None:
+        return align_sensors(df, sample_rate_hz, dtype)
+    return _typed(clean_sensor_data(df), dtype)
+
+
+def _typed(df, dtype):
+    """
+    Converte as colunas dos sensores para o tipo do cache.
+    """
+    df = df[['relative_time'] + SENSORS].reset_index(drop=True)
+    return df.astype({sensor: dtype for sensor in SENSORS})
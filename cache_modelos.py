@@ -0,0 +1,135 @@
+"""
+Cache de Modelos Treinados - Classificação de Vias
+==================================================
+
+Memoização de treinamentos: o resultado de um fit (estimador treinado, ou o
+conjunto modelo + scaler + label encoder) é gravado com joblib, indexado por:
+- impressão digital (SHA-256) da matriz de treino e dos rótulos
+- classe e hiperparâmetros do estimador
+- versão do scikit-learn e parâmetros adicionais (divisão treino/teste,
+  dobras da validação cruzada, ...)
+
+Execuções repetidas e os scripts de medição carregam o modelo do disco em vez
+de treiná-lo quando nada mudou.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import BaseEstimator
+
+# Diretório padrão do cache
+MODEL_CACHE_DIR = './resultados/cache/modelos'
+
+
+class ModelCache:
+    """
+    Cache em disco de resultados de treinamento.
+    """
+
+    def __init__(self, cache_dir=MODEL_CACHE_DIR):
+        """
+        Inicializa o cache.
+
+        Parâmetros:
+        -----------
+        cache_dir : str
+            Diretório onde as entradas são gravadas
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(*parts):
+        """
+        Impressão digital de matrizes, estimadores e parâmetros.
+
+        Matrizes entram pelo tipo, forma e conteúdo; estimadores pela classe e
+        pelos hiperparâmetros; os demais valores pela serialização JSON.
+
+        Retorna:
+        --------
+        str
+            Chave hexadecimal
+        """
+        h = hashlib.sha256(sklearn.__version__.encode())
+        for part in parts:
+            if isinstance(part, pd.DataFrame):
+                h.update(json.dumps(list(map(str, part.columns))).encode())
+                part = part.to_numpy()
+            elif isinstance(part, pd.Series):
+                part = part.to_numpy()
+
+            if isinstance(part, np.ndarray):
+                if part.dtype == object:
+                    part = part.astype(str)
+                part = np.ascontiguousarray(part)
+                h.update(f'{part.dtype.str}{part.shape}'.encode())
+                h.update(part.reshape(-1).view(np.uint8))
+            elif isinstance(part, BaseEstimator):
+                cls = type(part)
+                h.update(f'{cls.__module__}.{cls.__qualname__}'.encode())
+                h.update(repr(sorted(part.get_params(deep=False).items())).encode())
+            else:
+                h.update(json.dumps(part, sort_keys=True, default=str).encode())
+        return h.hexdigest()[:24]
+
+    def get(self, key):
+        """
+        Carrega uma entrada do cache (None se não existir).
+        """
+        path = self.cache_dir / f'{key}.joblib'
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return joblib.load(path)
+
+    def put(self, key, value):
+        """
+        Grava uma entrada no cache (escrita atômica).
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f'{key}.joblib'
+        tmp_path = path.with_name(path.name + f'.tmp{os.getpid()}')
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+
+    def memoize(self, key, train):
+        """
+        Retorna a entrada `key` do cache ou executa `train()` e grava o resultado.
+        """
+        value = self.get(key)
+        if value is None:
+            value = train()
+            self.put(key, value)
+        return value
+
+    def fit(self, estimator, X, y):
+        """
+        Equivalente a estimator.fit(X, y), reaproveitando o cache.
+
+        Retorna:
+        --------
+        estimator
+            Estimador treinado (o próprio `estimator` em uma falta, ou a cópia
+            gravada em um acerto)
+        """
+        return self.memoize(self.fingerprint('fit', estimator, X, y), lambda: estimator.fit(X, y))
+
+    def print_stats(self):
+        """
+        Mostra os acertos e faltas do cache.
+        """
+        total = self.hits + self.misses
+        taxa = self.hits / total if total else 0.0
+        print(f"🗄️  Cache de modelos: {self.hits} acerto(s), {self.misses} falta(s) "
+              f"({taxa:.0%} de acertos) em {self.cache_dir}")
+
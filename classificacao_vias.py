@@ -36,7 +36,22 @@ from scipy import stats
 from scipy.fft import fft
 from scipy.signal import welch
 
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from extracao_features import (SENSORS, FEATURE_NAMES, window_view, extract_features_signal,
+                               extract_features_multiresolution)
+from cache_dados import (CACHE_DIR, load_sensor_data, cache_entry, cache_entry_length,
+                         read_cache_entry, sensor_data_length, iter_clean_chunks,
+                         iter_aligned_chunks)
+from armazem_features import FeatureStore, carregar_dados_organizados
+from matriz_features import FEATURE_SCHEMA, FeatureMatrix
+from agendador_treinamento import TrainingScheduler, fits_per_call
+from cache_modelos import ModelCache
+from pacote_modelo import salvar_pacotes
+from perfil_inferencia import profile_inference, pareto_front, select_under_constraints
+
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (habilita HalvingGridSearchCV)
+from sklearn.model_selection import train_test_split, HalvingGridSearchCV
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import (classification_report, confusion_matrix, 
                              accuracy_score, f1_score, precision_score, 
@@ -50,7 +65,9 @@ from sklearn.tree import DecisionTreeClassifier, plot_tree, export_text
 from sklearn.naive_bayes import GaussianNB
 from sklearn.linear_model import LogisticRegression
 
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 warnings.filterwarnings('ignore')
 
 # Configuração de estilo para gráficos
@@ -63,7 +80,8 @@ class DataProcessor:
     Classe responsável pelo processamento e organização dos dados dos sensores.
     """
     
-    def __init__(self, window_size=100, overlap=50):
+    def __init__(self, window_size=100, overlap=50, batch=True, use_cache=True, cache_dir=CACHE_DIR,
+                 sample_rate_hz=None, window_ms=None, overlap_ms=None):
         """
         Inicializa o processador de dados.
         
@@ -73,9 +91,34 @@ class DataProcessor:
             Tamanho da janela para segmentação dos dados (número de amostras)
         overlap : int
             Sobreposição entre janelas consecutivas
+        batch : bool
+            Se True, extrai as features de todas as janelas de uma vez
+            (extracao_features.extract_features_signal); se False, usa o
+            laço janela a janela com extract_features
+        use_cache : bool
+            Se True, load_data usa o cache binário dos CSVs limpos
+        cache_dir : str
+            Diretório do cache dos dados limpos
+        sample_rate_hz : float, opcional
+            Se informado, cada sensor é reamostrado em uma grade de tempo
+            uniforme com essa frequência (pelo relative_time), em vez de
+            interpolado pelo índice das linhas do CSV
+        window_ms, overlap_ms : float, opcional
+            Janela e sobreposição em milissegundos (requer sample_rate_hz);
+            substituem window_size e overlap
         """
+        if window_ms is not None:
+            if sample_rate_hz is None:
+                raise ValueError("window_ms/overlap_ms requerem sample_rate_hz")
+            window_size = int(round(window_ms * sample_rate_hz / 1000))
+            overlap = int(round((overlap_ms or 0) * sample_rate_hz / 1000))
+        
         self.window_size = window_size
         self.overlap = overlap
+        self.sample_rate_hz = sample_rate_hz
+        self.batch = batch
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
         
@@ -83,6 +126,11 @@ class DataProcessor:
         """
         Carrega dados de um arquivo CSV e adiciona a classe correspondente.
         
+        Os dados limpos (interpolados, sem NaN) são lidos do cache colunar
+        em float32 (cache_dados.load_sensor_data); o CSV só é processado
+        novamente quando o arquivo ou os parâmetros de limpeza mudam. Com
+        sample_rate_hz, os sensores vêm alinhados em uma grade de tempo.
+        
         Parâmetros:
         -----------
         file_path : str
@@ -96,18 +144,8 @@ class DataProcessor:
             DataFrame com os dados carregados e a classe
         """
         print(f"Carregando dados de: {file_path}")
-        df = pd.read_csv(file_path)
-        
-        # Remove linhas completamente vazias
-        df = df.dropna(how='all')
-        
-        # Preenche valores faltantes usando interpolação linear
-        df['LinearAccelerometerSensor'] = df['LinearAccelerometerSensor'].interpolate(method='linear')
-        df['AccX'] = df['AccX'].interpolate(method='linear')
-        df['AccY'] = df['AccY'].interpolate(method='linear')
-        
-        # Remove quaisquer NaN restantes
-        df = df.dropna()
+        df = load_sensor_data(file_path, cache_dir=self.cache_dir, use_cache=self.use_cache,
+                              sample_rate_hz=self.sample_rate_hz)
         
         # Adiciona a classe
         df['Classe'] = class_label
@@ -135,7 +173,7 @@ class DataProcessor:
         sensors = ['LinearAccelerometerSensor', 'AccX', 'AccY']
         
         for sensor in sensors:
-            data = window_data[sensor].values
+            data = window_data[sensor].to_numpy(dtype=np.float64)
             
             # Features estatísticas no domínio do tempo
             features[f'{sensor}_mean'] = np.mean(data)
@@ -170,14 +208,12 @@ class DataProcessor:
             features[f'{sensor}_psd_max'] = np.max(psd)
             
         # Features combinadas entre sensores
-        features['acc_magnitude'] = np.mean(np.sqrt(
-            window_data['AccX']**2 + window_data['AccY']**2
-        ))
+        acc_x = window_data['AccX'].to_numpy(dtype=np.float64)
+        acc_y = window_data['AccY'].to_numpy(dtype=np.float64)
         
-        features['acc_x_y_correlation'] = np.corrcoef(
-            window_data['AccX'].values, 
-            window_data['AccY'].values
-        )[0, 1]
+        features['acc_magnitude'] = np.mean(np.sqrt(acc_x**2 + acc_y**2))
+        
+        features['acc_x_y_correlation'] = np.corrcoef(acc_x, acc_y)[0, 1]
         
         return features
     
@@ -196,20 +232,69 @@ class DataProcessor:
             DataFrame com features extraídas (S1, S2, ..., Classe)
         """
         print(f"Criando janelas deslizantes (tamanho={self.window_size}, overlap={self.overlap})...")
+        if self.sample_rate_hz is not None:
+            print(f"  -> grade de {self.sample_rate_hz} Hz: janela de "
+                  f"{self.window_size * 1000 / self.sample_rate_hz:.0f} ms")
         
-        windows_features = []
+        windowed_df = self._window_features(df)
+        
+        print(f"  -> {len(windowed_df)} janelas criadas")
+        return windowed_df
+    
+    def _window_features(self, df):
+        """
+        Extrai as features de todas as janelas de `df` (lote ou laço).
+        """
         step_size = self.window_size - self.overlap
         
+        if self.batch:
+            return self._create_sliding_windows_batch(df, step_size)
+        
+        windows_features = []
+        
         for i in range(0, len(df) - self.window_size + 1, step_size):
             window = df.iloc[i:i + self.window_size]
             features = self.extract_features(window)
             features['Classe'] = window['Classe'].iloc[0]
             windows_features.append(features)
         
-        print(f"  -> {len(windows_features)} janelas criadas")
         return pd.DataFrame(windows_features)
     
-    def organize_data(self, file_paths_and_labels):
+    def _create_sliding_windows_batch(self, df, step_size):
+        """
+        Versão vetorizada de create_sliding_windows.
+        
+        Monta uma visão (n_janelas, window_size, 3) sem cópia sobre as colunas
+        dos sensores e calcula todas as features ao longo do eixo da janela,
+        preenchendo uma matriz pré-alocada na mesma ordem de extract_features.
+        As estatísticas combináveis são calculadas uma vez por bloco de
+        amostras e combinadas por janela (extract_features_signal), então o
+        custo não cresce com a sobreposição.
+        """
+        values = df[SENSORS].to_numpy(dtype=np.float64)
+        n_windows = len(window_view(values, self.window_size, step_size))
+        
+        features = np.empty((n_windows, len(FEATURE_NAMES)), dtype=np.float64)
+        extract_features_signal(values, self.window_size, step_size, out=features)
+        
+        starts = np.arange(n_windows) * step_size
+        return self._features_frame(features, df['Classe'].to_numpy()[starts])
+    
+    @staticmethod
+    def _features_frame(features, classes):
+        """
+        Monta o DataFrame de features (mesmas colunas de extract_features) + Classe.
+        """
+        windowed_df = pd.DataFrame(features, columns=FEATURE_NAMES)
+        
+        # np.argmax retorna inteiros no caminho janela a janela
+        dominant_cols = [col for col in FEATURE_NAMES if col.endswith('_dominant_freq')]
+        windowed_df[dominant_cols] = windowed_df[dominant_cols].astype(np.int64)
+        
+        windowed_df['Classe'] = classes
+        return windowed_df
+    
+    def organize_data(self, file_paths_and_labels, n_jobs=1):
         """
         Organiza todos os dados no formato S1, S2, ..., Sn, Classe.
         
@@ -217,6 +302,13 @@ class DataProcessor:
         -----------
         file_paths_and_labels : list of tuples
             Lista de tuplas (caminho_arquivo, rótulo_classe)
+        n_jobs : int
+            Número de processos para a extração (-1 usa todos os núcleos).
+            Com n_jobs > 1, arquivos e faixas contíguas de janelas são
+            distribuídos em um pool de processos; o resultado é idêntico ao
+            do caminho serial. O padrão é serial: nos arquivos do projeto o
+            custo de iniciar o pool supera o ganho (ver
+            medir_extracao_features).
             
         Retorna:
         --------
@@ -227,13 +319,19 @@ class DataProcessor:
         print("INICIANDO ORGANIZAÇÃO DOS DADOS")
         print("="*70 + "\n")
         
-        all_data = []
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
         
-        # Carrega e processa cada arquivo
-        for file_path, label in file_paths_and_labels:
-            df = self.load_data(file_path, label)
-            windowed_df = self.create_sliding_windows(df)
-            all_data.append(windowed_df)
+        if n_jobs > 1:
+            all_data = self._organize_parallel(file_paths_and_labels, n_jobs)
+        else:
+            all_data = []
+            
+            # Carrega e processa cada arquivo
+            for file_path, label in file_paths_and_labels:
+                df = self.load_data(file_path, label)
+                windowed_df = self.create_sliding_windows(df)
+                all_data.append(windowed_df)
         
         # Concatena todos os dados
         combined_data = pd.concat(all_data, ignore_index=True)
@@ -259,6 +357,291 @@ class DataProcessor:
         print(f"Distribuição das classes:\n{combined_data['Classe'].value_counts()}")
         
         return combined_data
+    
+    def organize_matrix(self, file_paths_and_labels, dtype=np.float32):
+        """
+        Organiza todos os dados em uma FeatureMatrix compacta.
+        
+        Mesmas janelas e features de organize_data, mas gravadas diretamente
+        em uma matriz pré-alocada (float32 por padrão) com códigos int8 das
+        classes, sem montar um DataFrame por arquivo.
+        
+        Parâmetros:
+        -----------
+        file_paths_and_labels : list of tuples
+            Lista de tuplas (caminho_arquivo, rótulo_classe)
+        dtype : np.dtype
+            Tipo da matriz de features
+            
+        Retorna:
+        --------
+        FeatureMatrix
+            Features (S1..Sn) e classes de todas as janelas
+        """
+        step_size = self.window_size - self.overlap
+        
+        # Janelas contadas pelo meta.json do cache: a matriz é alocada antes de
+        # carregar os sinais, e só um sinal float64 fica na memória por vez
+        n_windows = [self._count_windows(file_path) for file_path, _ in file_paths_and_labels]
+        classes = sorted({label for _, label in file_paths_and_labels})
+        matrix = FeatureMatrix.allocate(sum(n_windows), classes, dtype=dtype)
+        
+        row = 0
+        for (file_path, label), n in zip(file_paths_and_labels, n_windows):
+            values = self.load_data(file_path, label)[SENSORS].to_numpy(dtype=np.float64)
+            extract_features_signal(values, self.window_size, step_size,
+                                    out=matrix.features[row:row + n])
+            matrix.codes[row:row + n] = classes.index(label)
+            row += n
+            del values
+        
+        self.feature_mapping = dict(FEATURE_SCHEMA.feature_mapping)
+        print(f"Matriz de features: {len(matrix)} janelas x {len(FEATURE_SCHEMA)} features "
+              f"({matrix.nbytes / 1024**2:.2f} MB, {matrix.features.dtype})")
+        return matrix
+    
+    def organize_data_multiresolution(self, file_paths_and_labels, configs):
+        """
+        Organiza os dados para várias configurações de janela em uma só passada.
+        
+        Cada arquivo é lido uma única vez e todas as configurações são
+        extraídas do mesmo sinal (extracao_features.extract_features_multiresolution),
+        compartilhando janelas, FFTs e estatísticas por bloco. Útil para
+        varreduras de window_size/overlap sem repetir organize_data.
+        
+        Parâmetros:
+        -----------
+        file_paths_and_labels : list of tuples
+            Lista de tuplas (caminho_arquivo, rótulo_classe)
+        configs : list of tuples
+            Pares (window_size, overlap) em número de amostras
+            
+        Retorna:
+        --------
+        dict
+            {(window_size, overlap): DataFrame organizado (S1, ..., Sn, Classe)}
+        """
+        print("\n" + "="*70)
+        print(f"INICIANDO ORGANIZAÇÃO DOS DADOS ({len(configs)} CONFIGURAÇÕES)")
+        print("="*70 + "\n")
+        
+        for window_size, overlap in configs:
+            if not 0 <= overlap < window_size:
+                raise ValueError(f"overlap deve estar em [0, window_size): {(window_size, overlap)}")
+        
+        steps = [(window_size, window_size - overlap) for window_size, overlap in configs]
+        all_data = {config: [] for config in configs}
+        
+        for file_path, label in file_paths_and_labels:
+            df = self.load_data(file_path, label)
+            values = df[SENSORS].to_numpy(dtype=np.float64)
+            features = extract_features_multiresolution(values, steps)
+            
+            for config, step in zip(configs, steps):
+                all_data[config].append(
+                    self._features_frame(features[step], np.full(len(features[step]), label, dtype=object)))
+        
+        rename_dict = {old: f'S{i+1}' for i, old in enumerate(FEATURE_NAMES)}
+        self.feature_mapping = {f'S{i+1}': old for i, old in enumerate(FEATURE_NAMES)}
+        
+        organized = {}
+        for config in configs:
+            organized[config] = pd.concat(all_data[config], ignore_index=True).rename(columns=rename_dict)
+            print(f"  window_size={config[0]}, overlap={config[1]}: {len(organized[config])} janelas")
+        
+        return organized
+    
+    def _organize_parallel(self, file_paths_and_labels, n_jobs, min_windows_per_task=256):
+        """
+        Extrai as janelas de todos os arquivos em um pool de processos.
+        
+        Cada arquivo é dividido em faixas contíguas de janelas; cada tarefa
+        recebe as amostras da faixa mais as window_size - passo amostras de
+        sobreposição com a faixa seguinte. Os resultados são reunidos na ordem
+        original (arquivo, faixa).
+        
+        A entrada do cache de cada arquivo é resolvida uma vez aqui (hash do
+        CSV) e as tarefas abrem o diretório da entrada diretamente.
+        """
+        if self.use_cache:
+            entries = [cache_entry(file_path, cache_dir=self.cache_dir, sample_rate_hz=self.sample_rate_hz)
+                       for file_path, _ in file_paths_and_labels]
+            n_samples = [cache_entry_length(entry_dir) for entry_dir in entries]
+        else:
+            entries = [None] * len(file_paths_and_labels)
+            n_samples = [sensor_data_length(file_path, use_cache=False, sample_rate_hz=self.sample_rate_hz)
+                         for file_path, _ in file_paths_and_labels]
+        n_windows = [self._n_windows(n) for n in n_samples]
+        
+        # Faixas de tamanho suficiente para ~2 tarefas por processo
+        task_size = max(min_windows_per_task, -(-sum(n_windows) // (2 * n_jobs)))
+        tasks = []
+        for (file_path, label), entry_dir, n in zip(file_paths_and_labels, entries, n_windows):
+            n_tasks = max(1, -(-n // task_size))
+            bounds = np.linspace(0, n, n_tasks + 1).astype(int)
+            tasks += [(file_path, entry_dir, label, w0, w1) for w0, w1 in zip(bounds[:-1], bounds[1:])]
+        
+        print(f"Extraindo {sum(n_windows)} janelas em {len(tasks)} tarefas com {n_jobs} processos...")
+        
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(self._window_range_features, tasks))
+    
+    def _count_windows(self, file_path):
+        """
+        Número de janelas de um arquivo, sem carregar os dados.
+        """
+        n_samples = sensor_data_length(file_path, cache_dir=self.cache_dir, use_cache=self.use_cache,
+                                       sample_rate_hz=self.sample_rate_hz)
+        return self._n_windows(n_samples)
+    
+    def _n_windows(self, n_samples):
+        """
+        Número de janelas de um sinal com n_samples amostras.
+        """
+        return max(0, (n_samples - self.window_size) // (self.window_size - self.overlap) + 1)
+    
+    def _window_range_features(self, task):
+        """
+        Extrai as janelas [w0, w1) de um arquivo (executado nos processos do pool).
+        """
+        file_path, entry_dir, label, w0, w1 = task
+        step_size = self.window_size - self.overlap
+        
+        if entry_dir is not None:
+            df = read_cache_entry(entry_dir)
+        else:
+            df = load_sensor_data(file_path, use_cache=False, sample_rate_hz=self.sample_rate_hz)
+        df['Classe'] = label
+        
+        if w1 <= w0:
+            return self._window_features(df.iloc[:0])
+        
+        # Amostras da faixa + sobreposição com a próxima janela
+        return self._window_features(df.iloc[w0 * step_size:(w1 - 1) * step_size + self.window_size])
+    
+    def organize_data_streaming(self, file_paths_and_labels, output_file, memory_budget_mb=64):
+        """
+        Versão com memória limitada de organize_data.
+        
+        Cada CSV é lido em blocos (cache_dados.iter_clean_chunks), as janelas
+        são extraídas à medida que os dados chegam e as linhas de features são
+        gravadas incrementalmente em `output_file`. Entre blocos ficam em
+        memória apenas as últimas window_size - passo amostras e o estado da
+        interpolação. O arquivo gerado é idêntico ao CSV de organize_data.
+        
+        Parâmetros:
+        -----------
+        file_paths_and_labels : list of tuples
+            Lista de tuplas (caminho_arquivo, rótulo_classe)
+        output_file : str
+            Caminho do CSV de saída (S1, S2, ..., Sn, Classe)
+        memory_budget_mb : float
+            Orçamento de memória para a leitura e a extração (MB)
+            
+        Retorna:
+        --------
+        int
+            Número total de janelas gravadas
+        """
+        print("\n" + "="*70)
+        print("INICIANDO ORGANIZAÇÃO DOS DADOS (STREAMING)")
+        print("="*70 + "\n")
+        
+        chunk_rows, windows_per_batch = self._streaming_sizes(memory_budget_mb)
+        print(f"Orçamento de memória: {memory_budget_mb} MB "
+              f"({chunk_rows} linhas por bloco, {windows_per_batch} janelas por lote)")
+        
+        rename_dict = {old: f'S{i+1}' for i, old in enumerate(FEATURE_NAMES)}
+        total = 0
+        
+        with open(output_file, 'w', newline='') as f:
+            for file_path, label in file_paths_and_labels:
+                print(f"Processando em blocos: {file_path}")
+                n_windows = 0
+                
+                for windowed_df in self._iter_windowed_chunks(file_path, label, chunk_rows, windows_per_batch):
+                    windowed_df.rename(columns=rename_dict).to_csv(f, header=(total == 0), index=False)
+                    n_windows += len(windowed_df)
+                    total += len(windowed_df)
+                
+                print(f"  -> {n_windows} janelas criadas para classe '{label}'")
+        
+        # Salva mapeamento de features
+        self.feature_mapping = {f'S{i+1}': old for i, old in enumerate(FEATURE_NAMES)}
+        
+        print(f"\nTotal de amostras: {total}")
+        print(f"Dados organizados salvos em: {output_file}")
+        return total
+    
+    def _streaming_sizes(self, memory_budget_mb):
+        """
+        Converte o orçamento de memória em linhas por bloco e janelas por lote.
+        
+        Metade do orçamento vai para a leitura do CSV (~200 bytes por linha,
+        incluindo o overhead do parser) e metade para a extração em lote, cujos
+        temporários (FFT, Welch, ordenação) ocupam ~16 cópias da janela.
+        """
+        budget = memory_budget_mb * 1024**2 / 2
+        chunk_rows = max(self.window_size, int(budget // 200))
+        windows_per_batch = max(1, int(budget // (self.window_size * len(SENSORS) * 8 * 16)))
+        return chunk_rows, windows_per_batch
+    
+    def _iter_windowed_chunks(self, file_path, label, chunk_rows, windows_per_batch):
+        """
+        Gera DataFrames de features janela a janela a partir dos blocos limpos.
+        """
+        step_size = self.window_size - self.overlap
+        pending = np.empty((0, len(SENSORS)), dtype=np.float64)
+        
+        if self.sample_rate_hz is not None:
+            chunks = iter_aligned_chunks(file_path, self.sample_rate_hz, chunk_rows=chunk_rows)
+        else:
+            chunks = iter_clean_chunks(file_path, chunk_rows=chunk_rows)
+        
+        for chunk in chunks:
+            pending = np.concatenate([pending, chunk[SENSORS].to_numpy(dtype=np.float64)])
+            n_windows = len(window_view(pending, self.window_size, step_size))
+            
+            for start in range(0, n_windows, windows_per_batch):
+                n_batch = min(windows_per_batch, n_windows - start)
+                segment = pending[start * step_size:(start + n_batch - 1) * step_size + self.window_size]
+                features = extract_features_signal(segment, self.window_size, step_size)
+                yield self._features_frame(features, np.full(n_batch, label, dtype=object))
+            
+            # Mantém apenas as amostras que ainda farão parte de uma janela futura
+            pending = pending[n_windows * step_size:]
+
+
+# Hiperparâmetros da árvore de decisão (ModelTrainer e scripts medir_*.py)
+DECISION_TREE_PARAMS = {
+    'random_state': 42,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'min_samples_leaf': 3,
+    'class_weight': 'balanced'
+}
+
+# Restrições de implantação no celular para a escolha do melhor modelo
+# (ModelTrainer.select_best_model): latência p99 de uma janela e tamanho serializado
+DEPLOYMENT_CONSTRAINTS = {
+    'max_latency_ms': 1.0,
+    'max_size_kb': 200
+}
+
+# Grades de hiperparâmetros para ModelTrainer.tune_model
+PARAM_GRIDS = {
+    'Random Forest': {'n_estimators': [50, 100, 200], 'max_depth': [None, 10, 20],
+                      'min_samples_leaf': [1, 3]},
+    'Gradient Boosting': {'n_estimators': [50, 100, 200], 'learning_rate': [0.05, 0.1, 0.2],
+                          'max_depth': [2, 3, 5]},
+    'SVM (RBF)': {'C': [0.1, 1, 10, 100], 'gamma': ['scale', 0.01, 0.1]},
+    'SVM (Linear)': {'C': [0.01, 0.1, 1, 10]},
+    'K-Nearest Neighbors': {'n_neighbors': [3, 5, 9, 15], 'weights': ['uniform', 'distance']},
+    'Decision Tree': {'max_depth': [5, 10, 20, None], 'min_samples_split': [2, 5, 10],
+                      'min_samples_leaf': [1, 3, 5]},
+    'Naive Bayes': {'var_smoothing': [1e-9, 1e-7, 1e-5]},
+    'Logistic Regression': {'C': [0.01, 0.1, 1, 10]}
+}
 
 
 class ModelTrainer:
@@ -266,7 +649,7 @@ class ModelTrainer:
     Classe responsável pelo treinamento e avaliação dos modelos de classificação.
     """
     
-    def __init__(self, random_state=42):
+    def __init__(self, random_state=42, model_cache=None):
         """
         Inicializa o treinador de modelos.
         
@@ -274,11 +657,18 @@ class ModelTrainer:
         -----------
         random_state : int
             Seed para reprodutibilidade
+        model_cache : ModelCache, opcional
+            Cache de modelos treinados (cache_modelos); modelos com os mesmos
+            dados e hiperparâmetros não são treinados de novo
         """
         self.random_state = random_state
+        self.model_cache = model_cache
         self.models = {}
         self.results = {}
         self.best_model = None
+        self.pareto_front = []
+        self.training_summary = {}
+        self.training_data = None
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
         
@@ -327,9 +717,16 @@ class ModelTrainer:
         
         return X_train_scaled, X_test_scaled, y_train, y_test
     
-    def initialize_models(self):
+    def initialize_models(self, lazy_probability=False):
         """
         Inicializa os modelos de classificação a serem testados.
+        
+        Parâmetros:
+        -----------
+        lazy_probability : bool
+            Se True, os SVMs são treinados sem a calibração de Platt
+            (probability=False, que custa 5 treinamentos extras por fit); as
+            probabilidades são calculadas só quando pedidas (predict_proba)
         """
         self.models = {
             'Random Forest': RandomForestClassifier(
@@ -344,22 +741,18 @@ class ModelTrainer:
             'SVM (RBF)': SVC(
                 kernel='rbf',
                 random_state=self.random_state,
-                probability=True
+                probability=not lazy_probability
             ),
             'SVM (Linear)': SVC(
                 kernel='linear',
                 random_state=self.random_state,
-                probability=True
+                probability=not lazy_probability
             ),
             'K-Nearest Neighbors': KNeighborsClassifier(
                 n_neighbors=5
             ),
             'Decision Tree': DecisionTreeClassifier(
-                random_state=self.random_state,
-                max_depth=10,
-                min_samples_split=5,
-                min_samples_leaf=3,
-                class_weight='balanced'
+                **{**DECISION_TREE_PARAMS, 'random_state': self.random_state}
             ),
             'Naive Bayes': GaussianNB(),
             'Logistic Regression': LogisticRegression(
@@ -370,33 +763,74 @@ class ModelTrainer:
         
         print(f"\n{len(self.models)} modelos inicializados para treinamento\n")
     
-    def train_and_evaluate(self, X_train, X_test, y_train, y_test):
+    def train_and_evaluate(self, X_train, X_test, y_train, y_test, n_jobs=-1, threads_per_task=1,
+                           time_budget=None, reuse_cv_fits=False, profile=False, max_latency_ms=None,
+                           max_size_kb=None, max_memory_kb=None):
         """
         Treina e avalia todos os modelos.
         
+        O treinamento final e as 5 dobras da validação cruzada de cada modelo
+        são tarefas independentes de um único pool (agendador_treinamento),
+        cada uma limitada a `threads_per_task` threads.
+        
         Parâmetros:
         -----------
         X_train, X_test : np.array
             Dados de treino e teste (features)
         y_train, y_test : np.array
             Labels de treino e teste
+        n_jobs : int
+            Número de processos do pool (-1 usa todos os núcleos)
+        threads_per_task : int
+            Limite de threads por tarefa
+        time_budget : float or dict, opcional
+            Orçamento de tempo por modelo em segundos (único ou {nome: segundos});
+            dobras restantes de um modelo que o ultrapassa são canceladas
+        reuse_cv_fits : bool
+            Se True, cada modelo é treinado só nas 5 dobras e o modelo final é
+            o estimador da última dobra, treinado com 80% de X_train (sem o
+            treinamento extra no conjunto completo); as métricas de teste
+            são, portanto, de um modelo treinado com menos dados
+        profile : bool
+            Se True, mede latência, vazão e tamanho de cada modelo
+            (perfil_inferencia) e permite a seleção com restrições
+        max_latency_ms, max_size_kb, max_memory_kb : float, opcional
+            Restrições de implantação para a escolha do melhor modelo
+            (latência p99 de uma amostra, tamanho serializado e em memória);
+            ver select_best_model. Exigem profile=True
         """
+        constraints = (max_latency_ms, max_size_kb, max_memory_kb)
+        if not profile and any(limit is not None for limit in constraints):
+            raise ValueError("Restrições de implantação exigem profile=True")
+        
         print("\n" + "="*70)
         print("TREINAMENTO E AVALIAÇÃO DOS MODELOS")
         print("="*70 + "\n")
         
-        for name, model in self.models.items():
-            print(f"Treinando {name}...")
+        scheduler = TrainingScheduler(n_jobs=n_jobs, threads_per_task=threads_per_task,
+                                      time_budget=time_budget, refit=not reuse_cv_fits,
+                                      cache=self.model_cache)
+        print(f"Agendando {len(self.models)} modelos x ({'' if reuse_cv_fits else 'treino + '}5 dobras) em "
+              f"{scheduler.n_jobs} processo(s), {threads_per_task} thread(s) por tarefa\n")
+        scheduled = scheduler.run(self.models, X_train, y_train)
+        self.training_summary = scheduler.summary
+        self.training_data = (X_train, y_train, X_test, scheduler.folds)
+        
+        for name, run in scheduled.items():
+            print(f"Avaliando {name}...")
+            model = run['model']
             
-            # Treinamento
-            model.fit(X_train, y_train)
+            if model is None:
+                print(f"  -> Orçamento de tempo excedido antes do fim do treinamento\n")
+                continue
+            self.models[name] = model
             
             # Predições
             y_pred = model.predict(X_test)
             y_pred_proba = model.predict_proba(X_test) if hasattr(model, 'predict_proba') else None
             
-            # Validação cruzada
-            cv_scores = cross_val_score(model, X_train, y_train, cv=5, n_jobs=-1)
+            # Validação cruzada (dobras executadas pelo agendador)
+            cv_scores = run['cv_scores']
             
             # Métricas
             accuracy = accuracy_score(y_test, y_pred)
@@ -415,22 +849,311 @@ class ModelTrainer:
                 'cv_std': cv_scores.std(),
                 'y_pred': y_pred,
                 'y_pred_proba': y_pred_proba,
-                'confusion_matrix': confusion_matrix(y_test, y_pred)
+                'confusion_matrix': confusion_matrix(y_test, y_pred),
+                'model_fold': run['model_fold'],
+                'n_fits': run['n_fits'],
+                'fit_time': run['fit_time'],
+                'cv_time': run['cv_time'],
+                'cpu_time': run['cpu_time'],
+                'cpu_utilisation': run['cpu_utilisation'],
+                'budget_exceeded': run['budget_exceeded']
             }
             
             print(f"  -> Acurácia: {accuracy:.4f}")
             print(f"  -> F1-Score: {f1:.4f}")
-            print(f"  -> CV Score: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+            print(f"  -> CV Score: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})"
+                  + (f" [{len(cv_scores)} dobras, orçamento excedido]" if run['budget_exceeded'] else ""))
             print()
         
+        self.print_training_summary(scheduled)
+        
+        if profile:
+            self.profile_models(X_test)
+        
         # Identifica melhor modelo
+        self.select_best_model(max_latency_ms=max_latency_ms, max_size_kb=max_size_kb,
+                               max_memory_kb=max_memory_kb)
+    
+    def profile_models(self, X_test):
+        """
+        Mede latência de uma amostra, vazão em lote, tamanho serializado e
+        tamanho em memória de cada modelo treinado (perfil_inferencia) e
+        calcula a fronteira de Pareto entre F1 e esses custos.
+        
+        Parâmetros:
+        -----------
+        X_test : np.array
+            Amostras usadas nas predições (features normalizadas)
+        """
+        print("\n" + "="*70)
+        print("PERFIL DE INFERÊNCIA")
+        print("="*70 + "\n")
+        
+        print(f"{'Modelo':<22} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Vazão (amostras/s)':>19} "
+              f"{'Serializado (KB)':>17} {'Memória (KB)':>13}")
+        for name, result in self.results.items():
+            result.update(profile_inference(result['model'], X_test))
+            print(f"{name:<22} {result['latency_p50_ms']:>9.3f} {result['latency_p99_ms']:>9.3f} "
+                  f"{result['throughput']:>19.0f} {result['serialized_kb']:>17.1f} {result['memory_kb']:>13.1f}")
+        
+        self.pareto_front = pareto_front(self.results)
+        for name, result in self.results.items():
+            result['pareto'] = name in self.pareto_front
+        print(f"\nFronteira de Pareto (F1 x latência x tamanho): {', '.join(self.pareto_front)}\n")
+    
+    def select_best_model(self, max_latency_ms=None, max_size_kb=None, max_memory_kb=None):
+        """
+        Escolhe o melhor modelo: maior F1-Score entre os que atendem às
+        restrições de implantação (requer profile_models para restrições).
+        Se nenhum atender, usa o modelo da fronteira de Pareto que menos
+        ultrapassa as restrições (menor razão valor/limite no pior critério).
+        
+        Parâmetros:
+        -----------
+        max_latency_ms : float, opcional
+            Latência p99 máxima de uma amostra (ms)
+        max_size_kb : float, opcional
+            Tamanho serializado máximo (KB)
+        max_memory_kb : float, opcional
+            Tamanho máximo em memória (KB)
+        
+        Retorna:
+        --------
+        str
+            Nome do melhor modelo
+        """
+        constraints = {'max_latency_ms': max_latency_ms, 'max_size_kb': max_size_kb,
+                       'max_memory_kb': max_memory_kb}
+        constrained = any(limit is not None for limit in constraints.values())
+        
+        if not self.results:
+            raise ValueError("Nenhum modelo foi avaliado (orçamento de tempo excedido em todos)")
+        
         best_model_name = max(self.results, key=lambda x: self.results[x]['f1_score'])
+        if constrained:
+            if not self.pareto_front:
+                raise ValueError("Restrições de implantação exigem o perfil de inferência (profile_models)")
+            selected, feasible = select_under_constraints(self.results, **constraints)
+            labels = {'max_latency_ms': 'latência p99 <= {} ms', 'max_size_kb': 'tamanho <= {} KB',
+                      'max_memory_kb': 'memória <= {} KB'}
+            limits = ', '.join(labels[key].format(limit) for key, limit in constraints.items()
+                               if limit is not None)
+            if selected is None:
+                keys = {'max_latency_ms': 'latency_p99_ms', 'max_size_kb': 'serialized_kb',
+                        'max_memory_kb': 'memory_kb'}
+                excess = {name: max(self.results[name][keys[key]] / limit
+                                    for key, limit in constraints.items() if limit is not None)
+                          for name in self.pareto_front}
+                best_model_name = min(excess, key=excess.get)
+                print(f"⚠️  Nenhum modelo atende às restrições ({limits}); usando o modelo da "
+                      f"fronteira de Pareto mais próximo delas ({excess[best_model_name]:.2f}x o limite)")
+            else:
+                best_model_name = selected
+                print(f"Modelos que atendem às restrições ({limits}): {', '.join(feasible)}")
+        
         self.best_model = best_model_name
         
         print("="*70)
         print(f"MELHOR MODELO: {best_model_name}")
         print(f"F1-Score: {self.results[best_model_name]['f1_score']:.4f}")
+        if 'latency_p99_ms' in self.results[best_model_name]:
+            result = self.results[best_model_name]
+            print(f"Latência p99: {result['latency_p99_ms']:.3f} ms, "
+                  f"tamanho: {result['serialized_kb']:.1f} KB serializado / {result['memory_kb']:.1f} KB em memória")
         print("="*70)
+        return best_model_name
+    
+    def print_training_summary(self, scheduled):
+        """
+        Tempo de treino, de validação cruzada e uso de CPU por modelo.
+        """
+        print("-"*70)
+        print(f"{'Modelo':<22} {'Fits':>5} {'Treino (s)':>10} {'CV (s)':>8} {'CPU (s)':>8} {'Uso CPU':>8}")
+        for name, run in scheduled.items():
+            print(f"{name:<22} {run['n_fits']:>5} {run['fit_time']:>10.2f} {run['cv_time']:>8.2f} "
+                  f"{run['cpu_time']:>8.2f} {run['cpu_utilisation']:>7.0%}"
+                  + (" (cache)" if run['cached'] else ""))
+        
+        summary = self.training_summary
+        if summary['n_cached']:
+            print(f"\n{summary['n_cached']} modelo(s) carregado(s) do cache de modelos")
+        print(f"\n{summary['n_fits']} treinamentos, tempo total: {summary['wall_time']:.2f} s "
+              f"(tarefa mais longa: {summary['longest_task']:.2f} s, "
+              f"CPU somada: {summary['cpu_time']:.2f} s, "
+              f"utilização do pool: {summary['pool_utilisation']:.0%})")
+        print("-"*70 + "\n")
+    
+    def select_model(self, X_train, y_train, factor=3, min_resources='exhaust', scoring='f1_weighted',
+                     n_jobs=-1, threads_per_task=1):
+        """
+        Seleção do melhor modelo por halving sucessivo.
+        
+        Todos os modelos são validados (5 dobras) em uma subamostra
+        estratificada pequena; a cada rodada só o melhor 1/factor (F1 médio
+        da validação cruzada) continua, com factor vezes mais amostras. A
+        última rodada com mais de um candidato usa todo o conjunto de treino.
+        
+        Parâmetros:
+        -----------
+        X_train, y_train : np.array
+            Dados de treino
+        factor : int
+            Fator de redução de candidatos / aumento de amostras por rodada
+        min_resources : int or 'exhaust'
+            Amostras da primeira rodada; 'exhaust' escolhe o valor para que a
+            última rodada use todas as amostras
+        scoring : str
+            Métrica da validação cruzada (sklearn.metrics.get_scorer)
+        n_jobs, threads_per_task : int
+            Configuração do agendador de treinamento (ver train_and_evaluate)
+            
+        Retorna:
+        --------
+        dict
+            'best_model' (nome), 'rounds' (candidatos, amostras e notas de
+            cada rodada) e 'resources' (por modelo: rodadas, amostras de
+            treino somadas em todos os fits e tempo de CPU)
+        """
+        print("\n" + "="*70)
+        print("SELEÇÃO DE MODELO POR HALVING SUCESSIVO")
+        print("="*70 + "\n")
+        
+        X_train = np.asarray(X_train)
+        y_train = np.asarray(y_train)
+        n_samples = len(y_train)
+        candidates = list(self.models)
+        n_rounds = int(np.ceil(np.log(len(candidates)) / np.log(factor))) if len(candidates) > 1 else 1
+        if min_resources == 'exhaust':
+            min_resources = int(n_samples // factor ** (n_rounds - 1))
+        
+        # Ordem estratificada: qualquer prefixo mantém as proporções das classes
+        rng = np.random.RandomState(self.random_state)
+        rank = np.empty(n_samples)
+        for c in np.unique(y_train):
+            idx = np.flatnonzero(y_train == c)
+            rank[rng.permutation(idx)] = (np.arange(len(idx)) + 0.5) / len(idx)
+        order = np.argsort(rank, kind='stable')
+        
+        rounds = []
+        resources = {name: {'rounds': 0, 'samples': 0, 'cpu_time': 0.0} for name in candidates}
+        n_resources = min_resources
+        while True:
+            n_resources = min(n_resources, n_samples)
+            subset = np.sort(order[:n_resources])
+            scheduler = TrainingScheduler(n_jobs=n_jobs, threads_per_task=threads_per_task,
+                                          refit=False, scoring=scoring, cache=self.model_cache)
+            scheduled = scheduler.run({name: self.models[name] for name in candidates},
+                                      X_train[subset], y_train[subset])
+            
+            scores = {name: run['cv_scores'].mean() for name, run in scheduled.items()}
+            train_size = sum(len(train_idx) for train_idx, _ in scheduler.folds)
+            for name, run in scheduled.items():
+                resources[name]['rounds'] += 1
+                resources[name]['samples'] += train_size * run['n_fits'] // len(scheduler.folds)
+                resources[name]['cpu_time'] += run['cpu_time']
+            
+            ranking = sorted(candidates, key=lambda name: scores[name], reverse=True)
+            print(f"Rodada {len(rounds) + 1}: {len(candidates)} candidatos, {n_resources} amostras")
+            for name in ranking:
+                print(f"  {name:<22} {scoring}: {scores[name]:.4f}")
+            rounds.append({'n_candidates': len(candidates), 'n_resources': n_resources,
+                           'scores': scores})
+            
+            if len(candidates) == 1 or n_resources == n_samples:
+                break
+            candidates = ranking[:max(1, int(np.ceil(len(candidates) / factor)))]
+            if len(candidates) == 1:
+                break
+            n_resources *= factor
+        
+        best_model = ranking[0]
+        print(f"\nMODELO SELECIONADO: {best_model}\n")
+        return {'best_model': best_model, 'rounds': rounds, 'resources': resources}
+    
+    def tune_model(self, name, X_train, y_train, param_grid=None, factor=3, scoring='f1_weighted',
+                   n_jobs=-1, threads_per_task=1):
+        """
+        Busca de hiperparâmetros por halving sucessivo (HalvingGridSearchCV).
+        
+        Parâmetros:
+        -----------
+        name : str
+            Nome do modelo em self.models
+        X_train, y_train : np.array
+            Dados de treino
+        param_grid : dict, opcional
+            Grade de hiperparâmetros (PARAM_GRIDS[name] por padrão)
+        factor : int
+            Fator de redução de candidatos / aumento de amostras por rodada
+        scoring : str
+            Métrica da validação cruzada
+        n_jobs : int
+            Processos da busca
+        threads_per_task : int
+            Limite de threads de cada treinamento (n_jobs do estimador e
+            BLAS), como nas tarefas do agendador, para não haver paralelismo
+            aninhado dentro dos processos da busca
+            
+        Retorna:
+        --------
+        HalvingGridSearchCV
+            Busca concluída; o melhor estimador (treinado no conjunto
+            completo) substitui self.models[name]
+        """
+        estimator = clone(self.models[name])
+        if 'n_jobs' in estimator.get_params():
+            estimator.set_params(n_jobs=threads_per_task)
+        
+        search = HalvingGridSearchCV(
+            estimator,
+            param_grid if param_grid is not None else PARAM_GRIDS[name],
+            factor=factor,
+            cv=5,
+            scoring=scoring,
+            random_state=self.random_state,
+            n_jobs=n_jobs
+        )
+        with threadpool_limits(limits=threads_per_task):
+            search.fit(X_train, y_train)
+        
+        print(f"{name}: {search.n_candidates_[0]} combinações, {search.n_iterations_} rodadas, "
+              f"amostras por rodada {search.n_resources_}")
+        print(f"  -> Melhores parâmetros: {search.best_params_} ({scoring}: {search.best_score_:.4f})")
+        self.models[name] = search.best_estimator_
+        return search
+    
+    def predict_proba(self, name):
+        """
+        Probabilidades do modelo `name` no conjunto de teste.
+        
+        Para SVMs treinados sem calibração (initialize_models(lazy_probability=True)),
+        um clone com probability=True é treinado nos mesmos dados do modelo
+        avaliado na primeira chamada; o resultado fica em self.results.
+        
+        Retorna:
+        --------
+        np.array or None
+            Matriz (n_amostras, n_classes), ou None se o modelo não fornece
+            probabilidades
+        """
+        result = self.results[name]
+        if result['y_pred_proba'] is not None:
+            return result['y_pred_proba']
+        
+        model = result['model']
+        if not getattr(model, 'probability', True):
+            X_train, y_train, X_test, folds = self.training_data
+            if result['model_fold'] is not None:
+                train_idx = folds[result['model_fold']][0]
+                X_train, y_train = X_train[train_idx], y_train[train_idx]
+            
+            calibrated = clone(model).set_params(probability=True)
+            print(f"  -> Calibrando probabilidades de {name} ({fits_per_call(calibrated)} treinamentos)...")
+            calibrated.fit(X_train, y_train)
+            result['y_pred_proba'] = calibrated.predict_proba(X_test)
+            result['n_fits'] += fits_per_call(calibrated)
+        
+        return result['y_pred_proba']
     
     def generate_report(self, y_test):
         """
@@ -456,6 +1179,16 @@ class ModelTrainer:
             'CV Std': [self.results[m]['cv_std'] for m in self.results]
         })
         
+        # Custo de inferência (profile_models)
+        if all('latency_p99_ms' in r for r in self.results.values()):
+            comparison_df['Latência p50 (ms)'] = [self.results[m]['latency_p50_ms'] for m in self.results]
+            comparison_df['Latência p99 (ms)'] = [self.results[m]['latency_p99_ms'] for m in self.results]
+            comparison_df['Vazão (amostras/s)'] = [self.results[m]['throughput'] for m in self.results]
+            comparison_df['Tamanho Serializado (KB)'] = [self.results[m]['serialized_kb'] for m in self.results]
+            comparison_df['Memória (KB)'] = [self.results[m]['memory_kb'] for m in self.results]
+            comparison_df['Pareto'] = [self.results[m]['pareto'] for m in self.results]
+            comparison_df['Selecionado'] = [m == self.best_model for m in self.results]
+        
         comparison_df = comparison_df.sort_values('F1-Score', ascending=False)
         print(comparison_df.to_string(index=False))
         
@@ -534,14 +1267,16 @@ class ModelTrainer:
             fig, axes = plt.subplots(2, 4, figsize=(20, 10))
             axes = axes.flatten()
             
-            for idx, (name, result) in enumerate(self.results.items()):
-                if result['y_pred_proba'] is not None:
+            for idx, name in enumerate(self.results):
+                # Calibração sob demanda dos SVMs (initialize_models(lazy_probability=True))
+                y_pred_proba = self.predict_proba(name)
+                if y_pred_proba is not None:
                     ax = axes[idx]
                     
                     # ROC para cada classe (One-vs-Rest)
                     for i, class_name in enumerate(self.label_encoder.classes_):
                         y_test_binary = (y_test == i).astype(int)
-                        y_score = result['y_pred_proba'][:, i]
+                        y_score = y_pred_proba[:, i]
                         
                         fpr, tpr, _ = roc_curve(y_test_binary, y_score)
                         roc_auc = roc_auc_score(y_test_binary, y_score)
@@ -694,6 +1429,102 @@ class ModelTrainer:
         return importance_df, stats_dict
 
 
+def carregar_e_treinar_modelo(cache=None, test_size=0.3, random_state=42):
+    """
+    Carrega os dados organizados e treina a árvore de decisão (divisão
+    treino/teste e normalização de main), para os scripts medir_*.py.
+
+    Modelo, scaler e label encoder vêm do cache quando os dados e os
+    hiperparâmetros não mudaram.
+
+    Parâmetros:
+    -----------
+    cache : ModelCache, opcional
+        Cache de modelos (um novo ModelCache() por padrão)
+    test_size : float
+        Proporção dos dados para teste
+    random_state : int
+        Seed da divisão treino/teste
+
+    Retorna:
+    --------
+    tuple
+        (model, scaler, label_encoder, X_test_scaled)
+    """
+    cache = cache if cache is not None else ModelCache()
+    print("🔄 Carregando dados e treinando modelo...")
+
+    df = carregar_dados_organizados(window_size=100, overlap=50)
+    X = df.drop('Classe', axis=1)
+    y = df['Classe']
+    model = DecisionTreeClassifier(**DECISION_TREE_PARAMS)
+
+    def treinar():
+        # Codifica labels
+        label_encoder = LabelEncoder()
+        y_encoded = label_encoder.fit_transform(y)
+
+        # Divisão treino/teste
+        X_train, _, y_train, _ = train_test_split(
+            X, y_encoded, test_size=test_size, random_state=random_state, stratify=y_encoded
+        )
+
+        # Normalização
+        scaler = StandardScaler()
+        model.fit(scaler.fit_transform(X_train), y_train)
+        return model, scaler, label_encoder
+
+    hits = cache.hits
+    key = cache.fingerprint('arvore_decisao', model, X, y, test_size, random_state)
+    model, scaler, label_encoder = cache.memoize(key, treinar)
+
+    origem = 'carregado do cache' if cache.hits > hits else 'treinado'
+    print(f"✅ Modelo {origem} ({key}): {model.n_features_in_} features, "
+          f"{model.tree_.node_count} nós, profundidade {model.tree_.max_depth}")
+    print(f"   Classes: {label_encoder.classes_}")
+
+    # Conjunto de teste (mesma divisão do treinamento)
+    _, X_test = train_test_split(
+        X, test_size=test_size, random_state=random_state,
+        stratify=label_encoder.transform(y)
+    )
+    return model, scaler, label_encoder, scaler.transform(X_test)
+
+
+def treinar_arvore(processor, arquivos, cache=None):
+    """
+    Treina a árvore de decisão (DECISION_TREE_PARAMS) sobre todas as
+    features do armazém, sem divisão treino/teste, para os scripts medir_*.py.
+
+    Parâmetros:
+    -----------
+    processor : DataProcessor
+        Processador com a configuração das janelas
+    arquivos : list of tuples
+        Lista de tuplas (caminho_arquivo, rótulo_classe)
+    cache : ModelCache, opcional
+        Cache de modelos (um novo ModelCache() por padrão)
+
+    Retorna:
+    --------
+    tuple
+        (model, scaler)
+    """
+    cache = cache if cache is not None else ModelCache()
+
+    df = FeatureStore().organize(processor, arquivos)
+    X = df.drop('Classe', axis=1).to_numpy()
+    y = df['Classe'].to_numpy(dtype=str)
+    model = DecisionTreeClassifier(**DECISION_TREE_PARAMS)
+
+    def treinar():
+        scaler = StandardScaler().fit(X)
+        model.fit(scaler.transform(X), LabelEncoder().fit_transform(y))
+        return model, scaler
+
+    return cache.memoize(cache.fingerprint('arvore_decisao_completa', model, X, y), treinar)
+
+
 def main():
     """
     Função principal que executa todo o pipeline de processamento e classificação.
@@ -715,7 +1546,7 @@ def main():
     
     # Etapa 1: Processamento e Organização dos Dados
     processor = DataProcessor(window_size=100, overlap=50)
-    organized_data = processor.organize_data(files_and_labels)
+    organized_data = FeatureStore().organize(processor, files_and_labels)
     
     # Salva dados organizados
     output_file = f'{resultados_path}/dados_processados/dados_organizados.csv'
@@ -723,11 +1554,13 @@ def main():
     print(f"\nDados organizados salvos em: {output_file}\n")
     
     # Etapa 2: Treinamento dos Modelos
-    trainer = ModelTrainer(random_state=42)
+    model_cache = ModelCache()
+    trainer = ModelTrainer(random_state=42, model_cache=model_cache)
     X_train, X_test, y_train, y_test = trainer.prepare_data(organized_data, test_size=0.3)
     
     trainer.initialize_models()
-    trainer.train_and_evaluate(X_train, X_test, y_train, y_test)
+    trainer.train_and_evaluate(X_train, X_test, y_train, y_test, profile=True, **DEPLOYMENT_CONSTRAINTS)
+    model_cache.print_stats()
     
     # Etapa 3: Geração de Relatórios
     comparison_df = trainer.generate_report(y_test)
@@ -736,6 +1569,12 @@ def main():
     comparison_df.to_csv(f'{resultados_path}/modelos/comparacao_modelos.csv', index=False)
     print(f"\nRelatório salvo em: {resultados_path}/modelos/comparacao_modelos.csv")
     
+    # Pacotes de modelo (estimador + scaler + label encoder + especificação das features)
+    pacotes_path = f'{resultados_path}/modelos/pacotes'
+    os.makedirs(pacotes_path, exist_ok=True)
+    pacotes = salvar_pacotes(trainer, processor, pacotes_path)
+    print(f"Pacotes de modelo salvos em: {pacotes_path} ({len(pacotes)} modelos)")
+    
     # Etapa 4: Visualizações
     trainer.plot_results(y_test, save_path=f'{resultados_path}/visualizacoes')
     
@@ -759,6 +1598,7 @@ def main():
     print(f"  → {resultados_path}/dados_processados/dados_organizados.csv")
     print(f"\n📈 Modelos:")
     print(f"  → {resultados_path}/modelos/comparacao_modelos.csv")
+    print(f"  → {resultados_path}/modelos/pacotes/*.vmodel")
     print(f"\n📉 Visualizações Gerais:")
     print(f"  → {resultados_path}/visualizacoes/comparacao_modelos.png")
     print(f"  → {resultados_path}/visualizacoes/matriz_confusao.png")
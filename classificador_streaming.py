@@ -0,0 +1,425 @@
+"""
+Classificação em Tempo Real (Streaming) - Classificação de Vias
+===============================================================
+
+Classifica o tipo de via à medida que as amostras dos sensores chegam, sem
+precisar do CSV completo em memória.
+
+As amostras ficam em um buffer circular NumPy do tamanho da janela e as
+estatísticas básicas de cada sensor (soma, variância, soma dos quadrados,
+mínimo e máximo) são mantidas incrementalmente em O(1) por amostra. A cada
+passo (window_size - overlap) amostras, as demais features são calculadas
+sobre a janela atual e uma predição é emitida. As janelas são as mesmas do
+pipeline em lote (DataProcessor.create_sliding_windows).
+
+As features espectrais (FFT e PSD de Welch) vêm de uma DFT deslizante
+(SlidingDFT), atualizada em O(bins) por amostra em vez de uma FFT completa
+por janela. Opcionalmente, mediana e quartis vêm de um histograma deslizante
+(SlidingQuantileSketch) com erro limitado pela resolução escolhida.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+from scipy.fft import fft
+from scipy.signal import get_window
+
+from extracao_features import (FEATURE_NAMES, FEATURE_SPECS, SENSORS, WindowFeatures, median_from_partition,
+                               order_kth, percentile_from_partition, plan_features)
+
+# Features derivadas dos intermediários 'fft' e 'psd' de cada sensor
+SPECTRAL_FEATURES = {'fft_mean', 'fft_std', 'fft_max', 'dominant_freq', 'psd_mean', 'psd_max'}
+
+# Features derivadas das estatísticas de ordem de cada sensor
+QUANTILE_FEATURES = {'median', 'q25', 'q75', 'iqr'}
+
+
+class RollingStats:
+    """
+    Estatísticas de uma janela deslizante de um sensor, atualizadas em O(1).
+
+    Média e variância usam a atualização de Welford para janelas deslizantes
+    (numericamente estável); mínimo e máximo usam filas monotônicas. Média,
+    variância e soma dos quadrados são recalculadas exatamente a cada
+    `reanchor_every` amostras para não acumular erro de arredondamento.
+    """
+
+    def __init__(self, window_size, reanchor_every=None):
+        """
+        Parâmetros:
+        -----------
+        window_size : int
+            Tamanho da janela (número de amostras)
+        reanchor_every : int, opcional
+            Intervalo (em amostras) entre recálculos exatos; padrão 10 janelas
+        """
+        self.window_size = window_size
+        self.reanchor_every = reanchor_every or 10 * window_size
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sumsq = 0.0
+        self._min = deque()
+        self._max = deque()
+
+    def push(self, x, old, window):
+        """
+        Inclui a amostra `x` e remove `old` (None enquanto a janela enche).
+
+        Parâmetros:
+        -----------
+        x : float
+            Nova amostra
+        old : float or None
+            Amostra que sai da janela
+        window : np.array
+            Buffer circular do sensor (usado apenas no recálculo exato)
+        """
+        n = self.count
+        self.count += 1
+
+        if old is None:
+            # Janela ainda enchendo: Welford padrão
+            delta = x - self.mean
+            self.mean += delta / (n + 1)
+            self.m2 += delta * (x - self.mean)
+            self.sumsq += x * x
+        else:
+            mean_old = self.mean
+            self.mean += (x - old) / self.window_size
+            self.m2 += (x - old) * (x - self.mean + old - mean_old)
+            self.sumsq += x * x - old * old
+
+        if self.count >= self.window_size and self.count % self.reanchor_every == 0:
+            self.mean = window.mean()
+            self.m2 = np.sum((window - self.mean)**2)
+            self.sumsq = np.dot(window, window)
+
+        # Filas monotônicas de (índice, valor)
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        self._min.append((n, x))
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._max.append((n, x))
+
+        first = self.count - self.window_size
+        if self._min[0][0] < first:
+            self._min.popleft()
+        if self._max[0][0] < first:
+            self._max.popleft()
+
+    @property
+    def var(self):
+        return max(self.m2, 0.0) / min(self.count, self.window_size)
+
+    @property
+    def min(self):
+        return self._min[0][1]
+
+    @property
+    def max(self):
+        return self._max[0][1]
+
+
+class SlidingDFT:
+    """
+    DFT deslizante de um sensor, atualizada a cada amostra.
+
+    Mantém os bins X_k (k = 0..window_size//2 + 1) da janela atual pela
+    recorrência X_k <- (X_k - x_antigo + x_novo) * exp(2j*pi*k/N), com
+    recálculo exato por FFT a cada `reanchor_every` amostras para limitar o
+    erro de arredondamento acumulado.
+
+    Quando a janela cabe em um único segmento de Welch (window_size <= 256,
+    como em extract_features), a PSD também sai dos bins: remover a média
+    zera X_0 e a janela de Hann periódica equivale à convolução circular
+    0.5*X_k - 0.25*(X_{k-1} + X_{k+1}).
+    """
+
+    def __init__(self, window_size, reanchor_every=None):
+        """
+        Parâmetros:
+        -----------
+        window_size : int
+            Tamanho da janela (número de amostras)
+        reanchor_every : int, opcional
+            Intervalo (em amostras) entre recálculos exatos; padrão 10 janelas
+        """
+        self.window_size = window_size
+        self.reanchor_every = reanchor_every or 10 * window_size
+        self.n_bins = min(window_size // 2 + 2, window_size)
+        self.twiddle = np.exp(2j * np.pi * np.arange(self.n_bins) / window_size)
+        self.bins = np.zeros(self.n_bins, dtype=np.complex128)
+        self.count = 0
+
+        # Mesmos parâmetros de scipy.signal.welch(nperseg=window_size)
+        self.has_psd = window_size <= 256
+        self.window_power = np.sum(get_window('hann', window_size)**2)
+
+    def push(self, x, old):
+        """
+        Desloca a janela: inclui `x` e remove `old` (0.0 enquanto a janela enche).
+        """
+        self.bins += x - old
+        self.bins *= self.twiddle
+        self.count += 1
+
+    def needs_reanchor(self):
+        return self.count >= self.window_size and self.count % self.reanchor_every == 0
+
+    def reanchor(self, window):
+        """
+        Recalcula os bins exatamente a partir da janela em ordem cronológica.
+        """
+        self.bins = fft(window)[:self.n_bins]
+
+    def magnitude(self):
+        """
+        |FFT| da metade positiva (mesmo intermediário 'fft' de WindowFeatures).
+        """
+        return np.abs(self.bins[:self.window_size // 2])
+
+    def psd(self):
+        """
+        PSD de Welch (um segmento, Hann, detrend constante, densidade, fs=1).
+        """
+        n_freqs = self.window_size // 2 + 1
+        y = self.bins.copy()
+        y[0] = 0.0
+
+        # X_{-1} = conj(X_1) para sinais reais
+        prev = np.concatenate(([np.conj(y[1])], y[:n_freqs - 1]))
+        windowed = 0.5 * y[:n_freqs] - 0.25 * (prev + y[1:n_freqs + 1])
+
+        psd = np.abs(windowed)**2 / self.window_power
+        if self.window_size % 2 == 0:
+            psd[1:-1] *= 2
+        else:
+            psd[1:] *= 2
+        return psd
+
+
+class SlidingQuantileSketch:
+    """
+    Quantis aproximados de uma janela deslizante por histograma.
+
+    Cada amostra incrementa o contador do intervalo de largura `resolution`
+    que a contém (e a amostra que sai da janela o decrementa), em O(1). Na
+    consulta, as amostras de cada intervalo são distribuídas uniformemente
+    dentro dele e os quantis são interpolados como em np.percentile. Cada
+    estatística de ordem estimada cai no mesmo intervalo que a verdadeira,
+    então o erro de mediana, q25 e q75 é menor que `resolution`. O estado
+    ocupa um contador por intervalo ocupado, independente de window_size.
+    """
+
+    def __init__(self, window_size, resolution):
+        """
+        Parâmetros:
+        -----------
+        window_size : int
+            Tamanho da janela (número de amostras)
+        resolution : float
+            Largura dos intervalos do histograma (limite do erro absoluto)
+        """
+        self.window_size = window_size
+        self.resolution = resolution
+        self.counts = {}
+        self.kth = order_kth(window_size)
+
+    def push(self, x, old):
+        """
+        Inclui `x` e remove `old` (None enquanto a janela enche).
+        """
+        k = math.floor(x / self.resolution)
+        self.counts[k] = self.counts.get(k, 0) + 1
+
+        if old is not None:
+            k = math.floor(old / self.resolution)
+            if self.counts[k] == 1:
+                del self.counts[k]
+            else:
+                self.counts[k] -= 1
+
+    def order_stats(self):
+        """
+        Janela "particionada" aproximada (1, window_size): apenas as
+        posições usadas por mediana e quartis (order_kth) são preenchidas.
+        """
+        values = []
+        cumulative = 0
+        for k, c in sorted(self.counts.items()):
+            while len(values) < len(self.kth) and self.kth[len(values)] < cumulative + c:
+                rank = self.kth[len(values)] - cumulative
+                values.append((k + (rank + 0.5) / c) * self.resolution)
+            cumulative += c
+            if len(values) == len(self.kth):
+                break
+
+        part = np.empty((1, self.window_size), dtype=np.float64)
+        part[0, self.kth] = values
+        return part
+
+    def quantiles(self):
+        """
+        (mediana, quartis) aproximados, nos formatos de WindowFeatures.
+        """
+        part = self.order_stats()
+        return median_from_partition(part), np.stack([percentile_from_partition(part, q) for q in (25, 75)])
+
+
+class StreamingClassifier:
+    """
+    Classificador que recebe amostras uma a uma (ou em pequenos lotes) e
+    emite uma predição a cada passo de janela.
+    """
+
+    def __init__(self, model, scaler=None, window_size=100, overlap=50, features=None,
+                 sliding_dft=True, quantile_resolution=None):
+        """
+        Parâmetros:
+        -----------
+        model : estimador sklearn treinado
+            Modelo treinado sobre as features S1..Sn
+        scaler : StandardScaler, opcional
+            Scaler usado no treinamento
+        window_size : int
+            Tamanho da janela (número de amostras)
+        overlap : int
+            Sobreposição entre janelas consecutivas
+        features : list, opcional
+            Features a calcular (ver plan_features); por padrão, as lidas pelo modelo
+        sliding_dft : bool
+            Se True, as features espectrais vêm da DFT deslizante; se False,
+            são recalculadas por FFT/Welch sobre cada janela
+        quantile_resolution : float, opcional
+            Se informado, mediana, q25, q75 e iqr vêm de SlidingQuantileSketch
+            com esta resolução (erro absoluto máximo); por padrão são exatos,
+            por partição da janela (mais rápido para janelas de até ~1000 amostras)
+        """
+        self.model = model
+        self.scaler = scaler
+        self.window_size = window_size
+        self.hop = window_size - overlap
+        self.features = plan_features(model, features)
+
+        # Buffer circular por sensor: (n_sensores, window_size)
+        self.buffer = np.zeros((len(SENSORS), window_size), dtype=np.float64)
+        self.rolling = [RollingStats(window_size) for _ in SENSORS]
+        self.n_samples = 0
+
+        # DFT deslizante apenas para os sensores com features espectrais no plano
+        spectral = {FEATURE_SPECS[idx][0] for idx in self.features
+                    if FEATURE_SPECS[idx][1] in SPECTRAL_FEATURES}
+        self.dft = {s: SlidingDFT(window_size) for s in sorted(spectral)} if sliding_dft else {}
+
+        # Histogramas deslizantes apenas para os sensores com quantis no plano
+        quantile = {FEATURE_SPECS[idx][0] for idx in self.features
+                    if FEATURE_SPECS[idx][1] in QUANTILE_FEATURES}
+        self.sketches = {}
+        if quantile_resolution is not None:
+            self.sketches = {s: SlidingQuantileSketch(window_size, quantile_resolution)
+                             for s in sorted(quantile)}
+
+    def push(self, samples):
+        """
+        Recebe uma ou mais amostras e retorna as predições emitidas.
+
+        Parâmetros:
+        -----------
+        samples : array-like
+            Amostra (3,) ou lote (k, 3) com as colunas na ordem de SENSORS
+
+        Retorna:
+        --------
+        list of tuple
+            (índice da última amostra da janela, classe predita) para cada
+            janela completada por estas amostras
+        """
+        samples = np.atleast_2d(np.asarray(samples, dtype=np.float64))
+        emitted = []
+
+        for sample in samples:
+            if self.append(sample):
+                emitted.append((self.n_samples - 1, self.predict_current()))
+
+        return emitted
+
+    def append(self, sample):
+        """
+        Inclui uma amostra (3,) no buffer e nas estatísticas, sem predizer.
+
+        Retorna:
+        --------
+        bool
+            True se a amostra completou uma janela (momento de emitir)
+        """
+        pos = self.n_samples % self.window_size
+        full = self.n_samples >= self.window_size
+
+        for s, x in enumerate(sample.tolist()):
+            old = self.buffer[s, pos] if full else None
+            self.buffer[s, pos] = x
+            self.rolling[s].push(x, old, self.buffer[s])
+            if s in self.dft:
+                self.dft[s].push(x, old if full else 0.0)
+            if s in self.sketches:
+                self.sketches[s].push(x, old)
+
+        self.n_samples += 1
+        for s, dft in self.dft.items():
+            if dft.needs_reanchor():
+                dft.reanchor(self.current_window()[:, s])
+
+        return self.n_samples >= self.window_size and (self.n_samples - self.window_size) % self.hop == 0
+
+    def current_window(self):
+        """
+        Janela atual (window_size, 3) em ordem cronológica.
+        """
+        pos = self.n_samples % self.window_size
+        return np.roll(self.buffer, -pos, axis=1).T
+
+    def current_features(self):
+        """
+        Vetor de features (1, len(FEATURE_NAMES)) da janela atual.
+
+        As estatísticas mantidas incrementalmente são fornecidas diretamente;
+        as demais são calculadas sobre a janela. Features fora do plano
+        ficam em zero.
+        """
+        calc = WindowFeatures(self.current_window()[np.newaxis])
+        for s, stats in enumerate(self.rolling):
+            var = stats.var
+            calc.preset(s, 'mean', np.array([stats.mean]))
+            calc.preset(s, 'var', np.array([var]))
+            calc.preset(s, 'std', np.array([np.sqrt(var)]))
+            calc.preset(s, 'min', np.array([stats.min]))
+            calc.preset(s, 'max', np.array([stats.max]))
+            calc.preset(s, 'energy', np.array([stats.sumsq]))
+            calc.preset(s, 'rms', np.array([np.sqrt(stats.sumsq / self.window_size)]))
+
+        for s, dft in self.dft.items():
+            calc.preset(s, 'fft', dft.magnitude()[np.newaxis])
+            if dft.has_psd:
+                calc.preset(s, 'psd', dft.psd()[np.newaxis])
+
+        for s, sketch in self.sketches.items():
+            median, quartiles = sketch.quantiles()
+            calc.preset(s, 'median', median)
+            calc.preset(s, 'quartiles', quartiles)
+
+        features = np.zeros((1, len(FEATURE_NAMES)), dtype=np.float64)
+        for idx in self.features:
+            features[:, idx] = calc.feature(idx)
+        return features
+
+    def predict_current(self):
+        """
+        Classe predita para a janela atual.
+        """
+        features = self.current_features()
+        if self.scaler is not None:
+            features = self.scaler.transform(features)
+        return self.model.predict(features)[0]
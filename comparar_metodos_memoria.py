@@ -13,6 +13,8 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler
 import pandas as pd
 
+from armazem_features import carregar_dados_organizados
+
 # Importa bibliotecas conforme disponibilidade
 try:
     from pympler import asizeof
@@ -248,10 +250,8 @@ def comparacao_pratica_modelos():
     print("="*70)
     
     # Cria modelo similar ao do projeto
-    dados_path = "./resultados/dados_processados/dados_organizados.csv"
-    
     try:
-        df = pd.read_csv(dados_path)
+        df = carregar_dados_organizados(window_size=100, overlap=50)
         X = df.drop('Classe', axis=1).iloc[:1000]  # Amostra menor para teste
         y = df['Classe'].iloc[:1000]
         
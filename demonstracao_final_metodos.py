@@ -11,6 +11,8 @@ import sys
 import psutil
 from pympler.asizeof import asizeof
 
+from cache_dados import load_sensor_data
+
 if __name__ == "__main__":
     print("=" * 80)
     print("  DEMONSTRAÇÃO DOS 4 MÉTODOS DE MEDIÇÃO DE MEMÓRIA")
@@ -18,9 +20,9 @@ if __name__ == "__main__":
 
     # Carregar dados reduzidos
     print("\n🔄 Carregando dados (amostra para demonstração)...")
-    cimento = pd.read_csv('dados/cimento_utinga.csv').head(500)
-    asfalto = pd.read_csv('dados/rua_asfalto.csv').head(500)
-    terra = pd.read_csv('dados/terra_batida.csv').head(500)
+    cimento = load_sensor_data('dados/cimento_utinga.csv').head(500)
+    asfalto = load_sensor_data('dados/rua_asfalto.csv').head(500)
+    terra = load_sensor_data('dados/terra_batida.csv').head(500)
 
     cimento['tipo_via'] = 'cimento'
     asfalto['tipo_via'] = 'asfalto'
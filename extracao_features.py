@@ -0,0 +1,706 @@
+"""
+Extração Vetorizada de Features - Classificação de Vias
+=======================================================
+
+Motor de extração em lote das mesmas features calculadas por
+DataProcessor.extract_features, porém para todas as janelas de uma só vez.
+
+Em vez de fatiar o DataFrame janela a janela, os sinais dos sensores são
+organizados em uma visão deslizante (n_janelas, window_size, 3) sem cópia
+(numpy.lib.stride_tricks.sliding_window_view) e cada estatística é calculada
+ao longo do eixo da janela em uma única chamada NumPy/SciPy.
+
+Quando o sinal contínuo está disponível (extract_features_signal), as
+estatísticas combináveis (momentos, mínimo/máximo, energia, produtos
+cruzados) são calculadas uma vez por bloco do tamanho do passo e combinadas
+por janela em tempo constante, de modo que amostras compartilhadas por
+janelas sobrepostas não são reprocessadas. extract_features_multiresolution estende isso a várias
+configurações de janela sobre o mesmo sinal.
+"""
+
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+from scipy.fft import fft
+from scipy.signal import welch
+
+
+# Versão do conjunto de features: incrementar sempre que a definição, a forma
+# de cálculo ou a ordem das features mudar (invalida as entradas do armazém)
+FEATURE_SET_VERSION = 3
+
+# Sensores utilizados, na ordem em que as features são geradas
+SENSORS = ['LinearAccelerometerSensor', 'AccX', 'AccY']
+
+# Features calculadas para cada sensor (mesma ordem de extract_features)
+SENSOR_FEATURES = [
+    'mean', 'std', 'var', 'min', 'max', 'range', 'median', 'q25', 'q75', 'iqr',
+    'skewness', 'kurtosis', 'rms', 'energy',
+    'fft_mean', 'fft_std', 'fft_max', 'dominant_freq',
+    'psd_mean', 'psd_max'
+]
+
+# Features combinadas entre sensores
+COMBINED_FEATURES = ['acc_magnitude', 'acc_x_y_correlation']
+
+# Ordem final das colunas (corresponde a S1, S2, ..., Sn)
+FEATURE_NAMES = [f'{sensor}_{feature}'
+                 for sensor in SENSORS
+                 for feature in SENSOR_FEATURES] + COMBINED_FEATURES
+
+
+def window_view(values, window_size, step_size):
+    """
+    Cria a visão deslizante das janelas sem copiar os dados.
+
+    Parâmetros:
+    -----------
+    values : np.array
+        Matriz (n_amostras, n_sensores) com os sinais dos sensores
+    window_size : int
+        Tamanho da janela (número de amostras)
+    step_size : int
+        Passo entre o início de janelas consecutivas
+
+    Retorna:
+    --------
+    np.array
+        Visão (n_janelas, window_size, n_sensores) sobre `values`
+    """
+    values = np.asarray(values)
+    if len(values) < window_size:
+        return np.empty((0, window_size, values.shape[1]), dtype=values.dtype)
+
+    # sliding_window_view coloca o eixo da janela por último: (n, 3, window_size)
+    windows = sliding_window_view(values, window_size, axis=0)[::step_size]
+    return windows.transpose(0, 2, 1)
+
+
+# (índice do sensor, nome da feature) de cada coluna de FEATURE_NAMES;
+# features combinadas usam None como sensor
+FEATURE_SPECS = [(s, feature)
+                 for s in range(len(SENSORS))
+                 for feature in SENSOR_FEATURES] + [(None, f) for f in COMBINED_FEATURES]
+
+
+def extract_features_batch(windows, out=None, features=None, fill_value=0.0):
+    """
+    Extrai as features de um lote de janelas.
+
+    Parâmetros:
+    -----------
+    windows : np.array
+        Janelas (n_janelas, window_size, 3) com as colunas na ordem de SENSORS
+    out : np.array, opcional
+        Matriz pré-alocada (n_janelas, len(FEATURE_NAMES)) para o resultado
+    features : list of int, opcional
+        Índices (em FEATURE_NAMES) das features a calcular; por padrão todas.
+        Apenas os intermediários necessários a essas features são calculados
+        (ver plan_features)
+    fill_value : float
+        Valor das colunas não calculadas quando `features` é informado
+
+    Retorna:
+    --------
+    np.array
+        Matriz de features com colunas na ordem de FEATURE_NAMES
+    """
+    if out is None:
+        out = np.empty((len(windows), len(FEATURE_NAMES)), dtype=np.float64)
+    if len(windows) == 0:
+        return out
+
+    if features is None:
+        features = range(len(FEATURE_NAMES))
+    else:
+        out[:] = fill_value
+
+    calc = WindowFeatures(windows)
+    for idx in features:
+        out[:, idx] = calc.feature(idx)
+    return out
+
+
+def extract_features_signal(values, window_size, step_size, out=None, features=None,
+                            fill_value=0.0):
+    """
+    Extrai as features de todas as janelas de um sinal contínuo.
+
+    Equivalente a extract_features_batch(window_view(values, window_size,
+    step_size)), mas com as estatísticas combináveis calculadas por blocos
+    (ver BlockWindowFeatures).
+
+    Parâmetros:
+    -----------
+    values : np.array
+        Matriz (n_amostras, 3) com os sinais na ordem de SENSORS; a primeira
+        janela começa na primeira amostra
+    window_size : int
+        Tamanho da janela (número de amostras)
+    step_size : int
+        Passo entre o início de janelas consecutivas
+    out, features, fill_value :
+        Como em extract_features_batch
+
+    Retorna:
+    --------
+    np.array
+        Matriz de features com colunas na ordem de FEATURE_NAMES
+    """
+    calc = BlockWindowFeatures(values, window_size, step_size)
+    n_windows = len(calc.windows)
+
+    if out is None:
+        out = np.empty((n_windows, len(FEATURE_NAMES)), dtype=np.float64)
+    if n_windows == 0:
+        return out
+
+    if features is None:
+        features = range(len(FEATURE_NAMES))
+    else:
+        out[:] = fill_value
+
+    for idx in features:
+        out[:, idx] = calc.feature(idx)
+    return out
+
+
+def extract_features_multiresolution(values, configs, features=None, fill_value=0.0):
+    """
+    Extrai as features de várias configurações de janela em uma só passada.
+
+    Configurações com o mesmo window_size compartilham as janelas (a união
+    dos inícios é calculada uma vez, inclusive FFT, PSD e quartis); as
+    estatísticas por bloco são compartilhadas entre todas as configurações
+    com o mesmo tamanho de bloco.
+
+    Parâmetros:
+    -----------
+    values : np.array
+        Matriz (n_amostras, 3) com os sinais na ordem de SENSORS
+    configs : list of tuples
+        Pares (window_size, step_size)
+    features, fill_value :
+        Como em extract_features_batch
+
+    Retorna:
+    --------
+    dict
+        {(window_size, step_size): matriz de features (n_janelas, len(FEATURE_NAMES))}
+    """
+    values = np.asarray(values)
+    block_cache = {}
+    resultados = {}
+
+    steps_by_size = {}
+    for window_size, step_size in configs:
+        steps_by_size.setdefault(window_size, []).append(step_size)
+
+    for window_size, steps in steps_by_size.items():
+        n_starts = max(len(values) - window_size + 1, 0)
+        starts = {step: np.arange(0, n_starts, step) for step in steps}
+        union = np.unique(np.concatenate(list(starts.values())))
+
+        step_gcd = 0
+        for step in steps:
+            step_gcd = gcd(step_gcd, step)
+
+        calc = BlockWindowFeatures(values, window_size, step_gcd, starts=union,
+                                   block_cache=block_cache)
+        out = np.empty((len(union), len(FEATURE_NAMES)), dtype=np.float64)
+        if len(union):
+            if features is None:
+                wanted = range(len(FEATURE_NAMES))
+            else:
+                wanted = features
+                out[:] = fill_value
+            for idx in wanted:
+                out[:, idx] = calc.feature(idx)
+
+        for step in steps:
+            resultados[(window_size, step)] = out[np.searchsorted(union, starts[step])]
+
+    return resultados
+
+
+def plan_features(model=None, features=None):
+    """
+    Planeja quais features precisam ser calculadas.
+
+    Inspeciona um modelo treinado e retorna apenas as features que ele de
+    fato lê: nós de divisão das árvores (tree_.feature, inclusive em
+    florestas e boosting) ou coeficientes não nulos de modelos lineares.
+    Modelos sem essa informação (SVM RBF, KNN, Naive Bayes) usam todas.
+
+    Parâmetros:
+    -----------
+    model : estimador sklearn treinado, opcional
+        Modelo treinado sobre as colunas S1..Sn
+    features : list, opcional
+        Lista explícita de features (nomes de FEATURE_NAMES, nomes S1..Sn
+        ou índices); tem prioridade sobre `model`
+
+    Retorna:
+    --------
+    list of int
+        Índices (em FEATURE_NAMES) ordenados das features necessárias
+    """
+    if features is not None:
+        return sorted({_feature_index(f) for f in features})
+    if model is None:
+        return list(range(len(FEATURE_NAMES)))
+    return sorted(_model_features(model))
+
+
+def _model_features(model):
+    """
+    Índices das features lidas por um modelo treinado.
+    """
+    if hasattr(model, 'tree_'):
+        feature = model.tree_.feature
+        return set(feature[feature >= 0].tolist())
+
+    if hasattr(model, 'estimators_'):
+        used = set()
+        for estimator in np.ravel(model.estimators_):
+            used |= _model_features(estimator)
+        return used
+
+    if hasattr(model, 'coef_'):
+        coef = np.atleast_2d(model.coef_)
+        return set(np.flatnonzero(np.any(coef != 0, axis=0)).tolist())
+
+    return set(range(getattr(model, 'n_features_in_', len(FEATURE_NAMES))))
+
+
+def _feature_index(feature):
+    """
+    Converte um nome de feature (original ou S1..Sn) ou índice em índice.
+    """
+    if isinstance(feature, (int, np.integer)):
+        return int(feature)
+    if feature in FEATURE_NAMES:
+        return FEATURE_NAMES.index(feature)
+    if feature.startswith('S') and feature[1:].isdigit():
+        return int(feature[1:]) - 1
+    raise ValueError(f"Feature desconhecida: {feature}")
+
+
+class WindowFeatures:
+    """
+    Cálculo sob demanda das features de um lote de janelas.
+
+    Cada feature é calculada apenas quando solicitada e os intermediários
+    compartilhados (cópia contígua de cada sensor, quadrados, estatísticas de
+    ordem, FFT, PSD de Welch) são memorizados por sensor. Mediana e quartis
+    saem de uma única partição por janela (np.partition com todas as posições
+    necessárias), com a mesma interpolação de np.median/np.percentile. Cada linha é calculada sobre
+    uma cópia contígua da janela, então o resultado não depende de quantas
+    janelas são processadas juntas.
+    """
+
+    def __init__(self, windows):
+        """
+        Parâmetros:
+        -----------
+        windows : np.array
+            Janelas (n_janelas, window_size, 3) com as colunas na ordem de SENSORS
+        """
+        self.windows = windows
+        self.window_size = windows.shape[1]
+        self.computed = set()
+        self._memo = {}
+
+    def feature(self, idx):
+        """
+        Valores da feature FEATURE_NAMES[idx] para todas as janelas.
+        """
+        self.computed.add(idx)
+        return self.get(*FEATURE_SPECS[idx])
+
+    def intermediates(self):
+        """
+        Nomes ('sensor_intermediário') de tudo que já foi calculado.
+        """
+        return [f'{SENSORS[s]}_{name}' if s is not None else name for s, name in self._memo]
+
+    def preset(self, s, name, values):
+        """
+        Fornece o valor de uma feature ou intermediário já calculado por
+        outro meio (por exemplo, estatísticas móveis no modo streaming).
+        """
+        self._memo[(s, name)] = values
+
+    def get(self, s, name):
+        """
+        Valor memorizado de uma feature ou intermediário do sensor `s`.
+        """
+        key = (s, name)
+        if key not in self._memo:
+            self._memo[key] = _CALCULOS[name](self, s)
+        return self._memo[key]
+
+
+class BlockWindowFeatures(WindowFeatures):
+    """
+    WindowFeatures que reaproveita blocos entre janelas sobrepostas.
+
+    O sinal é dividido em blocos de gcd(window_size, step_size) amostras;
+    cada janela é a união de blocks_per_window blocos consecutivos. Por
+    bloco são calculados média e momentos centrais (M2, M3, M4), soma dos
+    quadrados, mínimo, máximo, soma da magnitude AccX/AccY e co-momento
+    AccX/AccY, combinados (Pébay, 2008) por janela em O(1): os blocos são
+    agrupados em segmentos alinhados de blocks_per_window blocos, com
+    combinações acumuladas do início de cada segmento até cada bloco e de
+    cada bloco até o fim do segmento. Toda janela é um sufixo de um segmento
+    mais um prefixo do seguinte, de modo que o custo não depende da
+    sobreposição. Mediana, quartis, FFT e PSD continuam sendo calculados
+    janela a janela.
+    """
+
+    def __init__(self, values, window_size, step_size, starts=None, block_cache=None):
+        """
+        Parâmetros:
+        -----------
+        values : np.array
+            Matriz (n_amostras, 3) com os sinais na ordem de SENSORS
+        window_size : int
+            Tamanho da janela (número de amostras)
+        step_size : int
+            Passo entre o início de janelas consecutivas
+        starts : np.array, opcional
+            Inícios das janelas (múltiplos de step_size); por padrão todas as
+            janelas de passo step_size
+        block_cache : dict, opcional
+            Estatísticas por bloco compartilhadas entre instâncias sobre o
+            mesmo sinal (ver extract_features_multiresolution)
+        """
+        values = np.asarray(values)
+        if starts is None:
+            super().__init__(window_view(values, window_size, step_size))
+            starts = np.arange(len(self.windows)) * step_size
+        else:
+            view = sliding_window_view(values, window_size, axis=0)
+            super().__init__(view[starts].transpose(0, 2, 1))
+
+        self.block_size = gcd(window_size, step_size)
+        self.blocks_per_window = window_size // self.block_size
+        self.start_blocks = np.asarray(starts) // self.block_size
+
+        # Sinal organizado em blocos completos (n_blocos, bloco, 3)
+        n_used = len(values) // self.block_size * self.block_size
+        self.blocks = values[:n_used].reshape(-1, self.block_size, values.shape[1])
+        self.block_cache = {} if block_cache is None else block_cache
+
+    def get(self, s, name):
+        key = (s, name)
+        if key not in self._memo and name in _CALCULOS_BLOCOS:
+            self._memo[key] = _CALCULOS_BLOCOS[name](self, s)
+        return super().get(s, name)
+
+    def block_stat(self, s, name):
+        """
+        Estatística `name` de cada bloco (memorizada por tamanho de bloco).
+        """
+        key = (self.block_size, s, name)
+        if key not in self.block_cache:
+            self.block_cache[key] = _ESTATISTICAS_BLOCO[name](self, s)
+        return self.block_cache[key]
+
+    def segment_scans(self, s, name, merge):
+        """
+        Combinações acumuladas da estatística `name` dentro de cada segmento
+        de blocks_per_window blocos: (prefixos, sufixos), ambos (n_blocos, ...),
+        com prefixos[b] = blocos do início do segmento até b e sufixos[b] =
+        blocos de b até o fim do segmento.
+        """
+        key = (self.block_size, self.blocks_per_window, s, name, 'segmentos')
+        if key in self.block_cache:
+            return self.block_cache[key]
+
+        bpw, n_b = self.blocks_per_window, self.block_size
+        block_values = self.block_stat(s, name)
+        n_blocks = len(block_values)
+
+        # Último segmento completado com cópias do último bloco (nunca usadas)
+        n_pad = -n_blocks % bpw
+        padded = np.concatenate([block_values, np.repeat(block_values[-1:], n_pad, axis=0)])
+        segments = padded.reshape((-1, bpw) + block_values.shape[1:])
+
+        accumulate = _ACUMULADORES.get(merge)
+        if accumulate is not None:
+            prefix = accumulate(segments, axis=1)
+            suffix = accumulate(segments[:, ::-1], axis=1)[:, ::-1]
+        else:
+            prefix = segments.copy()
+            suffix = segments.copy()
+            for j in range(1, bpw):
+                prefix[:, j] = merge(prefix[:, j - 1], segments[:, j], j * n_b, n_b)
+                k = bpw - 1 - j
+                suffix[:, k] = merge(segments[:, k], suffix[:, k + 1], n_b, j * n_b)
+
+        scans = (prefix.reshape(padded.shape)[:n_blocks], suffix.reshape(padded.shape)[:n_blocks])
+        self.block_cache[key] = scans
+        return scans
+
+    def window_merge(self, s, name, merge):
+        """
+        Estatística `name` combinada por janela com merge(a, b, n_a, n_b):
+        sufixo do segmento da primeira janela + prefixo do seguinte.
+        """
+        prefix, suffix = self.segment_scans(s, name, merge)
+        bpw, n_b = self.blocks_per_window, self.block_size
+
+        first = self.start_blocks
+        last = first + bpw - 1
+        offset = first % bpw
+        aligned = offset == 0
+
+        # Janelas alinhadas a um segmento são o prefixo completo dele
+        merged = merge(suffix[first], prefix[last], (bpw - offset) * n_b, offset * n_b)
+        mask = aligned.reshape((-1,) + (1,) * (prefix.ndim - 1))
+        return np.where(mask, prefix[last], merged)
+
+
+def _block_central_moments(wf, s):
+    """
+    (média, M2, M3, M4) de cada bloco: (n_blocos, 4).
+    """
+    x = wf.block_stat(s, 'data')
+    mean = x.mean(axis=1)
+    d = x - mean[:, np.newaxis]
+    d2 = d * d
+    return np.stack([mean, d2.sum(axis=1), (d2 * d).sum(axis=1), (d2 * d2).sum(axis=1)], axis=1)
+
+
+def _block_cross_moment(wf, s):
+    """
+    (média AccX, média AccY, co-momento) de cada bloco: (n_blocos, 3).
+    """
+    x = wf.block_stat(_ACC_X, 'data')
+    y = wf.block_stat(_ACC_Y, 'data')
+    mx, my = x.mean(axis=1), y.mean(axis=1)
+    cxy = ((x - mx[:, np.newaxis]) * (y - my[:, np.newaxis])).sum(axis=1)
+    return np.stack([mx, my, cxy], axis=1)
+
+
+def _merge_moments(a, b, na, nb):
+    """
+    Combina (média, M2, M3, M4) de dois trechos com na e nb amostras (Pébay, 2008).
+    """
+    ma, m2a, m3a, m4a = (a[..., j] for j in range(4))
+    mb, m2b, m3b, m4b = (b[..., j] for j in range(4))
+    n = na + nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = mb - ma
+        delta_n = delta / n
+
+        m4 = (m4a + m4b + delta * delta_n**3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * delta_n**2 * (na * na * m2b + nb * nb * m2a)
+              + 4 * delta_n * (na * m3b - nb * m3a))
+        m3 = (m3a + m3b + delta * delta_n**2 * na * nb * (na - nb)
+              + 3 * delta_n * (na * m2b - nb * m2a))
+        m2 = m2a + m2b + delta * delta_n * na * nb
+    return np.stack([ma + delta_n * nb, m2, m3, m4], axis=-1)
+
+
+def _merge_cross(a, b, na, nb):
+    """
+    Combina (média AccX, média AccY, co-momento) de dois trechos.
+    """
+    n = na + nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dx = b[..., 0] - a[..., 0]
+        dy = b[..., 1] - a[..., 1]
+        c = a[..., 2] + b[..., 2] + dx * dy * (na * nb / n)
+        return np.stack([a[..., 0] + dx * (nb / n), a[..., 1] + dy * (nb / n), c], axis=-1)
+
+
+def _merge_sum(a, b, na, nb):
+    return a + b
+
+
+def _merge_min(a, b, na, nb):
+    return np.minimum(a, b)
+
+
+def _merge_max(a, b, na, nb):
+    return np.maximum(a, b)
+
+
+# Combinações associativas com acumulação vetorizada do NumPy (segment_scans)
+_ACUMULADORES = {
+    _merge_sum: np.cumsum,
+    _merge_min: np.minimum.accumulate,
+    _merge_max: np.maximum.accumulate,
+}
+
+
+def _block_moments(wf, s):
+    """
+    (média, M2, M3, M4) de cada janela combinando os momentos dos blocos.
+    """
+    return tuple(wf.window_merge(s, 'moments', _merge_moments).T)
+
+
+def _block_shape_stat(wf, s, order):
+    """
+    Assimetria (order=3) ou curtose de Fisher (order=4) com o mesmo critério
+    de scipy.stats para janelas praticamente constantes (resultado NaN).
+    """
+    mean, m2, m3, m4 = wf.get(s, 'moments')
+    n = wf.window_size
+    var = m2 / n
+    zero = var <= (np.finfo(np.float64).eps * mean)**2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if order == 3:
+            vals = (m3 / n) / var**1.5
+        else:
+            vals = (m4 / n) / var**2.0 - 3
+    return np.where(zero, np.nan, vals)
+
+
+def _block_correlation(wf):
+    cxy = wf.window_merge(None, 'cross', _merge_cross)[:, 2]
+    m2x = wf.get(_ACC_X, 'moments')[1]
+    m2y = wf.get(_ACC_Y, 'moments')[1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = cxy / np.sqrt(m2x * m2y)
+    return np.clip(r, -1, 1)
+
+
+_ACC_X = SENSORS.index('AccX')
+_ACC_Y = SENSORS.index('AccY')
+
+# Como calcular cada feature/intermediário a partir de WindowFeatures
+_CALCULOS = {
+    # Intermediários compartilhados
+    'data': lambda wf, s: np.ascontiguousarray(wf.windows[:, :, s], dtype=np.float64),
+    'sq': lambda wf, s: wf.get(s, 'data')**2,
+    'order_stats': lambda wf, s: np.partition(wf.get(s, 'data'), order_kth(wf.window_size), axis=-1),
+    'quartiles': lambda wf, s: np.stack([percentile_from_partition(wf.get(s, 'order_stats'), q)
+                                         for q in (25, 75)]),
+    'fft': lambda wf, s: np.abs(fft(wf.get(s, 'data'), axis=-1))[:, :wf.window_size // 2],
+    'psd': lambda wf, s: welch(wf.get(s, 'data'), nperseg=min(wf.window_size, 256), axis=-1)[1],
+
+    # Features estatísticas no domínio do tempo
+    'mean': lambda wf, s: wf.get(s, 'data').mean(axis=-1),
+    'std': lambda wf, s: wf.get(s, 'data').std(axis=-1),
+    'var': lambda wf, s: wf.get(s, 'data').var(axis=-1),
+    'min': lambda wf, s: wf.get(s, 'data').min(axis=-1),
+    'max': lambda wf, s: wf.get(s, 'data').max(axis=-1),
+    'range': lambda wf, s: wf.get(s, 'max') - wf.get(s, 'min'),
+    'median': lambda wf, s: median_from_partition(wf.get(s, 'order_stats')),
+    'q25': lambda wf, s: wf.get(s, 'quartiles')[0],
+    'q75': lambda wf, s: wf.get(s, 'quartiles')[1],
+    'iqr': lambda wf, s: wf.get(s, 'q75') - wf.get(s, 'q25'),
+
+    # Features adicionais
+    'skewness': lambda wf, s: stats.skew(wf.get(s, 'data'), axis=-1),
+    'kurtosis': lambda wf, s: stats.kurtosis(wf.get(s, 'data'), axis=-1),
+    'rms': lambda wf, s: np.sqrt(np.mean(wf.get(s, 'sq'), axis=-1)),
+    'energy': lambda wf, s: np.sum(wf.get(s, 'sq'), axis=-1),
+
+    # Features no domínio da frequência (apenas metade positiva da FFT)
+    'fft_mean': lambda wf, s: wf.get(s, 'fft').mean(axis=-1),
+    'fft_std': lambda wf, s: wf.get(s, 'fft').std(axis=-1),
+    'fft_max': lambda wf, s: wf.get(s, 'fft').max(axis=-1),
+    'dominant_freq': lambda wf, s: wf.get(s, 'fft').argmax(axis=-1),
+
+    # Densidade espectral de potência
+    'psd_mean': lambda wf, s: wf.get(s, 'psd').mean(axis=-1),
+    'psd_max': lambda wf, s: wf.get(s, 'psd').max(axis=-1),
+
+    # Features combinadas entre sensores
+    'acc_magnitude': lambda wf, s: np.mean(np.sqrt(wf.get(_ACC_X, 'sq') + wf.get(_ACC_Y, 'sq')), axis=1),
+    'acc_x_y_correlation': lambda wf, s: _pearson(wf.get(_ACC_X, 'data'), wf.get(_ACC_Y, 'data')),
+}
+
+
+# Estatísticas calculadas uma vez por bloco (BlockWindowFeatures.block_stat)
+_ESTATISTICAS_BLOCO = {
+    'data': lambda wf, s: np.ascontiguousarray(wf.blocks[:, :, s], dtype=np.float64),
+    'moments': _block_central_moments,
+    'min': lambda wf, s: wf.block_stat(s, 'data').min(axis=1),
+    'max': lambda wf, s: wf.block_stat(s, 'data').max(axis=1),
+    'sumsq': lambda wf, s: np.sum(wf.block_stat(s, 'data')**2, axis=1),
+    'magnitude': lambda wf, s: np.sum(np.sqrt(wf.block_stat(_ACC_X, 'data')**2
+                                              + wf.block_stat(_ACC_Y, 'data')**2), axis=1),
+    'cross': _block_cross_moment,
+}
+
+# Features calculadas a partir de estatísticas combinadas por bloco
+# (BlockWindowFeatures); as demais usam _CALCULOS
+_CALCULOS_BLOCOS = {
+    'moments': _block_moments,
+    'mean': lambda wf, s: wf.get(s, 'moments')[0],
+    'var': lambda wf, s: wf.get(s, 'moments')[1] / wf.window_size,
+    'std': lambda wf, s: np.sqrt(wf.get(s, 'var')),
+    'min': lambda wf, s: wf.window_merge(s, 'min', _merge_min),
+    'max': lambda wf, s: wf.window_merge(s, 'max', _merge_max),
+    'skewness': lambda wf, s: _block_shape_stat(wf, s, 3),
+    'kurtosis': lambda wf, s: _block_shape_stat(wf, s, 4),
+    'energy': lambda wf, s: wf.window_merge(s, 'sumsq', _merge_sum),
+    'rms': lambda wf, s: np.sqrt(wf.get(s, 'energy') / wf.window_size),
+    'acc_magnitude': lambda wf, s: wf.window_merge(None, 'magnitude', _merge_sum) / wf.window_size,
+    'acc_x_y_correlation': lambda wf, s: _block_correlation(wf),
+}
+
+
+def order_kth(window_size):
+    """
+    Posições ordenadas necessárias para mediana, q25 e q75 (interpolação linear).
+    """
+    kth = set()
+    for q in (25, 50, 75):
+        position = (window_size - 1) * (q / 100)
+        lower = int(np.floor(position))
+        kth.update((lower, min(lower + 1, window_size - 1)))
+    return sorted(kth)
+
+
+def percentile_from_partition(part, q):
+    """
+    Percentil `q` a partir das janelas particionadas, idêntico a
+    np.percentile(..., method='linear').
+    """
+    n = part.shape[-1]
+    position = (n - 1) * (q / 100)
+    lower = int(np.floor(position))
+    a = part[..., lower]
+    b = part[..., min(lower + 1, n - 1)]
+    t = position - lower
+
+    # Mesma fórmula de numpy (_lerp): evita erro de arredondamento perto de b
+    diff = b - a
+    if t >= 0.5:
+        return b - diff * (1 - t)
+    return a + diff * t
+
+
+def median_from_partition(part):
+    """
+    Mediana a partir das janelas particionadas, idêntica a np.median.
+    """
+    n = part.shape[-1]
+    if n % 2:
+        return part[..., n // 2].copy()
+    return (part[..., n // 2 - 1] + part[..., n // 2]) / 2
+
+
+def _pearson(x, y):
+    """
+    Correlação de Pearson linha a linha, equivalente a np.corrcoef(x, y)[0, 1].
+    """
+    xm = x - x.mean(axis=1, keepdims=True)
+    ym = y - y.mean(axis=1, keepdims=True)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.sum(xm * ym, axis=1) / np.sqrt(np.sum(xm**2, axis=1) * np.sum(ym**2, axis=1))
+
+    # np.corrcoef limita o resultado a [-1, 1]
+    return np.clip(r, -1, 1)
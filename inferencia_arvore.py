@@ -0,0 +1,349 @@
+"""
+Inferência com Árvore de Decisão - Classificação de Vias
+========================================================
+
+Motores de inferência para a árvore de decisão treinada, voltados à
+classificação de uma janela por vez em tempo real.
+
+LazyTreePredictor percorre a árvore a partir da janela bruta dos sensores e
+calcula cada feature apenas quando um nó do caminho precisa dela, de modo
+que divisões baratas no domínio do tempo evitam o trabalho espectral.
+
+CompiledTreePredictor classifica vetores de features já calculados sem a
+validação de entrada do scikit-learn: a árvore é exportada para arrays
+compactos e, para uma amostra, para uma função Python gerada (if/else em
+linha reta); lotes são percorridos nível a nível com operações vetorizadas.
+
+PackedForestPredictor concatena todas as árvores de uma Random Forest em um
+único conjunto de arrays contíguos e avalia as árvores de um lote juntas,
+nível a nível.
+"""
+
+import numpy as np
+
+from extracao_features import WindowFeatures
+
+
+class LazyTreePredictor:
+    """
+    Predição de uma janela com avaliação preguiçosa das features.
+
+    A árvore é percorrida da raiz até uma folha; em cada nó, a feature
+    testada é calculada (e padronizada) na primeira vez que é necessária.
+    Intermediários compartilhados, como a FFT de um sensor, são memorizados
+    por WindowFeatures durante a predição.
+    """
+
+    def __init__(self, model, scaler=None):
+        """
+        Parâmetros:
+        -----------
+        model : DecisionTreeClassifier
+            Árvore treinada sobre as features S1..Sn (padronizadas)
+        scaler : StandardScaler, opcional
+            Scaler usado no treinamento; se None, as features não são padronizadas
+        """
+        tree = model.tree_
+        self.classes_ = model.classes_
+        self.children_left = tree.children_left
+        self.children_right = tree.children_right
+        self.feature = tree.feature
+        self.threshold = tree.threshold
+        self.leaf_class = tree.value[:, 0, :].argmax(axis=1)
+
+        n_features = model.n_features_in_
+        self.mean = scaler.mean_ if scaler is not None else np.zeros(n_features)
+        self.scale = scaler.scale_ if scaler is not None else np.ones(n_features)
+
+        self.n_predictions = 0
+        self.n_features_computed = 0
+
+    def predict_window(self, window):
+        """
+        Classifica uma janela bruta.
+
+        Parâmetros:
+        -----------
+        window : np.array
+            Janela (window_size, 3) com as colunas na ordem de SENSORS
+
+        Retorna:
+        --------
+        classe predita (mesmo rótulo de model.predict)
+        """
+        calc = WindowFeatures(window[np.newaxis])
+        values = {}
+
+        node = 0
+        while self.children_left[node] != -1:
+            f = self.feature[node]
+            if f not in values:
+                # Mesma conta de StandardScaler.transform; a árvore compara em float32
+                values[f] = np.float32((calc.feature(f)[0] - self.mean[f]) / self.scale[f])
+
+            if values[f] <= self.threshold[node]:
+                node = self.children_left[node]
+            else:
+                node = self.children_right[node]
+
+        self.n_predictions += 1
+        self.n_features_computed += len(values)
+        return self.classes_[self.leaf_class[node]]
+
+    @property
+    def avg_features_computed(self):
+        """
+        Número médio de features calculadas por predição.
+        """
+        return self.n_features_computed / max(self.n_predictions, 1)
+
+
+# Profundidade máxima para gerar código (limite de indentação do Python: 100)
+MAX_CODEGEN_DEPTH = 90
+
+
+class CompiledTreePredictor:
+    """
+    Predição rápida com uma árvore de decisão exportada para arrays.
+
+    A comparação é a mesma do scikit-learn: a feature é convertida para
+    float32 e comparada (<=) com o limiar em float64, e valores ausentes
+    (NaN) seguem missing_go_to_left de cada nó, de modo que as predições são
+    idênticas às de model.predict.
+    """
+
+    def __init__(self, model, codegen=True):
+        """
+        Parâmetros:
+        -----------
+        model : DecisionTreeClassifier
+            Árvore treinada
+        codegen : bool
+            Se True (e a profundidade permitir), predict_one usa uma função
+            gerada com os limiares como constantes; se False, percorre os arrays
+        """
+        tree = model.tree_
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        self.max_depth = int(tree.max_depth)
+
+        # Arrays compactos; folhas apontam para si mesmas (percurso em lote).
+        # children[2 * nó + (x <= limiar)] é o próximo nó (direita, esquerda).
+        is_leaf = tree.children_left == -1
+        nodes = np.arange(tree.node_count)
+        self.children = np.stack([np.where(is_leaf, nodes, tree.children_right),
+                                  np.where(is_leaf, nodes, tree.children_left)], axis=1).ravel().astype(np.int32)
+        self.feature = np.where(is_leaf, 0, tree.feature).astype(np.min_scalar_type(self.n_features_in_ - 1))
+        self.threshold = np.where(is_leaf, np.inf, tree.threshold)
+        self.leaf_class = tree.value[:, 0, :].argmax(axis=1).astype(np.min_scalar_type(len(self.classes_) - 1))
+        self.is_leaf = is_leaf
+        # Lado dos valores ausentes (scikit-learn >= 1.3; antes, NaN ia à direita)
+        self.missing_left = np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)), dtype=bool)
+
+        self._predict_one = None
+        if codegen and self.max_depth <= MAX_CODEGEN_DEPTH:
+            self._predict_one = self._compile(tree)
+
+    def _compile(self, tree):
+        """
+        Gera a função de predição de uma amostra (if/else aninhados).
+        """
+        lines = ['def predict_one(x):']
+
+        def emit(node, depth):
+            indent = '    ' * depth
+            if tree.children_left[node] == -1:
+                lines.append(f'{indent}return classes[{self.leaf_class[node]}]')
+                return
+            # "not x > t" também é verdadeiro para NaN
+            test = 'not x[{}] > {!r}' if self.missing_left[node] else 'x[{}] <= {!r}'
+            lines.append(f'{indent}if ' + test.format(tree.feature[node], float(tree.threshold[node])) + ':')
+            emit(tree.children_left[node], depth + 1)
+            lines.append(f'{indent}else:')
+            emit(tree.children_right[node], depth + 1)
+
+        emit(0, 1)
+        namespace = {'classes': tuple(self.classes_)}
+        exec(compile('\n'.join(lines), '<arvore_compilada>', 'exec'), namespace)
+        self.source = '\n'.join(lines)
+        return namespace['predict_one']
+
+    def predict_one(self, x):
+        """
+        Classifica um vetor de features 1-D (n_features,), sem validação.
+
+        Retorna:
+        --------
+        classe predita (mesmo rótulo de model.predict)
+        """
+        # Valores em float32 (como na árvore), como floats do Python
+        values = np.asarray(x, dtype=np.float32).tolist()
+        if self._predict_one is not None:
+            return self._predict_one(values)
+
+        node = 0
+        while not self.is_leaf[node]:
+            value = values[self.feature[node]]
+            go_left = value <= self.threshold[node] or (value != value and self.missing_left[node])
+            node = self.children[2 * node + go_left]
+        return self.classes_[self.leaf_class[node]]
+
+    def predict(self, X):
+        """
+        Classifica um lote (n_amostras, n_features), percorrendo todas as
+        linhas nível a nível.
+
+        Retorna:
+        --------
+        np.array
+            Classes preditas
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        values = X.ravel()
+        row_start = np.arange(0, n_samples * n_features, n_features, dtype=np.intp)
+        has_missing = np.isnan(values).any()
+        node = np.zeros(n_samples, dtype=np.intp)
+        for _ in range(self.max_depth):
+            value = values.take(row_start + self.feature.take(node))
+            go_left = value <= self.threshold.take(node)
+            if has_missing:
+                go_left |= np.isnan(value) & self.missing_left.take(node)
+            node = self.children.take(2 * node + go_left)
+        return self.classes_[self.leaf_class.take(node)]
+
+
+class PackedForestPredictor:
+    """
+    Random Forest exportada para arrays contíguos.
+
+    Só os nós internos ficam nos arrays de nós (renumerados em sequência,
+    árvore após árvore); um ponteiro >= 0 é um nó interno e um ponteiro
+    negativo p é a folha ~p, cujas probabilidades estão em leaf_proba.
+
+    Os limiares são float32: como a feature também é comparada em float32,
+    usar o maior float32 <= limiar dá exatamente as mesmas decisões. As
+    probabilidades das folhas ficam em float64 e são somadas árvore a árvore,
+    como em RandomForestClassifier.predict_proba, para que predict_proba e
+    predict sejam idênticos.
+    """
+
+    def __init__(self, model):
+        """
+        Parâmetros:
+        -----------
+        model : RandomForestClassifier
+            Floresta treinada
+        """
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        self.n_trees = len(model.estimators_)
+
+        roots, left, right, feature, threshold, missing_left, leaf_proba = [], [], [], [], [], [], []
+        n_internal = n_leaves = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            # Ponteiro de cada nó da árvore no formato compactado
+            pointer = np.empty(tree.node_count, dtype=np.int64)
+            pointer[~is_leaf] = n_internal + np.arange((~is_leaf).sum())
+            pointer[is_leaf] = ~(n_leaves + np.arange(is_leaf.sum()))
+            n_internal += (~is_leaf).sum()
+            n_leaves += is_leaf.sum()
+
+            roots.append(pointer[0])
+            left.append(pointer[tree.children_left[~is_leaf]])
+            right.append(pointer[tree.children_right[~is_leaf]])
+            feature.append(tree.feature[~is_leaf])
+            threshold.append(tree.threshold[~is_leaf])
+            missing_left.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)),
+                                           dtype=bool)[~is_leaf])
+
+            # Mesma normalização de DecisionTreeClassifier.predict_proba
+            value = tree.value[is_leaf, 0, :]
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_proba.append(value / normalizer)
+
+        # Índices no menor tipo inteiro que comporta os ponteiros
+        index_dtype = np.int16 if max(n_internal, n_leaves) <= np.iinfo(np.int16).max else np.int32
+        self.roots = np.asarray(roots, dtype=index_dtype)
+        self.children = np.stack([np.concatenate(right), np.concatenate(left)], axis=1).ravel().astype(index_dtype)
+        self.feature = np.concatenate(feature).astype(np.min_scalar_type(self.n_features_in_ - 1))
+        threshold = np.concatenate(threshold)
+        threshold32 = threshold.astype(np.float32)
+        rounded_up = threshold32 > threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+        self.threshold = threshold32
+        self.missing_left = np.concatenate(missing_left)
+        self.leaf_proba = np.concatenate(leaf_proba)
+
+    @property
+    def nbytes(self):
+        """
+        Memória ocupada pelos arrays da floresta, em bytes.
+        """
+        return sum(a.nbytes for a in (self.roots, self.children, self.feature, self.threshold,
+                                      self.missing_left, self.leaf_proba))
+
+    def apply(self, X):
+        """
+        Folha alcançada em cada árvore por cada amostra.
+
+        Todas as (amostra, árvore) descem um nível por iteração; as que
+        chegam a uma folha saem do conjunto ativo.
+
+        Retorna:
+        --------
+        np.array
+            Índices das folhas em leaf_proba (n_amostras, n_árvores)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        values = X.ravel()
+        has_missing = np.isnan(values).any()
+
+        pointer = np.tile(self.roots.astype(np.intp), n_samples)
+        row_start = np.repeat(np.arange(0, n_samples * n_features, n_features, dtype=np.intp), self.n_trees)
+        active = np.flatnonzero(pointer >= 0)
+        node = pointer[active]
+        start = row_start[active]
+        while len(active):
+            value = values.take(start + self.feature.take(node))
+            go_left = value <= self.threshold.take(node)
+            if has_missing:
+                go_left |= np.isnan(value) & self.missing_left.take(node)
+            node = self.children.take(2 * node + go_left).astype(np.intp)
+
+            reached_leaf = node < 0
+            n_reached = np.count_nonzero(reached_leaf)
+            if n_reached:
+                pointer[active[reached_leaf]] = node[reached_leaf]
+                if n_reached == len(node):
+                    break
+                internal = np.flatnonzero(~reached_leaf)
+                active, node, start = active.take(internal), node.take(internal), start.take(internal)
+
+        return (~pointer).reshape(n_samples, self.n_trees)
+
+    def predict_proba(self, X):
+        """
+        Probabilidades das classes: média das probabilidades das folhas.
+
+        Retorna:
+        --------
+        np.array
+            (n_amostras, n_classes)
+        """
+        leaves = self.apply(X)
+        proba = np.zeros((len(leaves), len(self.classes_)))
+        for t in range(self.n_trees):
+            proba += self.leaf_proba.take(leaves[:, t], axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """
+        Classes preditas (mesmo rótulo de model.predict).
+        """
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
@@ -0,0 +1,127 @@
+"""
+Matriz de Features Compacta - Classificação de Vias
+===================================================
+
+Representação compacta das features janeladas, alternativa ao DataFrame
+S1..Sn + Classe (62 colunas float64 e uma coluna object repetindo o rótulo
+em cada linha):
+- matriz contígua pré-alocada (float32 por padrão)
+- códigos int8 das classes + vetor com os rótulos distintos
+- esquema compartilhado com os nomes das features e o mapeamento S1..Sn
+"""
+
+import numpy as np
+import pandas as pd
+
+from extracao_features import FEATURE_NAMES
+
+
+class FeatureSchema:
+    """
+    Nomes das features e mapeamento para as colunas S1..Sn.
+    """
+
+    def __init__(self, feature_names=FEATURE_NAMES):
+        """
+        Parâmetros:
+        -----------
+        feature_names : list of str
+            Nomes originais das features, na ordem das colunas
+        """
+        self.feature_names = list(feature_names)
+        self.columns = [f'S{i+1}' for i in range(len(self.feature_names))]
+        self.feature_mapping = dict(zip(self.columns, self.feature_names))
+
+        # Colunas inteiras no DataFrame de DataProcessor (np.argmax)
+        self.integer_columns = [col for col, name in self.feature_mapping.items()
+                                if name.endswith('_dominant_freq')]
+
+    def __len__(self):
+        return len(self.feature_names)
+
+
+# Esquema padrão, compartilhado por todas as matrizes de FEATURE_NAMES
+FEATURE_SCHEMA = FeatureSchema()
+
+
+class FeatureMatrix:
+    """
+    Features janeladas em uma matriz contígua + códigos de classe.
+    """
+
+    def __init__(self, features, codes, classes, schema=FEATURE_SCHEMA):
+        """
+        Parâmetros:
+        -----------
+        features : np.array
+            Matriz (n_janelas, n_features)
+        codes : np.array
+            Código int8 da classe de cada janela (índice em `classes`)
+        classes : array-like
+            Rótulos distintos das classes
+        schema : FeatureSchema
+            Esquema das colunas de `features`
+        """
+        self.features = features
+        self.codes = codes
+        self.classes = np.asarray(classes, dtype=object)
+        self.schema = schema
+
+    @classmethod
+    def allocate(cls, n_rows, classes, schema=FEATURE_SCHEMA, dtype=np.float32):
+        """
+        Cria uma matriz vazia para ser preenchida por faixas de linhas.
+
+        Parâmetros:
+        -----------
+        n_rows : int
+            Número de janelas
+        classes : list of str
+            Rótulos distintos das classes (no máximo 127)
+        schema : FeatureSchema
+            Esquema das colunas
+        dtype : np.dtype
+            Tipo da matriz de features (float32 por padrão)
+        """
+        if len(classes) > np.iinfo(np.int8).max:
+            raise ValueError(f"Classes demais para códigos int8: {len(classes)}")
+
+        features = np.empty((n_rows, len(schema)), dtype=dtype)
+        codes = np.empty(n_rows, dtype=np.int8)
+        return cls(features, codes, classes, schema)
+
+    @classmethod
+    def from_frame(cls, df, schema=FEATURE_SCHEMA, dtype=np.float32):
+        """
+        Converte um DataFrame organizado (S1..Sn + Classe).
+        """
+        classes, codes = np.unique(df['Classe'].to_numpy(dtype=str), return_inverse=True)
+        features = np.ascontiguousarray(df[schema.columns].to_numpy(dtype=dtype))
+        return cls(features, codes.astype(np.int8), classes, schema)
+
+    def __len__(self):
+        return len(self.features)
+
+    @property
+    def labels(self):
+        """
+        Rótulo da classe de cada janela.
+        """
+        return self.classes[self.codes]
+
+    @property
+    def nbytes(self):
+        """
+        Memória ocupada pelos dados (features + códigos de classe).
+        """
+        return self.features.nbytes + self.codes.nbytes
+
+    def to_frame(self):
+        """
+        DataFrame no formato de DataProcessor.organize_data (S1..Sn + Classe).
+        """
+        df = pd.DataFrame(self.features, columns=self.schema.columns)
+        if self.schema.integer_columns:
+            df = df.astype({col: np.int64 for col in self.schema.integer_columns})
+        df['Classe'] = self.labels
+        return df
@@ -0,0 +1,274 @@
+"""
+Medição do Treinamento Incremental - Classificação de Vias
+=========================================================
+
+Simula a chegada de novos percursos dividindo cada arquivo de dados em
+trechos contíguos (um "percurso" por trecho) e compara, a cada percurso
+novo, a atualização incremental (treinamento_incremental.IncrementalTrainer
++ FeatureStore.append) com a reconstrução completa (organize_data sobre
+todos os percursos + treinamento de todos os modelos).
+
+O último percurso de cada classe é separado para teste e nunca é usado no
+treinamento.
+
+Também mede o treinamento fora da memória (OutOfCoreTrainer) sobre matrizes
+sintéticas em disco de tamanhos crescentes (janelas reais reamostradas com
+ruído), com o pico de memória de cada etapa, comparado com prepare_data
+(DataFrame em memória).
+"""
+
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from armazem_features import FeatureStore
+from classificacao_vias import DataProcessor, ModelTrainer
+from matriz_features import FEATURE_SCHEMA
+from treinamento_incremental import (IncrementalTrainer, OutOfCoreTrainer, incremental_models,
+                                     update_strategy)
+
+# Arquivos de dados (mesma lista de classificacao_vias.main)
+ARQUIVOS = [
+    ('./dados/rua_asfalto.csv', 'Rua/Asfalto'),
+    ('./dados/cimento_utinga.csv', 'Cimento Pavimentado'),
+    ('./dados/terra_batida.csv', 'Terra Batida')
+]
+
+
+def dividir_em_percursos(caminho, classe, n_percursos, destino):
+    """
+    Divide um CSV em n_percursos arquivos com linhas contíguas.
+
+    Retorna:
+    --------
+    list of tuples
+        [(caminho_percurso, classe), ...]
+    """
+    with open(caminho) as f:
+        cabecalho, *linhas = f.readlines()
+
+    percursos = []
+    for i, bloco in enumerate(np.array_split(np.arange(len(linhas)), n_percursos)):
+        saida = Path(destino) / f'{Path(caminho).stem}_percurso{i + 1}.csv'
+        with open(saida, 'w') as f:
+            f.write(cabecalho)
+            f.writelines(linhas[bloco[0]:bloco[-1] + 1])
+        percursos.append((str(saida), classe))
+    return percursos
+
+
+def separar(df):
+    """
+    Features e rótulos de um DataFrame organizado, sem as janelas com
+    features indefinidas (ex.: assimetria de um trecho constante no início
+    de um percurso).
+    """
+    X = df.drop('Classe', axis=1).to_numpy(dtype=np.float64)
+    validas = np.isfinite(X).all(axis=1)
+    return X[validas], df['Classe'].to_numpy(dtype=str)[validas]
+
+
+def acuracias(trainer, X_test, y_test):
+    return {name: accuracy_score(y_test, trainer.predict(name, X_test)) for name in trainer.models}
+
+
+def medir_incremental(n_percursos=4, retrain_every=3):
+    """
+    Latência de atualização por percurso novo: incremental vs reconstrução.
+    """
+    print(f"\n🔁 Treinamento incremental ({n_percursos} percursos por classe, "
+          f"retreino completo a cada {retrain_every} percursos)")
+    print("="*60)
+
+    arquivos = [(caminho, classe) for caminho, classe in ARQUIVOS if Path(caminho).exists()]
+    if not arquivos:
+        raise FileNotFoundError("Nenhum arquivo de dados encontrado em ./dados")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        por_classe = [dividir_em_percursos(caminho, classe, n_percursos, tmp) for caminho, classe in arquivos]
+        iniciais = [percursos[0] for percursos in por_classe]
+        teste = [percursos[-1] for percursos in por_classe]
+        novos = [p for grupo in zip(*[percursos[1:-1] for percursos in por_classe]) for p in grupo]
+
+        processor = DataProcessor(window_size=100, overlap=50, cache_dir=f'{tmp}/dados')
+        store = FeatureStore(f'{tmp}/features')
+
+        X_test, y_test = separar(processor.organize_data(teste))
+        X0, y0 = separar(store.organize(processor, iniciais))
+        incremental = IncrementalTrainer(retrain_every=retrain_every).fit(X0, y0)
+
+        atuais = list(iniciais)
+        rodadas = []
+        for percurso in novos:
+            # Atualização incremental: só o percurso novo é extraído
+            inicio = time.perf_counter()
+            df_all, df_new = store.append(processor, atuais, [percurso])
+            extracao_inc = time.perf_counter() - inicio
+            X_new, y_new = separar(df_new)
+            X_all, y_all = separar(df_all)
+            tempos = incremental.update(X_new, y_new, X_all, y_all)
+            tempo_inc = time.perf_counter() - inicio
+            atuais.append(percurso)
+
+            # Reconstrução completa
+            inicio = time.perf_counter()
+            X_full, y_full = separar(processor.organize_data(atuais))
+            extracao_full = time.perf_counter() - inicio
+            completo = IncrementalTrainer(models=incremental_models()).fit(X_full, y_full)
+            tempo_full = time.perf_counter() - inicio
+
+            assert np.array_equal(X_all, X_full), "Armazém incremental difere da reconstrução"
+
+            rodadas.append({
+                'percurso': Path(percurso[0]).name,
+                'janelas_novas': len(X_new),
+                'janelas_total': len(X_all),
+                'incremental_s': tempo_inc,
+                'incremental_extracao_s': extracao_inc,
+                'incremental_por_modelo_s': tempos,
+                'reconstrucao_s': tempo_full,
+                'reconstrucao_extracao_s': extracao_full,
+                'acuracia_incremental': acuracias(incremental, X_test, y_test),
+                'acuracia_reconstrucao': acuracias(completo, X_test, y_test)
+            })
+            print(f"\n⏱️  {Path(percurso[0]).name}: incremental {tempo_inc:.2f} s vs "
+                  f"reconstrução {tempo_full:.2f} s ({tempo_full / tempo_inc:.1f}x)")
+
+    final = rodadas[-1]
+    print(f"\n{'Modelo':<22} {'Estratégia':<12} {'Atualização (s)':>16} {'Acur. incr.':>12} {'Acur. recon.':>13}")
+    for name, model in incremental.models.items():
+        media = np.mean([r['incremental_por_modelo_s'][name] for r in rodadas])
+        print(f"{name:<22} {update_strategy(model):<12} {media:>16.3f} "
+              f"{final['acuracia_incremental'][name]:>12.4f} {final['acuracia_reconstrucao'][name]:>13.4f}")
+
+    media_inc = np.mean([r['incremental_s'] for r in rodadas])
+    media_full = np.mean([r['reconstrucao_s'] for r in rodadas])
+    print(f"\n   Latência média por percurso: incremental {media_inc:.2f} s vs "
+          f"reconstrução {media_full:.2f} s ({media_full / media_inc:.1f}x)")
+    print(f"   Armazém incremental idêntico à reconstrução: ✅")
+
+    return {
+        'n_percursos_por_classe': n_percursos,
+        'retrain_every': retrain_every,
+        'latencia_media_incremental_s': media_inc,
+        'latencia_media_reconstrucao_s': media_full,
+        'rodadas': rodadas
+    }
+
+
+def gerar_matriz_sintetica(features, codes, n_linhas, destino, ruido=0.01, bloco=100_000, seed=42):
+    """
+    Grava em disco (.npy) uma matriz com n_linhas janelas reamostradas das
+    janelas reais, com ruído gaussiano proporcional ao desvio de cada feature.
+
+    Retorna:
+    --------
+    tuple
+        (features memmap, códigos memmap)
+    """
+    rng = np.random.RandomState(seed)
+    desvio = features.std(axis=0) * ruido
+    X = np.lib.format.open_memmap(f'{destino}/features.npy', mode='w+', dtype=np.float64,
+                                  shape=(n_linhas, features.shape[1]))
+    y = np.lib.format.open_memmap(f'{destino}/classes.npy', mode='w+', dtype=np.int8, shape=(n_linhas,))
+    for inicio in range(0, n_linhas, bloco):
+        fim = min(inicio + bloco, n_linhas)
+        idx = rng.randint(0, len(features), fim - inicio)
+        X[inicio:fim] = features[idx] + rng.randn(fim - inicio, features.shape[1]) * desvio
+        y[inicio:fim] = codes[idx]
+    X.flush()
+    y.flush()
+    del X, y
+    return (np.load(f'{destino}/features.npy', mmap_mode='r'),
+            np.load(f'{destino}/classes.npy', mmap_mode='r'))
+
+
+def pico_prepare_data(features, codes, classes):
+    """
+    Pico de memória (tracemalloc) de ModelTrainer.prepare_data com a matriz
+    inteira em um DataFrame.
+    """
+    tracemalloc.start()
+    df = pd.DataFrame(np.asarray(features), columns=FEATURE_SCHEMA.columns)
+    df['Classe'] = classes[np.asarray(codes)]
+    ModelTrainer().prepare_data(df)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico
+
+
+def medir_fora_da_memoria(tamanhos=(200_000, 2_000_000), batch_size=65536, epochs=3):
+    """
+    Treinamento fora da memória em matrizes em disco de tamanhos crescentes:
+    tempo e pico de memória por etapa.
+    """
+    print(f"\n💽 Treinamento fora da memória (lotes de {batch_size} janelas, {epochs} épocas)")
+    print("="*60)
+
+    store = FeatureStore()
+    key = store.find(window_size=100, overlap=50)
+    entrada = store.get_arrays(key) if key else None
+    if entrada is None:
+        raise FileNotFoundError("Armazém de features vazio - execute classificacao_vias.py")
+    features, codes, classes, _ = entrada
+    features = np.asarray(features)
+    codes = np.asarray(codes)
+
+    resultados = {}
+    for n_linhas in tamanhos:
+        with tempfile.TemporaryDirectory() as tmp:
+            X, y = gerar_matriz_sintetica(features, codes, n_linhas, tmp)
+            tamanho_mb = X.nbytes / 1024**2
+
+            trainer = OutOfCoreTrainer(batch_size=batch_size, epochs=epochs)
+            inicio = time.perf_counter()
+            train_idx, test_idx = trainer.split(y)
+            trainer.fit(X, y, train_idx)
+            metricas = trainer.evaluate(X, y, test_idx)
+            tempo = time.perf_counter() - inicio
+
+            pico_df = pico_prepare_data(X, y, classes) if n_linhas == min(tamanhos) else None
+
+        pico_mb = {etapa: pico / 1024**2 for etapa, pico in trainer.peak_memory.items()}
+        print(f"\n📦 {n_linhas} janelas ({tamanho_mb:.0f} MB em disco): {tempo:.2f} s")
+        print("   Pico de memória por etapa: "
+              + ", ".join(f"{etapa} {mb:.1f} MB" for etapa, mb in pico_mb.items()))
+        if pico_df is not None:
+            print(f"   prepare_data (DataFrame em memória): {pico_df / 1024**2:.1f} MB")
+        for name, m in metricas.items():
+            print(f"   {name:<20} acurácia {m['accuracy']:.4f}  F1 {m['f1_score']:.4f}")
+
+        resultados[str(n_linhas)] = {
+            'tamanho_disco_mb': tamanho_mb,
+            'tempo_s': tempo,
+            'pico_memoria_mb': pico_mb,
+            'pico_prepare_data_mb': pico_df / 1024**2 if pico_df is not None else None,
+            'metricas': metricas
+        }
+    return resultados
+
+
+def main():
+    """
+    Função principal para medição do treinamento incremental.
+    """
+    print("🚴 MEDIÇÃO - TREINAMENTO INCREMENTAL POR PERCURSO")
+    print("="*70)
+
+    resultados = medir_incremental()
+    resultados['fora_da_memoria'] = medir_fora_da_memoria()
+
+    with open('./resultados/modelos/tempos_incremental.json', 'w') as f:
+        json.dump(resultados, f, indent=2)
+
+    print(f"\n💾 Resultados salvos em: ./resultados/modelos/tempos_incremental.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,76 +4,51 @@ Medição do Espaço em Memória - Classificador de Tipos de Vias
 
 Baseado no código sample_dt_classifier_mem.py, este script mede
 o uso de memória do modelo de árvore de decisão desenvolvido
-para classificação de tipos de vias.
+para classificação de tipos de vias. Também compara a memória e o tempo de
+construção da matriz de features compacta (matriz_features.FeatureMatrix)
+com o DataFrame montado a partir de uma lista de dicionários.
 """
 
+import importlib
+import os
+import tempfile
 import numpy as np
 import pandas as pd
 import sys
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import joblib
+
+from armazem_features import FeatureStore
+from cache_modelos import ModelCache
+from classificacao_vias import DataProcessor, ModelTrainer, carregar_e_treinar_modelo
+from pacote_modelo import ModelBundle, salvar_pacotes
+from extracao_features import FEATURE_NAMES, SENSORS, extract_features_signal
+from matriz_features import FEATURE_SCHEMA, FeatureMatrix
+
+# Arquivos de dados (mesma lista de classificacao_vias.main)
+ARQUIVOS = [
+    ('./dados/rua_asfalto.csv', 'Rua/Asfalto'),
+    ('./dados/cimento_utinga.csv', 'Cimento Pavimentado'),
+    ('./dados/terra_batida.csv', 'Terra Batida')
+]
 
 # Importa pympler se disponível
 try:
     from pympler import asizeof
     PYMPLER_DISPONIVEL = True
-    print("✅ Pympler disponível - medições mais precisas")
 except ImportError:
     PYMPLER_DISPONIVEL = False
-    print("⚠️  Pympler não disponível - usando sys.getsizeof")
 
-def carregar_e_treinar_modelo():
-    """
-    Carrega os dados e treina o modelo.
-    """
-    print("\n📊 CARREGANDO DADOS E TREINANDO MODELO")
-    print("="*60)
-    
-    # Carrega dados organizados
-    print("🔄 Carregando dados...")
-    dados_path = "./resultados/dados_processados/dados_organizados.csv"
-    df = pd.read_csv(dados_path)
-    
-    # Prepara dados
-    print("⚙️  Preparando dados...")
-    X = df.drop('Classe', axis=1)
-    y = df['Classe']
-    
-    # Codifica labels
-    label_encoder = LabelEncoder()
-    y_encoded = label_encoder.fit_transform(y)
-    
-    # Divisão treino/teste
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y_encoded, test_size=0.3, random_state=42, stratify=y_encoded
-    )
-    
-    # Normalização
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Treina modelo (mesmos parâmetros do código principal)
-    print("🌳 Treinando modelo...")
-    model = DecisionTreeClassifier(
-        random_state=42,
-        max_depth=10,
-        min_samples_split=5,
-        min_samples_leaf=3,
-        class_weight='balanced'
-    )
-    
-    model.fit(X_train_scaled, y_train)
-    
-    print(f"✅ Modelo treinado:")
-    print(f"   • Features: {X_train_scaled.shape[1]}")
-    print(f"   • Amostras treino: {len(X_train_scaled)}")
-    print(f"   • Classes: {len(label_encoder.classes_)}")
-    print(f"   • Nós da árvore: {model.tree_.node_count}")
-    print(f"   • Profundidade: {model.tree_.max_depth}")
-    
-    return model, scaler, label_encoder, X_test_scaled
+# Aviso só no processo principal (não nos processos de medição de carga)
+if __name__ == "__main__":
+    if PYMPLER_DISPONIVEL:
+        print("✅ Pympler disponível - medições mais precisas")
+    else:
+        print("⚠️  Pympler não disponível - usando sys.getsizeof")
 
 def medir_tamanho_modelo(model):
     """
@@ -247,6 +222,189 @@ def comparar_com_codigo_original():
     print(f"   • Problema do mundo real vs toy dataset")
     print(f"   • Balanceamento de classes e otimizações")
 
+def comparar_representacoes_features(window_size=100, overlap=50):
+    """
+    Compara a representação das features janeladas:
+    - lista de dicionários (um por janela) + pd.DataFrame, como no laço de
+      create_sliding_windows
+    - FeatureMatrix (float32 contíguo + códigos int8 + esquema compartilhado)
+    
+    As features são extraídas uma única vez; mede-se apenas a construção da
+    estrutura e a memória ocupada por janela. Também mede organize_data vs
+    organize_matrix de ponta a ponta.
+    """
+    print(f"\n🧮 REPRESENTAÇÃO DAS FEATURES: DataFrame vs FeatureMatrix")
+    print("="*60)
+    
+    arquivos = [(caminho, classe) for caminho, classe in ARQUIVOS if Path(caminho).exists()]
+    processor = DataProcessor(window_size=window_size, overlap=overlap)
+    step_size = window_size - overlap
+    
+    linhas = []
+    for caminho, classe in arquivos:
+        values = processor.load_data(caminho, classe)[SENSORS].to_numpy(dtype=np.float64)
+        linhas.append((extract_features_signal(values, window_size, step_size), classe))
+    n_janelas = sum(len(f) for f, _ in linhas)
+    
+    # Lista de dicionários -> DataFrame (S1..Sn + Classe)
+    start = time.perf_counter()
+    windows_features = []
+    for features, classe in linhas:
+        for row in features:
+            d = dict(zip(FEATURE_NAMES, row.tolist()))
+            d['Classe'] = classe
+            windows_features.append(d)
+    df = pd.DataFrame(windows_features).rename(columns=dict(zip(FEATURE_NAMES, FEATURE_SCHEMA.columns)))
+    tempo_df = time.perf_counter() - start
+    memoria_df = df.memory_usage(deep=True).sum()
+    
+    # FeatureMatrix pré-alocada
+    start = time.perf_counter()
+    classes = sorted({classe for _, classe in linhas})
+    matrix = FeatureMatrix.allocate(n_janelas, classes)
+    row = 0
+    for features, classe in linhas:
+        matrix.features[row:row + len(features)] = features
+        matrix.codes[row:row + len(features)] = classes.index(classe)
+        row += len(features)
+    tempo_matriz = time.perf_counter() - start
+    memoria_matriz = matrix.nbytes
+    
+    # De ponta a ponta (extração incluída)
+    start = time.perf_counter()
+    processor.organize_data(arquivos)
+    tempo_organize_data = time.perf_counter() - start
+    start = time.perf_counter()
+    processor.organize_matrix(arquivos)
+    tempo_organize_matrix = time.perf_counter() - start
+    
+    print(f"\n   Janelas: {n_janelas}")
+    print(f"   DataFrame (lista de dicts): {memoria_df/n_janelas:.0f} bytes/janela, "
+          f"construção {tempo_df*1000:.1f} ms")
+    print(f"   FeatureMatrix (float32):    {memoria_matriz/n_janelas:.0f} bytes/janela, "
+          f"construção {tempo_matriz*1000:.2f} ms")
+    print(f"   Redução de memória: {memoria_df/memoria_matriz:.1f}x | "
+          f"construção {tempo_df/tempo_matriz:.0f}x mais rápida")
+    print(f"   organize_data: {tempo_organize_data:.3f} s | organize_matrix: {tempo_organize_matrix:.3f} s")
+    
+    return {
+        'janelas': n_janelas,
+        'dataframe_bytes_por_janela': float(memoria_df / n_janelas),
+        'matriz_bytes_por_janela': float(memoria_matriz / n_janelas),
+        'dataframe_construcao_ms': tempo_df * 1000,
+        'matriz_construcao_ms': tempo_matriz * 1000,
+        'organize_data_s': tempo_organize_data,
+        'organize_matrix_s': tempo_organize_matrix
+    }
+
+def memoria_residente():
+    """
+    Memória residente do processo e a parte compartilhada (páginas de
+    arquivos mapeados), em bytes. Lida de /proc/self/statm (Linux); em outros
+    sistemas usa o pico de ru_maxrss.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            _, residente, compartilhada = map(int, f.read().split()[:3])
+        pagina = os.sysconf('SC_PAGE_SIZE')
+        return residente * pagina, compartilhada * pagina
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, 0
+
+
+def _medir_carga(caminho, modo, X, repeticoes=5):
+    """
+    Executado em um processo novo: memória residente após carregar o modelo e
+    após a primeira predição, e tempo de carga (melhor de `repeticoes`).
+    """
+    # Módulo da classe do modelo importado antes da medição de referência
+    if modo == 'joblib':
+        carregar = lambda: joblib.load(caminho)
+        prever = lambda obj: obj['model'].predict(obj['scaler'].transform(X))
+    else:
+        header, _ = ModelBundle.read_header(caminho)
+        importlib.import_module(header['classe_modelo'].rsplit('.', 1)[0])
+        carregar = lambda: ModelBundle.load(caminho, mmap_arrays=(modo == 'pacote_mmap'))
+        prever = lambda bundle: bundle.predict(X)
+
+    rss_inicial, compartilhada_inicial = memoria_residente()
+    inicio = time.perf_counter()
+    obj = carregar()
+    primeira_carga = time.perf_counter() - inicio
+    rss_carga, compartilhada_carga = memoria_residente()
+    prever(obj)
+    rss_predicao, compartilhada_predicao = memoria_residente()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        carregar()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        'primeira_carga_ms': primeira_carga * 1000,
+        'carga_ms': min(tempos) * 1000,
+        'rss_carga_mb': (rss_carga - rss_inicial) / 1024**2,
+        'rss_predicao_mb': (rss_predicao - rss_inicial) / 1024**2,
+        'privada_predicao_mb': ((rss_predicao - compartilhada_predicao)
+                                - (rss_inicial - compartilhada_inicial)) / 1024**2
+    }
+
+
+def medir_pacotes_modelo(n_amostras=256):
+    """
+    Tamanho em disco, tempo de carga e memória residente dos pacotes de
+    modelo (pacote_modelo.ModelBundle) dos oito tipos de modelo, com e sem
+    memory-mapping, comparados com joblib.load dos mesmos objetos.
+
+    Cada carga é medida em um processo novo, para que a memória residente
+    não inclua modelos carregados antes.
+    """
+    print(f"\n📦 PACOTES DE MODELO - CARGA E MEMÓRIA RESIDENTE")
+    print("="*60)
+
+    processor = DataProcessor(window_size=100, overlap=50)
+    df = FeatureStore().organize(processor, [(c, r) for c, r in ARQUIVOS if Path(c).exists()])
+
+    trainer = ModelTrainer(random_state=42, model_cache=ModelCache())
+    X_train, X_test, y_train, y_test = trainer.prepare_data(df, test_size=0.3)
+    trainer.initialize_models()
+    trainer.train_and_evaluate(X_train, X_test, y_train, y_test)
+
+    X = trainer.scaler.inverse_transform(X_test[:n_amostras])
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pacotes = salvar_pacotes(trainer, processor, tmp)
+
+        print(f"\n{'Modelo':<22} {'Disco (KB)':>11} {'Modo':<13} {'Carga (ms)':>11} "
+              f"{'RSS carga (MB)':>15} {'RSS pred. (MB)':>15} {'Privada (MB)':>13}")
+        for name, caminho in pacotes.items():
+            # Mesmo conteúdo em joblib, para referência
+            bundle = ModelBundle.load(caminho, mmap_arrays=False)
+            caminho_joblib = f'{caminho}.joblib'
+            joblib.dump({'model': bundle.model, 'scaler': bundle.scaler,
+                         'label_encoder': bundle.label_encoder}, caminho_joblib)
+            assert np.array_equal(bundle.predict(X), trainer.label_encoder.inverse_transform(
+                trainer.results[name]['model'].predict(trainer.scaler.transform(X)))), \
+                f"Predições do pacote diferem do modelo treinado ({name})"
+
+            resultados[name] = {'tamanho_pacote_kb': os.path.getsize(caminho) / 1024,
+                                'tamanho_joblib_kb': os.path.getsize(caminho_joblib) / 1024}
+            for modo, arquivo in [('pacote_mmap', caminho), ('pacote_leitura', caminho),
+                                  ('joblib', caminho_joblib)]:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                    medida = executor.submit(_medir_carga, arquivo, modo, X).result()
+                resultados[name][modo] = medida
+                tamanho = resultados[name]['tamanho_joblib_kb' if modo == 'joblib' else 'tamanho_pacote_kb']
+                print(f"{name:<22} {tamanho:>11.1f} {modo:<13} {medida['carga_ms']:>11.2f} "
+                      f"{medida['rss_carga_mb']:>15.2f} {medida['rss_predicao_mb']:>15.2f} "
+                      f"{medida['privada_predicao_mb']:>13.2f}")
+
+    print(f"\n   Predições dos pacotes idênticas às dos modelos treinados: ✅")
+    return resultados
+
+
 def main():
     """
     Função principal que reproduz o comportamento do sample_dt_classifier_mem.py
@@ -256,8 +414,12 @@ def main():
     print("="*70)
     
     try:
-        # Carrega e treina modelo
-        model, scaler, label_encoder, X_test = carregar_e_treinar_modelo()
+        # Carrega e treina modelo (do cache de modelos, se nada mudou)
+        print("\n📊 CARREGANDO DADOS E TREINANDO MODELO")
+        print("="*60)
+        cache = ModelCache()
+        model, scaler, label_encoder, X_test = carregar_e_treinar_modelo(cache)
+        cache.print_stats()
         
         # Mede tamanho do modelo (método principal)
         tamanhos = medir_tamanho_modelo(model)
@@ -268,6 +430,12 @@ def main():
         # Comparação com código original
         comparar_com_codigo_original()
         
+        # Representação das features (DataFrame vs FeatureMatrix)
+        representacao = comparar_representacoes_features()
+        
+        # Pacotes de modelo dos oito tipos (carga e memória residente)
+        pacotes = medir_pacotes_modelo()
+        
         # ============================================
         # Reproduz exatamente a saída do código original
         # ============================================
@@ -306,7 +474,9 @@ def main():
             'sistema_completo': {
                 'total_bytes': componentes['total_sys_bytes'],
                 'total_mb': componentes['total_sys_bytes'] / (1024*1024)
-            }
+            },
+            'representacao_features': representacao,
+            'pacotes_modelo': pacotes
         }
         
         import json
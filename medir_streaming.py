@@ -0,0 +1,252 @@
+"""
+Medição do Classificador em Tempo Real (Streaming)
+==================================================
+
+Reproduz os arquivos de ./dados amostra a amostra no StreamingClassifier
+(classificador_streaming.py), medindo a latência por amostra recebida e por
+predição emitida, e verifica que as predições e as features coincidem com
+as do pipeline em lote (extract_features_batch + scaler + predict).
+
+As features espectrais da DFT deslizante (SlidingDFT) são comparadas com a
+FFT/Welch completa de cada janela dentro de uma tolerância, e a latência é
+medida com e sem a DFT deslizante. Mediana e quartis aproximados
+(SlidingQuantileSketch) são comparados com os valores exatos para várias
+resoluções.
+"""
+
+import numpy as np
+import time
+import json
+from pathlib import Path
+
+from classificacao_vias import DataProcessor, treinar_arvore
+from classificador_streaming import QUANTILE_FEATURES, SPECTRAL_FEATURES, StreamingClassifier
+from extracao_features import FEATURE_SPECS, SENSORS, extract_features_batch, window_view
+
+ARQUIVOS = [
+    ('./dados/rua_asfalto.csv', 'Rua/Asfalto'),
+    ('./dados/cimento_utinga.csv', 'Cimento Pavimentado'),
+    ('./dados/terra_batida.csv', 'Terra Batida')
+]
+
+
+def reproduzir_arquivo(model, scaler, values, window_size, overlap, sliding_dft=True,
+                       rtol=1e-9, atol=1e-9):
+    """
+    Envia as amostras de um arquivo uma a uma ao StreamingClassifier e
+    compara com o pipeline em lote.
+
+    Parâmetros:
+    -----------
+    values : np.array
+        Sinais (n_amostras, 3) na ordem de SENSORS
+    sliding_dft : bool
+        Usa a DFT deslizante para as features espectrais
+
+    Retorna:
+    --------
+    dict
+        Latências, número de predições e resultado da paridade
+    """
+    classifier = StreamingClassifier(model, scaler, window_size=window_size, overlap=overlap,
+                                     sliding_dft=sliding_dft)
+
+    # Pipeline em lote (referência)
+    janelas = window_view(values, window_size, window_size - overlap)
+    features_lote = extract_features_batch(janelas)
+    pred_lote = model.predict(scaler.transform(features_lote))
+
+    tempos_amostra = []
+    tempos_emissao = []
+    pred_stream = []
+    max_diff = 0.0
+
+    for sample in values:
+        start = time.perf_counter()
+        emitted = classifier.push(sample)
+        elapsed = time.perf_counter() - start
+
+        if emitted:
+            tempos_emissao.append(elapsed)
+            pred_stream.extend(label for _, label in emitted)
+
+            # Paridade das features lidas pelo modelo (fora da medição de tempo)
+            linha = len(pred_stream) - 1
+            plano = classifier.features
+            atual = classifier.current_features()[0, plano]
+            referencia = features_lote[linha, plano]
+            if not np.allclose(atual, referencia, rtol=rtol, atol=atol):
+                max_diff = max(max_diff, float(np.max(np.abs(atual - referencia))))
+        else:
+            tempos_amostra.append(elapsed)
+
+    return {
+        'amostras': len(values),
+        'predicoes': len(pred_stream),
+        'latencia_amostra_us': float(np.mean(tempos_amostra)) * 1e6,
+        'latencia_emissao_ms': float(np.mean(tempos_emissao)) * 1000,
+        'latencia_emissao_p99_ms': float(np.percentile(tempos_emissao, 99)) * 1000,
+        'predicoes_identicas': bool(np.array_equal(pred_stream, pred_lote)),
+        'features_dentro_tolerancia': max_diff == 0.0,
+        'max_diff_fora_tolerancia': max_diff
+    }
+
+
+def verificar_dft_deslizante(values, window_size, overlap, rtol=1e-9):
+    """
+    Compara as features espectrais da DFT deslizante com a FFT/Welch
+    completa de cada janela (todas as features espectrais dos 3 sensores).
+
+    Retorna:
+    --------
+    dict
+        Maior erro relativo por feature e se todas ficaram dentro de `rtol`
+    """
+    espectrais = [idx for idx, (s, nome) in enumerate(FEATURE_SPECS) if nome in SPECTRAL_FEATURES]
+    classifier = StreamingClassifier(None, window_size=window_size, overlap=overlap,
+                                     features=espectrais)
+
+    janelas = window_view(values, window_size, window_size - overlap)
+    referencia = extract_features_batch(janelas, features=espectrais)[:, espectrais]
+
+    atual = []
+    for sample in values:
+        if classifier.append(sample):
+            atual.append(classifier.current_features()[0, espectrais])
+    atual = np.array(atual)
+
+    # Erro relativo à maior magnitude de cada feature no arquivo
+    escala = np.max(np.abs(referencia), axis=0)
+    escala[escala == 0] = 1.0
+    erro = np.max(np.abs(atual - referencia), axis=0) / escala
+
+    erros = {}
+    for idx, e in zip(espectrais, erro):
+        s, nome = FEATURE_SPECS[idx]
+        erros[nome] = max(erros.get(nome, 0.0), float(e))
+
+    return {'erro_relativo_max': erros, 'dentro_tolerancia': bool(np.all(erro <= rtol))}
+
+
+def medir_quantis_aproximados(values, window_size, overlap, resolucoes=(0.001, 0.01, 0.1)):
+    """
+    Compara mediana/q25/q75/iqr do histograma deslizante com os valores
+    exatos, para cada resolução, e mede o tempo de atualização e consulta.
+
+    Retorna:
+    --------
+    dict
+        Por resolução: maior erro absoluto por feature, respeito ao limite
+        de erro e tempos por amostra e por janela
+    """
+    quantis = [idx for idx, (s, nome) in enumerate(FEATURE_SPECS) if nome in QUANTILE_FEATURES]
+    janelas = window_view(values, window_size, window_size - overlap)
+    exato = extract_features_batch(janelas, features=quantis)[:, quantis]
+
+    resultados = {}
+    for resolucao in (None,) + tuple(resolucoes):
+        classifier = StreamingClassifier(None, window_size=window_size, overlap=overlap,
+                                         features=quantis, quantile_resolution=resolucao)
+        tempo_amostras = 0.0
+        tempo_janelas = 0.0
+        atual = []
+
+        for sample in values:
+            start = time.perf_counter()
+            completa = classifier.append(sample)
+            tempo_amostras += time.perf_counter() - start
+
+            if completa:
+                start = time.perf_counter()
+                atual.append(classifier.current_features()[0, quantis])
+                tempo_janelas += time.perf_counter() - start
+
+        erro = np.max(np.abs(np.array(atual) - exato), axis=0)
+        erros = {}
+        for idx, e in zip(quantis, erro):
+            nome = FEATURE_SPECS[idx][1]
+            erros[nome] = max(erros.get(nome, 0.0), float(e))
+
+        # iqr é a diferença de dois quantis: limite de 2 * resolução
+        limite = {nome: (resolucao or 0.0) * (2 if nome == 'iqr' else 1) for nome in erros}
+        resultados['exato' if resolucao is None else str(resolucao)] = {
+            'erro_abs_max': erros,
+            'dentro_limite': all(erros[nome] <= limite[nome] for nome in erros),
+            'tempo_amostra_us': tempo_amostras / len(values) * 1e6,
+            'tempo_janela_us': tempo_janelas / max(len(atual), 1) * 1e6
+        }
+
+    return resultados
+
+
+def medir_streaming(window_size=100, overlap=50):
+    """
+    Reproduz todos os arquivos disponíveis no classificador em tempo real.
+    """
+    print(f"\n📡 Classificador em tempo real (window_size={window_size}, overlap={overlap})")
+    print("="*60)
+
+    arquivos = [(caminho, classe) for caminho, classe in ARQUIVOS if Path(caminho).exists()]
+    if not arquivos:
+        raise FileNotFoundError("Nenhum arquivo de dados encontrado em ./dados")
+
+    processor = DataProcessor(window_size=window_size, overlap=overlap)
+    model, scaler = treinar_arvore(processor, arquivos)
+
+    resultados = {}
+    for caminho, classe in arquivos:
+        values = processor.load_data(caminho, classe)[SENSORS].to_numpy(dtype=np.float64)
+        r = reproduzir_arquivo(model, scaler, values, window_size, overlap)
+        r_fft = reproduzir_arquivo(model, scaler, values, window_size, overlap, sliding_dft=False)
+        r['latencia_emissao_fft_completa_ms'] = r_fft['latencia_emissao_ms']
+        r['latencia_amostra_fft_completa_us'] = r_fft['latencia_amostra_us']
+        r['dft_deslizante'] = verificar_dft_deslizante(values, window_size, overlap)
+        r['quantis_aproximados'] = medir_quantis_aproximados(values, window_size, overlap)
+        resultados[Path(caminho).name] = r
+
+        print(f"\n   {Path(caminho).name}: {r['amostras']} amostras, {r['predicoes']} predições")
+        print(f"   Latência por amostra: {r['latencia_amostra_us']:.2f} µs")
+        print(f"   Latência por predição: {r['latencia_emissao_ms']:.4f} ms "
+              f"(p99 {r['latencia_emissao_p99_ms']:.4f} ms)")
+        print(f"   {'✅' if r['predicoes_identicas'] else '❌'} Predições idênticas ao lote: "
+              f"{r['predicoes_identicas']}")
+        print(f"   {'✅' if r['features_dentro_tolerancia'] else '❌'} Features dentro da tolerância: "
+              f"{r['features_dentro_tolerancia']}")
+        print(f"   FFT/Welch por janela: {r['latencia_amostra_fft_completa_us']:.2f} µs por amostra, "
+              f"{r['latencia_emissao_fft_completa_ms']:.4f} ms por predição")
+
+        dft = r['dft_deslizante']
+        pior = max(dft['erro_relativo_max'], key=dft['erro_relativo_max'].get)
+        print(f"   {'✅' if dft['dentro_tolerancia'] else '❌'} DFT deslizante vs FFT/Welch: "
+              f"maior erro relativo {dft['erro_relativo_max'][pior]:.2e} ({pior})")
+
+        print(f"   Quantis (mediana/q25/q75/iqr): resolução | erro máx | µs/amostra | µs/janela")
+        for resolucao, q in r['quantis_aproximados'].items():
+            print(f"     {resolucao:>6} | {max(q['erro_abs_max'].values()):.2e} | "
+                  f"{q['tempo_amostra_us']:6.2f} | {q['tempo_janela_us']:7.1f} "
+                  f"{'✅' if q['dentro_limite'] else '❌'}")
+
+    return resultados
+
+
+def main():
+    """
+    Função principal para medição do classificador em tempo real.
+    """
+    print("🚴 MEDIÇÃO - CLASSIFICADOR EM TEMPO REAL")
+    print("="*70)
+
+    try:
+        resultados = {'streaming': medir_streaming()}
+
+        with open('./resultados/modelos/tempos_streaming.json', 'w') as f:
+            json.dump(resultados, f, indent=2)
+
+        print(f"\n💾 Resultados salvos em: ./resultados/modelos/tempos_streaming.json")
+
+    except FileNotFoundError as e:
+        print(f"❌ Erro: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,56 +9,27 @@ para classificação de tipos de vias.
 
 import numpy as np
 import pandas as pd
+import pickle
 import time
 import random
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from pathlib import Path
+
 from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
 
-def carregar_e_treinar_modelo():
-    """
-    Carrega os dados organizados e treina o modelo de árvore de decisão.
-    """
-    print("🔄 Carregando dados e treinando modelo...")
-    
-    # Carrega dados organizados
-    dados_path = "./resultados/dados_processados/dados_organizados.csv"
-    df = pd.read_csv(dados_path)
-    
-    # Separa features e target
-    X = df.drop('Classe', axis=1)
-    y = df['Classe']
-    
-    # Codifica labels
-    label_encoder = LabelEncoder()
-    y_encoded = label_encoder.fit_transform(y)
-    
-    # Divisão treino/teste
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y_encoded, test_size=0.3, random_state=42, stratify=y_encoded
-    )
-    
-    # Normalização
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Treina o modelo (mesmos parâmetros do código principal)
-    model = DecisionTreeClassifier(
-        random_state=42,
-        max_depth=10,
-        min_samples_split=5,
-        min_samples_leaf=3,
-        class_weight='balanced'
-    )
-    
-    model.fit(X_train_scaled, y_train)
-    
-    print(f"✅ Modelo treinado com {X_train_scaled.shape[1]} features")
-    print(f"   Classes: {label_encoder.classes_}")
-    print(f"   Amostras de treino: {len(X_train_scaled)}")
-    
-    return model, scaler, label_encoder, X_test_scaled
+from armazem_features import carregar_dados_organizados
+from cache_modelos import ModelCache
+from classificacao_vias import DataProcessor, ModelTrainer, carregar_e_treinar_modelo
+from extracao_features import SENSORS, extract_features_batch, window_view
+from inferencia_arvore import CompiledTreePredictor, LazyTreePredictor, PackedForestPredictor
+from pacote_modelo import fold_scaler
+
+# Arquivos de dados (mesma lista de classificacao_vias.main)
+ARQUIVOS = [
+    ('./dados/rua_asfalto.csv', 'Rua/Asfalto'),
+    ('./dados/cimento_utinga.csv', 'Cimento Pavimentado'),
+    ('./dados/terra_batida.csv', 'Terra Batida')
+]
 
 def medir_tempo_classificacao(model, scaler, num_features, num_execucoes=1000):
     """
@@ -190,6 +161,266 @@ def testar_com_dados_reais(model, scaler, label_encoder, X_test, num_amostras=10
     
     return tempo_por_amostra_real
 
+def carregar_janelas_brutas(window_size=100, overlap=50):
+    """
+    Janelas brutas (n_janelas, window_size, 3) dos arquivos de dados disponíveis.
+    """
+    processor = DataProcessor(window_size=window_size, overlap=overlap)
+    janelas = [
+        window_view(processor.load_data(caminho, classe)[SENSORS].to_numpy(dtype=np.float64),
+                    window_size, window_size - overlap)
+        for caminho, classe in ARQUIVOS if Path(caminho).exists()
+    ]
+    if not janelas:
+        raise FileNotFoundError("Nenhum arquivo de dados encontrado em ./dados")
+    return np.concatenate(janelas)
+
+def medir_inferencia_preguicosa(model, scaler, num_janelas=500):
+    """
+    Compara, janela a janela, a inferência completa (todas as features +
+    scaler + predict) com a inferência preguiçosa, que calcula apenas as
+    features lidas no caminho percorrido na árvore.
+    """
+    print(f"\n🌿 Inferência preguiçosa vs vetor completo ({num_janelas} janelas)...")
+    print("="*60)
+    
+    janelas = carregar_janelas_brutas()
+    indices = np.random.choice(len(janelas), min(num_janelas, len(janelas)), replace=False)
+    amostras = janelas[indices]
+    
+    # Vetor completo de features para cada janela
+    start = time.perf_counter()
+    pred_completo = []
+    for janela in amostras:
+        features = extract_features_batch(janela[np.newaxis])
+        pred_completo.append(model.predict(scaler.transform(features))[0])
+    tempo_completo = (time.perf_counter() - start) / len(amostras)
+    
+    # Features calculadas sob demanda ao longo do caminho
+    lazy = LazyTreePredictor(model, scaler)
+    start = time.perf_counter()
+    pred_lazy = [lazy.predict_window(janela) for janela in amostras]
+    tempo_lazy = (time.perf_counter() - start) / len(amostras)
+    
+    iguais = bool(np.array_equal(pred_completo, pred_lazy))
+    print(f"   Vetor completo: {tempo_completo*1000:.4f} ms por janela (62 features)")
+    print(f"   Preguiçosa:     {tempo_lazy*1000:.4f} ms por janela "
+          f"({lazy.avg_features_computed:.1f} features em média)")
+    print(f"   Ganho: {tempo_completo/tempo_lazy:.1f}x")
+    print(f"   {'✅' if iguais else '❌'} Predições idênticas: {iguais}")
+    
+    return {
+        'janelas': len(amostras),
+        'completo_ms': tempo_completo * 1000,
+        'preguicosa_ms': tempo_lazy * 1000,
+        'ganho': tempo_completo / tempo_lazy,
+        'media_features_calculadas': lazy.avg_features_computed,
+        'predicoes_identicas': iguais
+    }
+
+def medir_arvore_compilada(model, X_test, num_execucoes=1000, lotes=(64, 4096)):
+    """
+    Compara model.predict com a árvore exportada para arrays
+    (CompiledTreePredictor): uma amostra por vez (função gerada e percurso
+    dos arrays) e em lotes (percurso nível a nível).
+    """
+    print(f"\n⚙️  Árvore compilada vs model.predict ({num_execucoes} amostras)...")
+    print("="*60)
+    
+    compilada = CompiledTreePredictor(model)
+    arrays = CompiledTreePredictor(model, codegen=False)
+    
+    # Paridade: conjunto de teste e features aleatórias (inclusive ausentes)
+    aleatorias = np.random.normal(0, 1, (5000, X_test.shape[1]))
+    ausentes = aleatorias.copy()
+    ausentes[np.random.rand(*ausentes.shape) < 0.1] = np.nan
+    iguais = True
+    for X in (X_test, aleatorias, ausentes):
+        esperado = model.predict(X)
+        iguais &= bool(np.array_equal(compilada.predict(X), esperado))
+        iguais &= all(compilada.predict_one(x) == e and arrays.predict_one(x) == e
+                      for x, e in zip(X, esperado))
+    
+    # Uma amostra por vez (vetor 1-D)
+    amostras = X_test[np.arange(num_execucoes) % len(X_test)]
+    tempos = {}
+    for nome, prever in [('sklearn', lambda x: model.predict(x.reshape(1, -1))),
+                         ('codigo_gerado', compilada.predict_one),
+                         ('arrays', arrays.predict_one)]:
+        start = time.perf_counter()
+        for x in amostras:
+            prever(x)
+        tempos[nome] = (time.perf_counter() - start) / num_execucoes
+    
+    print(f"   Uma amostra - sklearn:        {tempos['sklearn']*1e6:.2f} µs")
+    print(f"   Uma amostra - código gerado:  {tempos['codigo_gerado']*1e6:.2f} µs "
+          f"({tempos['sklearn']/tempos['codigo_gerado']:.0f}x)")
+    print(f"   Uma amostra - arrays:         {tempos['arrays']*1e6:.2f} µs "
+          f"({tempos['sklearn']/tempos['arrays']:.0f}x)")
+    
+    # Lotes (melhor de 5 execuções)
+    por_lote = {}
+    for tamanho in sorted(set(lotes) | {len(X_test)}):
+        X = X_test[np.arange(tamanho) % len(X_test)]
+        medidas = {}
+        for nome, prever in [('sklearn', model.predict), ('nivel_a_nivel', compilada.predict)]:
+            execucoes = []
+            for _ in range(5):
+                start = time.perf_counter()
+                prever(X)
+                execucoes.append(time.perf_counter() - start)
+            medidas[nome] = min(execucoes)
+        por_lote[str(tamanho)] = {
+            'sklearn_ms': medidas['sklearn'] * 1000,
+            'nivel_a_nivel_ms': medidas['nivel_a_nivel'] * 1000
+        }
+        print(f"   Lote de {tamanho:>5}: sklearn {medidas['sklearn']*1000:.3f} ms, "
+              f"nível a nível {medidas['nivel_a_nivel']*1000:.3f} ms "
+              f"({medidas['sklearn']/medidas['nivel_a_nivel']:.1f}x)")
+    
+    print(f"   {'✅' if iguais else '❌'} Predições idênticas: {iguais}")
+    
+    return {
+        'amostra_sklearn_us': tempos['sklearn'] * 1e6,
+        'amostra_codigo_gerado_us': tempos['codigo_gerado'] * 1e6,
+        'amostra_arrays_us': tempos['arrays'] * 1e6,
+        'lotes': por_lote,
+        'predicoes_identicas': iguais
+    }
+
+def treinar_modelos(nomes, cache=None):
+    """
+    Treina (ou carrega do cache de modelos) os modelos de
+    ModelTrainer.initialize_models indicados, com a divisão treino/teste e a
+    normalização do código principal.
+    
+    Retorna:
+    --------
+    tuple
+        ({nome: modelo treinado}, scaler, X_test com as features brutas)
+    """
+    cache = cache if cache is not None else ModelCache()
+    df = carregar_dados_organizados(window_size=100, overlap=50)
+    X = df.drop('Classe', axis=1).to_numpy(dtype=np.float64)
+    y = LabelEncoder().fit_transform(df['Classe'])
+    X_train, X_test, y_train, _ = train_test_split(X, y, test_size=0.3, random_state=42, stratify=y)
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled = scaler.transform(X_train)
+    
+    trainer = ModelTrainer(random_state=42)
+    trainer.initialize_models()
+    modelos = {nome: cache.fit(trainer.models[nome], X_train_scaled, y_train) for nome in nomes}
+    return modelos, scaler, X_test
+
+def medir_scaler_incorporado(num_execucoes=1000, cache=None):
+    """
+    Compara scaler.transform + predict com os modelos que incorporam a
+    normalização (pacote_modelo.fold_scaler) e recebem as features brutas:
+    paridade das predições no conjunto de teste e latência por amostra e
+    em lote.
+    """
+    print(f"\n📐 Normalização incorporada ao modelo vs scaler.transform + predict...")
+    print("="*60)
+    
+    nomes = ['Decision Tree', 'Random Forest', 'Gradient Boosting', 'Logistic Regression',
+             'SVM (Linear)', 'Naive Bayes']
+    modelos, scaler, X_test = treinar_modelos(nomes, cache)
+    
+    amostras = X_test[np.arange(num_execucoes) % len(X_test)]
+    resultados = {}
+    print(f"   {'Modelo':<20} {'Iguais':>7} {'Amostra (µs)':>22} {'Lote (ms)':>18}")
+    for nome, model in modelos.items():
+        incorporado = fold_scaler(model, scaler)
+        
+        iguais = bool(np.array_equal(incorporado.predict(X_test), model.predict(scaler.transform(X_test))))
+        
+        tempos = {}
+        for modo, prever in [('scaler', lambda X: model.predict(scaler.transform(X))),
+                             ('incorporado', incorporado.predict)]:
+            prever(amostras[:1])
+            start = time.perf_counter()
+            for x in amostras:
+                prever(x.reshape(1, -1))
+            tempos[f'{modo}_amostra_us'] = (time.perf_counter() - start) / num_execucoes * 1e6
+            
+            lote = []
+            for _ in range(5):
+                start = time.perf_counter()
+                prever(X_test)
+                lote.append(time.perf_counter() - start)
+            tempos[f'{modo}_lote_ms'] = min(lote) * 1000
+        
+        resultados[nome] = dict(tempos, predicoes_identicas=iguais)
+        print(f"   {nome:<20} {'✅' if iguais else '❌':>6} "
+              f"{tempos['scaler_amostra_us']:>10.1f} → {tempos['incorporado_amostra_us']:>7.1f} "
+              f"{tempos['scaler_lote_ms']:>8.3f} → {tempos['incorporado_lote_ms']:>6.3f}")
+    
+    return resultados
+
+def medir_floresta_compactada(lotes=(1, 64, 4096), cache=None):
+    """
+    Compara RandomForestClassifier.predict_proba com a floresta exportada
+    para arrays contíguos (PackedForestPredictor): memória, paridade e
+    latência por tamanho de lote.
+    """
+    print(f"\n🌲 Random Forest compactada vs predict_proba...")
+    print("="*60)
+    
+    modelos, scaler, X_test = treinar_modelos(['Random Forest'], cache)
+    model = modelos['Random Forest']
+    X_test = scaler.transform(X_test)
+    
+    compactada = PackedForestPredictor(model)
+    
+    # Memória: arrays das árvores do scikit-learn vs arrays compactados
+    arrays_sklearn = sum(estimator.tree_.__getstate__()['nodes'].nbytes + estimator.tree_.value.nbytes
+                         for estimator in model.estimators_)
+    serializado = len(pickle.dumps(model))
+    
+    # Paridade: conjunto de teste e features aleatórias (inclusive ausentes)
+    aleatorias = np.random.normal(0, 1, (5000, X_test.shape[1]))
+    ausentes = aleatorias.copy()
+    ausentes[np.random.rand(*ausentes.shape) < 0.1] = np.nan
+    iguais = all(np.array_equal(compactada.predict_proba(X), model.predict_proba(X))
+                 and np.array_equal(compactada.predict(X), model.predict(X))
+                 for X in (X_test, aleatorias, ausentes))
+    
+    print(f"   Nós internos: {len(compactada.feature)}, folhas: {len(compactada.leaf_proba)} "
+          f"(índices {compactada.children.dtype}, features {compactada.feature.dtype}, "
+          f"limiares {compactada.threshold.dtype})")
+    print(f"   Memória - sklearn: {arrays_sklearn/1024:.1f} KB em arrays "
+          f"({serializado/1024:.1f} KB serializado), compactada: {compactada.nbytes/1024:.1f} KB")
+    
+    por_lote = {}
+    for tamanho in lotes:
+        X = X_test[np.arange(tamanho) % len(X_test)]
+        medidas = {}
+        for nome, prever in [('sklearn', model.predict_proba), ('compactada', compactada.predict_proba)]:
+            prever(X)
+            execucoes = []
+            for _ in range(5):
+                start = time.perf_counter()
+                prever(X)
+                execucoes.append(time.perf_counter() - start)
+            medidas[nome] = min(execucoes)
+        por_lote[str(tamanho)] = {
+            'sklearn_ms': medidas['sklearn'] * 1000,
+            'compactada_ms': medidas['compactada'] * 1000
+        }
+        print(f"   Lote de {tamanho:>5}: sklearn {medidas['sklearn']*1000:.3f} ms, "
+              f"compactada {medidas['compactada']*1000:.3f} ms "
+              f"({medidas['sklearn']/medidas['compactada']:.1f}x)")
+    
+    print(f"   {'✅' if iguais else '❌'} Probabilidades e predições idênticas: {iguais}")
+    
+    return {
+        'memoria_sklearn_kb': arrays_sklearn / 1024,
+        'serializado_sklearn_kb': serializado / 1024,
+        'memoria_compactada_kb': compactada.nbytes / 1024,
+        'lotes': por_lote,
+        'predicoes_identicas': iguais
+    }
+
 def analise_performance():
     """
     Análise detalhada da performance do classificador.
@@ -200,8 +431,10 @@ def analise_performance():
     # Diferentes quantidades de execuções
     execucoes = [100, 500, 1000, 5000]
     
-    # Carrega modelo
-    model, scaler, label_encoder, X_test = carregar_e_treinar_modelo()
+    # Carrega modelo (do cache de modelos, se nada mudou)
+    cache = ModelCache()
+    model, scaler, label_encoder, X_test = carregar_e_treinar_modelo(cache)
+    cache.print_stats()
     
     resultados = {}
     
@@ -217,11 +450,23 @@ def analise_performance():
     # Teste com dados reais
     tempo_real = testar_com_dados_reais(model, scaler, label_encoder, X_test, 500)
     
+    # Inferência preguiçosa a partir das janelas brutas
+    resultados['inferencia_preguicosa'] = medir_inferencia_preguicosa(model, scaler)
+    
+    # Árvore exportada para arrays / código gerado
+    resultados['arvore_compilada'] = medir_arvore_compilada(model, X_test)
+    
+    # Normalização incorporada aos modelos de árvore e lineares
+    resultados['scaler_incorporado'] = medir_scaler_incorporado(cache=cache)
+    
+    # Random Forest em arrays contíguos
+    resultados['floresta_compactada'] = medir_floresta_compactada(cache=cache)
+    
     # Resumo final
     print(f"\n🎯 RESUMO FINAL")
     print("="*60)
     
-    melhor_tempo = min([r['perf_counter']['tempo_por_predicao'] for r in resultados.values()])
+    melhor_tempo = min([resultados[n]['perf_counter']['tempo_por_predicao'] for n in execucoes])
     print(f"⚡ Melhor tempo por predição: {melhor_tempo*1000:.4f} ms")
     print(f"🔬 Tempo com dados reais: {tempo_real*1000:.4f} ms")
     print(f"🌳 Profundidade da árvore: {model.tree_.max_depth}")
@@ -261,6 +506,9 @@ def main():
             # Converte para formato serializável
             resultados_json = {}
             for k, v in resultados.items():
+                if k in ('inferencia_preguicosa', 'arvore_compilada', 'scaler_incorporado', 'floresta_compactada'):
+                    resultados_json[k] = v
+                    continue
                 resultados_json[str(k)] = {
                     'perf_counter_total': v['perf_counter']['tempo_total'],
                     'perf_counter_por_predicao_ms': v['perf_counter']['tempo_por_predicao'] * 1000,
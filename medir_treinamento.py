@@ -0,0 +1,234 @@
+"""
+Medição do Tempo de Treinamento - Classificação de Vias
+=======================================================
+
+Compara o treinamento sequencial dos modelos de ModelTrainer (fit +
+cross_val_score(cv=5, n_jobs=-1) modelo a modelo) com o agendador de
+treinamento (agendador_treinamento.TrainingScheduler), que executa os
+treinamentos e as dobras como tarefas independentes de um único pool.
+
+Também compara o número de treinamentos e o tempo da avaliação original
+(treino final + 5 dobras, SVMs com probability=True) com a avaliação que
+reaproveita as dobras e calibra os SVMs só quando as curvas ROC são pedidas,
+e a seleção de modelo por halving sucessivo (ModelTrainer.select_model) com
+a busca completa (validação cruzada de todos os modelos em todos os dados).
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.model_selection import cross_val_score
+
+from agendador_treinamento import TrainingScheduler
+from armazem_features import carregar_dados_organizados
+from classificacao_vias import ModelTrainer
+
+
+def preparar_treinador(lazy_probability=False):
+    """
+    Carrega os dados organizados e prepara o ModelTrainer.
+    """
+    print("🔄 Carregando dados organizados...")
+    df = carregar_dados_organizados(window_size=100, overlap=50)
+
+    trainer = ModelTrainer(random_state=42)
+    X_train, X_test, y_train, y_test = trainer.prepare_data(df)
+    trainer.initialize_models(lazy_probability=lazy_probability)
+    return trainer, X_train, X_test, y_train, y_test
+
+
+def treinar_sequencial(models, X_train, y_train):
+    """
+    Treinamento original: fit seguido de cross_val_score para cada modelo.
+    """
+    tempos = {}
+    cv_scores = {}
+    inicio_total = time.perf_counter()
+    for name, model in models.items():
+        inicio = time.perf_counter()
+        model.fit(X_train, y_train)
+        cv_scores[name] = cross_val_score(model, X_train, y_train, cv=5, n_jobs=-1)
+        tempos[name] = time.perf_counter() - inicio
+    return time.perf_counter() - inicio_total, tempos, cv_scores
+
+
+def medir_treinamento(threads_per_task=1):
+    """
+    Mede o tempo total do treinamento sequencial e do agendador com 1 e
+    com todos os processos, e verifica se as notas da validação cruzada
+    coincidem.
+    """
+    trainer, X_train, _, y_train, _ = preparar_treinador()
+    n_cpus = os.cpu_count() or 1
+
+    print("\n⏱️  Treinamento sequencial (fit + cross_val_score)...")
+    tempo_seq, tempos_seq, cv_seq = treinar_sequencial(trainer.models, X_train, y_train)
+    print(f"   Tempo total: {tempo_seq:.2f} s")
+
+    resultados = {
+        'n_cpus': n_cpus,
+        'sequencial': {'tempo_total_s': tempo_seq, 'por_modelo_s': tempos_seq},
+        'agendador': {}
+    }
+
+    for n_jobs in sorted({1, n_cpus}):
+        print(f"\n⏱️  Agendador com {n_jobs} processo(s)...")
+        scheduler = TrainingScheduler(n_jobs=n_jobs, threads_per_task=threads_per_task)
+        scheduled = scheduler.run(trainer.models, X_train, y_train)
+
+        identicos = all(np.array_equal(scheduled[name]['cv_scores'], cv_seq[name])
+                        for name in trainer.models)
+        summary = scheduler.summary
+        print(f"   Tempo total: {summary['wall_time']:.2f} s "
+              f"(speedup {tempo_seq / summary['wall_time']:.2f}x, "
+              f"tarefa mais longa {summary['longest_task']:.2f} s, "
+              f"utilização {summary['pool_utilisation']:.0%})")
+        print(f"   Notas de CV idênticas ao sequencial: {'✅' if identicos else '❌'}")
+
+        resultados['agendador'][str(n_jobs)] = {
+            **summary,
+            'speedup': tempo_seq / summary['wall_time'],
+            'cv_identico': identicos,
+            'por_modelo': {
+                name: {k: run[k] for k in ('fit_time', 'cv_time', 'cpu_time', 'cpu_utilisation')}
+                for name, run in scheduled.items()
+            }
+        }
+
+    print(f"\n{'Modelo':<22} {'Sequencial (s)':>15} {'Treino (s)':>11} {'CV (s)':>8}")
+    ultimo = resultados['agendador'][str(max(resultados['agendador'], key=int))]
+    for name in trainer.models:
+        run = ultimo['por_modelo'][name]
+        print(f"{name:<22} {tempos_seq[name]:>15.2f} {run['fit_time']:>11.2f} {run['cv_time']:>8.2f}")
+
+    return resultados
+
+
+def comparar_modos_avaliacao():
+    """
+    Número de treinamentos e tempo de train_and_evaluate antes (treino final
+    + 5 dobras, calibração de Platt em todo fit de SVM) e depois
+    (reuse_cv_fits=True, lazy_probability=True), incluindo a calibração sob
+    demanda usada pelas curvas ROC.
+
+    No modo "depois" o modelo avaliado é o da última dobra, treinado com 80%
+    de X_train; a diferença de F1 entre os modos inclui essa redução dos
+    dados de treino.
+    """
+    resultados = {}
+    for modo, reaproveitar in (('antes', False), ('depois', True)):
+        print(f"\n⏱️  Avaliação {modo} (reuse_cv_fits={reaproveitar}, lazy_probability={reaproveitar})...")
+        trainer, X_train, X_test, y_train, y_test = preparar_treinador(lazy_probability=reaproveitar)
+
+        inicio = time.perf_counter()
+        trainer.train_and_evaluate(X_train, X_test, y_train, y_test, reuse_cv_fits=reaproveitar)
+        tempo_treino = time.perf_counter() - inicio
+
+        # Probabilidades para as curvas ROC (calibração dos SVMs no modo "depois")
+        inicio = time.perf_counter()
+        for name in trainer.results:
+            trainer.predict_proba(name)
+        tempo_roc = time.perf_counter() - inicio
+
+        resultados[modo] = {
+            'tempo_treino_s': tempo_treino,
+            'tempo_probabilidades_roc_s': tempo_roc,
+            'n_fits': sum(r['n_fits'] for r in trainer.results.values()),
+            'por_modelo': {
+                name: {'n_fits': r['n_fits'], 'f1_score': r['f1_score'], 'cv_mean': r['cv_mean']}
+                for name, r in trainer.results.items()
+            }
+        }
+
+    antes, depois = resultados['antes'], resultados['depois']
+    print(f"\n{'Modelo':<22} {'Fits antes':>10} {'Fits depois':>11} {'F1 antes':>9} {'F1 depois':>10}")
+    for name, r in antes['por_modelo'].items():
+        d = depois['por_modelo'][name]
+        print(f"{name:<22} {r['n_fits']:>10} {d['n_fits']:>11} {r['f1_score']:>9.4f} {d['f1_score']:>10.4f}")
+    print(f"\n   Treinamentos: {antes['n_fits']} -> {depois['n_fits']}")
+    print(f"   Tempo de treino: {antes['tempo_treino_s']:.2f} s -> {depois['tempo_treino_s']:.2f} s "
+          f"(+ {depois['tempo_probabilidades_roc_s']:.2f} s de calibração para as curvas ROC)")
+    return resultados
+
+
+def medir_halving(factor=3, scoring='f1_weighted'):
+    """
+    Compara a busca completa (5 dobras de todos os modelos no conjunto de
+    treino inteiro) com a seleção por halving sucessivo: modelo escolhido,
+    amostras de treino consumidas e tempo.
+    """
+    trainer, X_train, _, y_train, _ = preparar_treinador(lazy_probability=True)
+
+    print(f"\n⏱️  Busca completa ({scoring}, 5 dobras, todos os modelos)...")
+    inicio = time.perf_counter()
+    scheduler = TrainingScheduler(refit=False, scoring=scoring)
+    scheduled = scheduler.run(trainer.models, X_train, y_train)
+    tempo_completo = time.perf_counter() - inicio
+    notas = {name: run['cv_scores'].mean() for name, run in scheduled.items()}
+    vencedor_completo = max(notas, key=notas.get)
+    amostras_completo = (sum(len(train_idx) for train_idx, _ in scheduler.folds)
+                         * sum(run['n_fits'] for run in scheduled.values()) // len(scheduler.folds))
+    print(f"   Vencedor: {vencedor_completo} ({notas[vencedor_completo]:.4f}) em {tempo_completo:.2f} s")
+
+    print(f"\n⏱️  Halving sucessivo (factor={factor})...")
+    inicio = time.perf_counter()
+    selecao = trainer.select_model(X_train, y_train, factor=factor, scoring=scoring)
+    tempo_halving = time.perf_counter() - inicio
+    amostras_halving = sum(r['samples'] for r in selecao['resources'].values())
+
+    mesmo = selecao['best_model'] == vencedor_completo
+    print(f"{'Modelo':<22} {'Rodadas':>8} {'Amostras':>10} {'CPU (s)':>8}")
+    for name, r in selecao['resources'].items():
+        print(f"{name:<22} {r['rounds']:>8} {r['samples']:>10} {r['cpu_time']:>8.2f}")
+    print(f"\n   Vencedor: {selecao['best_model']} - mesmo da busca completa: {'✅' if mesmo else '❌'}")
+    print(f"   Amostras de treino: {amostras_completo} -> {amostras_halving}")
+    print(f"   Tempo: {tempo_completo:.2f} s -> {tempo_halving:.2f} s "
+          f"(speedup {tempo_completo / tempo_halving:.2f}x)")
+
+    print(f"\n⏱️  Busca de hiperparâmetros por halving ({selecao['best_model']})...")
+    inicio = time.perf_counter()
+    busca = trainer.tune_model(selecao['best_model'], X_train, y_train, factor=factor, scoring=scoring)
+    tempo_busca = time.perf_counter() - inicio
+    print(f"   Tempo: {tempo_busca:.2f} s")
+
+    return {
+        'busca_completa': {'vencedor': vencedor_completo, 'notas': notas,
+                           'amostras_treino': amostras_completo, 'tempo_s': tempo_completo},
+        'halving': {'vencedor': selecao['best_model'], 'rodadas': selecao['rounds'],
+                    'recursos': selecao['resources'], 'amostras_treino': amostras_halving,
+                    'tempo_s': tempo_halving, 'mesmo_vencedor': mesmo},
+        'busca_hiperparametros': {'modelo': selecao['best_model'],
+                                  'melhores_parametros': busca.best_params_,
+                                  'nota': busca.best_score_,
+                                  'amostras_por_rodada': [int(n) for n in busca.n_resources_],
+                                  'candidatos_por_rodada': [int(n) for n in busca.n_candidates_],
+                                  'tempo_s': tempo_busca}
+    }
+
+
+def main():
+    """
+    Função principal para medição do tempo de treinamento.
+    """
+    print("🚴 MEDIÇÃO DE TEMPO - TREINAMENTO DOS MODELOS")
+    print("="*70)
+
+    try:
+        resultados = medir_treinamento()
+        resultados['modos_avaliacao'] = comparar_modos_avaliacao()
+        resultados['selecao_halving'] = medir_halving()
+
+        with open('./resultados/modelos/tempos_treinamento.json', 'w') as f:
+            json.dump(resultados, f, indent=2)
+
+        print(f"\n💾 Resultados salvos em: ./resultados/modelos/tempos_treinamento.json")
+
+    except FileNotFoundError:
+        print("❌ Erro: Dados organizados não encontrados!")
+        print("   Execute primeiro: python classificacao_vias.py")
+
+
+if __name__ == "__main__":
+    main()
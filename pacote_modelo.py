@@ -0,0 +1,402 @@
+"""
+Pacote de Modelo - Classificação de Vias
+========================================
+
+Formato de arquivo único e versionado para implantar um classificador
+treinado, com tudo que a inferência precisa:
+- o estimador treinado, o StandardScaler e o LabelEncoder
+- window_size, overlap e frequência da grade de tempo (se houver)
+- a lista de features e o mapeamento S1..Sn -> nome original
+- um checksum SHA-256 dos metadados e do conteúdo
+
+fold_scaler incorpora a normalização (StandardScaler) aos parâmetros dos
+modelos de árvore e lineares, que passam a receber as features brutas;
+o pacote resultante não tem scaler (ModelBundle.fold_scaler).
+
+Layout do arquivo:
+    MAGIC (8 bytes) | tamanho do cabeçalho (uint64) | cabeçalho JSON |
+    pickle (protocolo 5) | arrays numéricos alinhados em 64 bytes
+
+Os arrays numéricos dos objetos saem do pickle como buffers fora de banda
+(pickle.PickleBuffer) e são gravados crus; no carregamento, o arquivo é
+aberto com memory-mapping e os arrays apontam diretamente para ele (sem
+cópia, somente leitura). Estruturas que o scikit-learn copia ao
+desserializar (ex.: os nós das árvores) continuam sendo copiadas.
+"""
+
+import copy
+import hashlib
+import json
+import mmap
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.naive_bayes import GaussianNB
+from sklearn.svm import SVC
+
+from extracao_features import FEATURE_NAMES
+from treinamento_incremental import realign_model
+
+# Identificação e versão do formato
+BUNDLE_MAGIC = b'VIASMDL\x00'
+BUNDLE_FORMAT_VERSION = 1
+
+# Alinhamento dos arrays no arquivo (bytes)
+BUFFER_ALIGNMENT = 64
+
+
+class ModelBundle:
+    """
+    Classificador treinado com pré-processamento e especificação das features.
+    """
+
+    def __init__(self, model, scaler, label_encoder, window_size, overlap, feature_mapping,
+                 feature_names=FEATURE_NAMES, sample_rate_hz=None, metadata=None):
+        """
+        Parâmetros:
+        -----------
+        model : estimador treinado
+            Classificador (recebe as features normalizadas)
+        scaler : StandardScaler or None
+            Normalização ajustada no treino (None se já incorporada ao modelo)
+        label_encoder : LabelEncoder
+            Codificação das classes
+        window_size, overlap : int
+            Configuração das janelas usada na extração das features
+        feature_mapping : dict
+            Mapeamento S1..Sn -> nome original da feature
+        feature_names : list of str
+            Nomes das features na ordem das colunas
+        sample_rate_hz : float, opcional
+            Frequência da grade de tempo (None para interpolação por índice)
+        metadata : dict, opcional
+            Informações adicionais (nome do modelo, métricas, ...)
+        """
+        self.model = model
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+        self.window_size = window_size
+        self.overlap = overlap
+        self.feature_mapping = dict(feature_mapping)
+        self.feature_names = list(feature_names)
+        self.sample_rate_hz = sample_rate_hz
+        self.metadata = dict(metadata or {})
+
+    def predict(self, features):
+        """
+        Rótulos das classes para features não normalizadas (n_janelas, n_features),
+        na ordem de feature_names.
+        """
+        if self.scaler is None:
+            # Normalização incorporada ao modelo (fold_scaler)
+            return self.label_encoder.inverse_transform(self.model.predict(np.asarray(features, dtype=np.float64)))
+        if not isinstance(features, pd.DataFrame) and hasattr(self.scaler, 'feature_names_in_'):
+            features = pd.DataFrame(np.asarray(features, dtype=np.float64),
+                                    columns=self.scaler.feature_names_in_)
+        X = self.scaler.transform(features)
+        return self.label_encoder.inverse_transform(self.model.predict(X))
+
+    def _spec(self):
+        return {
+            'versao_formato': BUNDLE_FORMAT_VERSION,
+            'versao_sklearn': sklearn.__version__,
+            'classe_modelo': f'{type(self.model).__module__}.{type(self.model).__qualname__}',
+            'window_size': self.window_size,
+            'overlap': self.overlap,
+            'sample_rate_hz': self.sample_rate_hz,
+            'feature_names': self.feature_names,
+            'feature_mapping': self.feature_mapping,
+            'classes': [str(c) for c in self.label_encoder.classes_],
+            'metadados': self.metadata
+        }
+
+    def save(self, path):
+        """
+        Grava o pacote em um único arquivo.
+
+        Retorna:
+        --------
+        int
+            Tamanho do arquivo em bytes
+        """
+        buffers = []
+        payload = pickle.dumps(
+            {'model': self.model, 'scaler': self.scaler, 'label_encoder': self.label_encoder},
+            protocol=5, buffer_callback=buffers.append
+        )
+
+        # Posições (relativas ao início do conteúdo) do pickle e dos arrays
+        layout = []
+        offset = len(payload)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        for raw in raw_buffers:
+            offset += -offset % BUFFER_ALIGNMENT
+            layout.append([offset, raw.nbytes])
+            offset += raw.nbytes
+
+        spec = self._spec()
+        checksum = hashlib.sha256(json.dumps(spec, sort_keys=True).encode())
+        checksum.update(payload)
+        for raw in raw_buffers:
+            checksum.update(raw)
+
+        header = dict(spec, pickle_bytes=len(payload), buffers=layout, sha256=checksum.hexdigest())
+        header_bytes = json.dumps(header, ensure_ascii=False).encode()
+
+        # O conteúdo começa alinhado para que os offsets valham também no arquivo
+        prefix = len(BUNDLE_MAGIC) + 8 + len(header_bytes)
+        header_bytes += b' ' * (-prefix % BUFFER_ALIGNMENT)
+
+        with open(path, 'wb') as f:
+            f.write(BUNDLE_MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            f.write(payload)
+            position = len(payload)
+            for (start, _), raw in zip(layout, raw_buffers):
+                f.write(b'\x00' * (start - position))
+                f.write(raw)
+                position = start + raw.nbytes
+            size = f.tell()
+        return size
+
+    def fold_scaler(self):
+        """
+        Pacote equivalente com a normalização incorporada ao modelo
+        (fold_scaler), que recebe as features brutas.
+
+        Retorna:
+        --------
+        ModelBundle
+        """
+        return ModelBundle(
+            fold_scaler(self.model, self.scaler), None, self.label_encoder,
+            window_size=self.window_size,
+            overlap=self.overlap,
+            feature_mapping=self.feature_mapping,
+            feature_names=self.feature_names,
+            sample_rate_hz=self.sample_rate_hz,
+            metadata=dict(self.metadata, scaler_incorporado=True)
+        )
+
+    @staticmethod
+    def read_header(path):
+        """
+        Lê só o cabeçalho de um pacote (especificação e layout do conteúdo).
+
+        Retorna:
+        --------
+        tuple
+            (cabeçalho, posição do início do conteúdo no arquivo)
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+                raise ValueError(f"Arquivo não é um pacote de modelo: {path}")
+            header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_size))
+
+        if header['versao_formato'] != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Versão do pacote não suportada: {header['versao_formato']} "
+                             f"(esperada {BUNDLE_FORMAT_VERSION})")
+        return header, len(BUNDLE_MAGIC) + 8 + header_size
+
+    @classmethod
+    def load(cls, path, mmap_arrays=True, verify=True):
+        """
+        Carrega um pacote gravado com save.
+
+        Parâmetros:
+        -----------
+        path : str
+            Caminho do arquivo
+        mmap_arrays : bool
+            Se True, os arrays numéricos apontam para o arquivo mapeado em
+            memória (sem cópia); se False, o arquivo é lido inteiro
+        verify : bool
+            Se True, confere o checksum (lê todo o conteúdo)
+
+        Retorna:
+        --------
+        ModelBundle
+        """
+        header, content_start = cls.read_header(path)
+        with open(path, 'rb') as f:
+            if mmap_arrays:
+                data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))[content_start:]
+            else:
+                f.seek(content_start)
+                data = memoryview(f.read())
+
+        payload = data[:header['pickle_bytes']]
+        buffers = [data[start:start + size] for start, size in header['buffers']]
+
+        spec = {k: v for k, v in header.items() if k not in ('pickle_bytes', 'buffers', 'sha256')}
+        if verify:
+            checksum = hashlib.sha256(json.dumps(spec, sort_keys=True).encode())
+            checksum.update(payload)
+            for buffer in buffers:
+                checksum.update(buffer)
+            if checksum.hexdigest() != header['sha256']:
+                raise ValueError(f"Checksum do pacote não confere: {path}")
+
+        if spec['versao_sklearn'] != sklearn.__version__:
+            print(f"⚠️  Pacote gravado com scikit-learn {spec['versao_sklearn']} "
+                  f"(instalado: {sklearn.__version__})")
+
+        objects = pickle.loads(payload, buffers=buffers)
+        return cls(
+            objects['model'], objects['scaler'], objects['label_encoder'],
+            window_size=spec['window_size'],
+            overlap=spec['overlap'],
+            feature_mapping=spec['feature_mapping'],
+            feature_names=spec['feature_names'],
+            sample_rate_hz=spec['sample_rate_hz'],
+            metadata=spec['metadados']
+        )
+
+
+def _raw_thresholds(threshold, mean, scale):
+    """
+    Limiares nas features brutas equivalentes aos limiares nas padronizadas.
+
+    A árvore compara float32((x - mean) / scale) <= t. O limiar bruto é o
+    maior float32 v com float32((v - mean) / scale) <= t, de modo que
+    float32(x) <= v dá a mesma decisão (exata para x representável em
+    float32; para os demais só pode diferir dentro de 1 ulp de float32).
+    """
+    def goes_left(v):
+        return ((v.astype(np.float64) - mean) / scale).astype(np.float32) <= threshold
+
+    v = (threshold * scale + mean).astype(np.float32)
+    while True:
+        too_high = ~goes_left(v)
+        if not too_high.any():
+            break
+        v[too_high] = np.nextafter(v[too_high], np.float32(-np.inf))
+    while True:
+        up = np.nextafter(v, np.float32(np.inf))
+        still_left = goes_left(up) & np.isfinite(up)
+        if not still_left.any():
+            break
+        v[still_left] = up[still_left]
+    return v.astype(np.float64)
+
+
+def _fold_linear_svc(model, mean, scale):
+    """
+    SVC de kernel linear: <sv, (x - mean) / scale> = <sv / scale, x> - <sv / scale, mean>.
+    O termo constante de cada par de classes (um contra um) vai para o intercepto.
+    """
+    support_vectors = model.support_vectors_ / scale
+    offsets = support_vectors @ mean
+
+    # Coeficientes duais por par (i, j), na ordem da libsvm
+    starts = np.concatenate([[0], np.cumsum(model.n_support_)])
+    n_classes = len(model.n_support_)
+    intercept = model._intercept_.copy()
+    pair = 0
+    for i in range(n_classes):
+        for j in range(i + 1, n_classes):
+            sv_i = slice(starts[i], starts[i + 1])
+            sv_j = slice(starts[j], starts[j + 1])
+            intercept[pair] -= (model._dual_coef_[j - 1, sv_i] @ offsets[sv_i]
+                                + model._dual_coef_[i, sv_j] @ offsets[sv_j])
+            pair += 1
+
+    model.support_vectors_ = support_vectors
+    model._intercept_ = intercept
+    # intercept_ público tem o sinal invertido no caso binário
+    model.intercept_ = -intercept if len(model.classes_) == 2 else intercept.copy()
+
+
+def fold_scaler(model, scaler):
+    """
+    Cópia do modelo que recebe as features brutas: a normalização do
+    StandardScaler (x - mean) / scale é incorporada aos parâmetros.
+
+    - Árvore de decisão, Random Forest e Gradient Boosting: limiares
+      (_raw_thresholds, mesmas decisões da comparação em float32)
+    - Regressão logística e SVM linear: pesos e intercepto
+    - Naive Bayes: médias e variâncias
+
+    Parâmetros:
+    -----------
+    model : estimador treinado
+        Modelo treinado sobre as features normalizadas
+    scaler : StandardScaler
+        Normalização ajustada no treino
+
+    Retorna:
+    --------
+    estimador
+        Modelo equivalente a model.predict(scaler.transform(X)) aplicado a X
+    """
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    scale = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+    folded = copy.deepcopy(model)
+
+    if isinstance(folded, SVC):
+        if folded.kernel != 'linear':
+            raise ValueError(f"Normalização não pode ser incorporada ao SVC com kernel '{folded.kernel}'")
+        _fold_linear_svc(folded, mean, scale)
+        return folded
+
+    trees = np.ravel(getattr(folded, 'estimators_', [folded]))
+    if all(hasattr(tree, 'tree_') for tree in trees):
+        for tree in trees:
+            internal = tree.tree_.feature >= 0
+            feature = tree.tree_.feature[internal]
+            tree.tree_.threshold[internal] = _raw_thresholds(
+                tree.tree_.threshold[internal], mean[feature], scale[feature])
+        return folded
+
+    if isinstance(folded, GaussianNB):
+        # var_ (com epsilon_) escala inteira por scale²: as verossimilhanças
+        # são as do modelo sobre scaler.transform(X), a menos de uma constante
+        # por amostra igual para todas as classes
+        folded.theta_[:] = folded.theta_ * scale + mean
+        folded.var_[:] = folded.var_ * scale ** 2
+        return folded
+
+    # Modelos lineares: x_padronizada = (x_bruta - mean) / scale
+    if not realign_model(folded, scale, mean):
+        raise ValueError(f"Normalização não pode ser incorporada ao modelo {type(model).__name__}")
+    return folded
+
+
+def salvar_pacotes(trainer, processor, destino):
+    """
+    Grava um pacote para cada modelo treinado por um ModelTrainer.
+
+    Parâmetros:
+    -----------
+    trainer : ModelTrainer
+        Treinador com self.results preenchido (após train_and_evaluate)
+    processor : DataProcessor
+        Processador usado na extração das features
+    destino : str
+        Diretório de saída
+
+    Retorna:
+    --------
+    dict
+        {nome do modelo: caminho do pacote}
+    """
+    caminhos = {}
+    for name, result in trainer.results.items():
+        bundle = ModelBundle(
+            result['model'], trainer.scaler, trainer.label_encoder,
+            window_size=processor.window_size,
+            overlap=processor.overlap,
+            feature_mapping=processor.feature_mapping,
+            sample_rate_hz=processor.sample_rate_hz,
+            metadata={'nome': name, 'f1_score': float(result['f1_score']),
+                      'accuracy': float(result['accuracy']), 'criado_em': time.time()}
+        )
+        caminho = f"{destino}/{name.lower().replace(' ', '_').replace('(', '').replace(')', '')}.vmodel"
+        bundle.save(caminho)
+        caminhos[name] = caminho
+    return caminhos
@@ -0,0 +1,151 @@
+"""
+Perfil de Inferência - Classificação de Vias
+============================================
+
+Mede, para um modelo treinado, o custo de implantá-lo em um celular:
+- latência de uma amostra (p50 e p99 de predições de uma janela por vez)
+- vazão em lote (amostras por segundo)
+- tamanho serializado (pickle) e tamanho em memória (alocações ao
+  desserializar, medidas com tracemalloc, mais os nós das árvores)
+
+Também seleciona modelos sob restrições de latência e tamanho e calcula a
+fronteira de Pareto entre qualidade (F1) e custo.
+"""
+
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+
+# Critérios da fronteira de Pareto: (chave em results, True se maior é melhor)
+PARETO_OBJECTIVES = [
+    ('f1_score', True),
+    ('latency_p99_ms', False),
+    ('serialized_kb', False),
+    ('memory_kb', False)
+]
+
+
+def _tree_nbytes(model):
+    """
+    Bytes dos nós das árvores do scikit-learn (alocados fora do alocador do
+    Python, invisíveis ao tracemalloc).
+    """
+    trees = np.ravel(getattr(model, 'estimators_', [model]))
+    return sum(tree.tree_.__getstate__()['nodes'].nbytes + tree.tree_.value.nbytes
+               for tree in trees if hasattr(tree, 'tree_'))
+
+
+def profile_inference(model, X, n_single=200, repeats=3):
+    """
+    Latência, vazão e tamanho de um modelo treinado.
+
+    Parâmetros:
+    -----------
+    model : estimador treinado
+        Modelo a ser medido
+    X : np.array
+        Amostras (n_amostras, n_features) no formato de entrada do modelo
+    n_single : int
+        Número de predições de uma amostra para as percentis de latência
+    repeats : int
+        Repetições da predição em lote (vale a mais rápida)
+
+    Retorna:
+    --------
+    dict
+        latency_p50_ms, latency_p99_ms, throughput (amostras/s),
+        serialized_kb e memory_kb
+    """
+    X = np.asarray(X)
+    rows = X[np.arange(n_single) % len(X)]
+
+    # Aquecimento (caches, imports tardios do scikit-learn)
+    model.predict(rows[:1])
+
+    latencies = np.empty(n_single)
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        model.predict(row.reshape(1, -1))
+        latencies[i] = time.perf_counter() - start
+
+    batch_time = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X)
+        batch_time = min(batch_time, time.perf_counter() - start)
+
+    serialized = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Memória de uma cópia recém-carregada do modelo
+    tracemalloc.start()
+    loaded = pickle.loads(serialized)
+    memory = tracemalloc.get_traced_memory()[0] + _tree_nbytes(loaded)
+    tracemalloc.stop()
+    del loaded
+
+    return {
+        'latency_p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'latency_p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'throughput': len(X) / batch_time,
+        'serialized_kb': len(serialized) / 1024,
+        'memory_kb': memory / 1024
+    }
+
+
+def pareto_front(results, objectives=PARETO_OBJECTIVES):
+    """
+    Modelos não dominados: nenhum outro é pelo menos tão bom em todos os
+    critérios e melhor em algum.
+
+    Parâmetros:
+    -----------
+    results : dict
+        {nome: {critério: valor, ...}}
+    objectives : list of tuples
+        [(critério, True se maior é melhor), ...]
+
+    Retorna:
+    --------
+    list
+        Nomes dos modelos da fronteira, na ordem de results
+    """
+    # Todos os critérios como "menor é melhor"
+    scores = {name: np.array([-r[key] if maximize else r[key] for key, maximize in objectives])
+              for name, r in results.items()}
+    return [name for name, s in scores.items()
+            if not any(np.all(other <= s) and np.any(other < s)
+                       for other_name, other in scores.items() if other_name != name)]
+
+
+def select_under_constraints(results, max_latency_ms=None, max_size_kb=None, max_memory_kb=None,
+                             metric='f1_score'):
+    """
+    Melhor modelo (maior `metric`) entre os que atendem às restrições.
+
+    Parâmetros:
+    -----------
+    results : dict
+        {nome: {critério: valor, ...}} com as chaves de profile_inference
+    max_latency_ms : float, opcional
+        Latência p99 máxima de uma amostra
+    max_size_kb : float, opcional
+        Tamanho serializado máximo
+    max_memory_kb : float, opcional
+        Tamanho máximo em memória
+    metric : str
+        Critério de qualidade a maximizar
+
+    Retorna:
+    --------
+    tuple
+        (nome do melhor modelo ou None se nenhum atende, lista dos que atendem)
+    """
+    limits = [('latency_p99_ms', max_latency_ms), ('serialized_kb', max_size_kb),
+              ('memory_kb', max_memory_kb)]
+    feasible = [name for name, r in results.items()
+                if all(limit is None or r[key] <= limit for key, limit in limits)]
+    if not feasible:
+        return None, feasible
+    return max(feasible, key=lambda name: results[name][metric]), feasible
@@ -0,0 +1,78 @@
+"""
+Paridade das features espectrais da DFT deslizante (SlidingDFT) com a
+FFT/Welch completa de cada janela (extract_features_batch).
+"""
+
+import numpy as np
+import pytest
+from scipy.fft import fft
+
+from classificador_streaming import SPECTRAL_FEATURES, SlidingDFT, StreamingClassifier
+from extracao_features import FEATURE_SPECS, extract_features_batch, window_view
+
+ESPECTRAIS = [idx for idx, (s, nome) in enumerate(FEATURE_SPECS) if nome in SPECTRAL_FEATURES]
+
+
+def sinal_sintetico(n=3000, seed=0):
+    """
+    Sinais dos três sensores com componentes periódicas, ruído e deriva lenta.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return np.column_stack([
+        0.3 * np.sin(2 * np.pi * t / 17) + rng.normal(scale=0.2, size=n),
+        rng.normal(scale=1.5, size=n) + np.cumsum(rng.normal(scale=0.01, size=n)),
+        9.8 + 0.5 * np.cos(2 * np.pi * t / 7) + rng.standard_t(3, size=n)
+    ])
+
+
+def features_espectrais(values, window_size, overlap, sliding_dft=True):
+    """
+    Features espectrais emitidas pelo StreamingClassifier a cada janela.
+    """
+    classifier = StreamingClassifier(None, window_size=window_size, overlap=overlap,
+                                     features=ESPECTRAIS, sliding_dft=sliding_dft)
+    linhas = [classifier.current_features()[0, ESPECTRAIS]
+              for sample in values if classifier.append(sample)]
+    return np.array(linhas)
+
+
+@pytest.mark.parametrize('window_size,overlap', [(100, 50), (101, 50), (64, 0), (256, 200)])
+def test_dft_deslizante_dentro_da_tolerancia(window_size, overlap):
+    values = sinal_sintetico()
+    janelas = window_view(values, window_size, window_size - overlap)
+    referencia = extract_features_batch(janelas, features=ESPECTRAIS)[:, ESPECTRAIS]
+
+    atual = features_espectrais(values, window_size, overlap)
+
+    assert atual.shape == referencia.shape
+    # Erro relativo à maior magnitude de cada feature (como em medir_streaming)
+    escala = np.max(np.abs(referencia), axis=0)
+    escala[escala == 0] = 1.0
+    assert np.max(np.abs(atual - referencia) / escala) <= 1e-9
+
+    dominante = [i for i, idx in enumerate(ESPECTRAIS) if FEATURE_SPECS[idx][1] == 'dominant_freq']
+    np.testing.assert_array_equal(atual[:, dominante], referencia[:, dominante])
+
+
+def test_sem_dft_deslizante_igual_ao_lote():
+    values = sinal_sintetico(n=800)
+    referencia = extract_features_batch(window_view(values, 100, 50), features=ESPECTRAIS)[:, ESPECTRAIS]
+
+    atual = features_espectrais(values, 100, 50, sliding_dft=False)
+
+    np.testing.assert_allclose(atual, referencia, rtol=1e-12, atol=1e-12)
+
+
+def test_reancoragem_limita_o_erro_acumulado():
+    window_size = 100
+    x = sinal_sintetico(n=20000)[:, 2]
+    dft = SlidingDFT(window_size, reanchor_every=5 * window_size)
+
+    for i, sample in enumerate(x):
+        dft.push(sample, x[i - window_size] if i >= window_size else 0.0)
+        if dft.needs_reanchor():
+            dft.reanchor(x[i + 1 - window_size:i + 1])
+
+    esperado = fft(x[-window_size:])[:dft.n_bins]
+    np.testing.assert_allclose(dft.bins, esperado, rtol=0, atol=1e-9 * np.max(np.abs(esperado)))
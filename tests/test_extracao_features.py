@@ -0,0 +1,90 @@
+"""
+Paridade da extração vetorizada (extracao_features) com o laço original
+janela a janela (DataProcessor.extract_features).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from classificacao_vias import DataProcessor
+from extracao_features import (FEATURE_NAMES, SENSORS, extract_features_batch,
+                               extract_features_signal, window_view)
+
+
+def sinal_sintetico(n=1237, seed=0):
+    """
+    Sinais dos três sensores com componente periódica, ruído e deriva lenta,
+    em escalas próximas às dos arquivos de ./dados.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    values = np.column_stack([
+        0.3 * np.sin(2 * np.pi * t / 17) + rng.normal(scale=0.2, size=n),
+        rng.normal(scale=1.5, size=n) + np.cumsum(rng.normal(scale=0.01, size=n)),
+        9.8 + 0.5 * np.cos(2 * np.pi * t / 41) + rng.standard_t(3, size=n)
+    ])
+    return values
+
+
+def features_laco(values, window_size, step_size):
+    """
+    Features de referência: extract_features chamado janela a janela.
+    """
+    processor = DataProcessor(window_size=window_size, overlap=window_size - step_size)
+    df = pd.DataFrame(values, columns=SENSORS)
+    linhas = [processor.extract_features(df.iloc[i:i + window_size])
+              for i in range(0, len(df) - window_size + 1, step_size)]
+    return pd.DataFrame(linhas)[FEATURE_NAMES].to_numpy(dtype=np.float64)
+
+
+@pytest.mark.parametrize('window_size,overlap', [(100, 50), (100, 0), (64, 48), (100, 90)])
+def test_lote_igual_ao_laco(window_size, overlap):
+    values = sinal_sintetico()
+    step_size = window_size - overlap
+
+    esperado = features_laco(values, window_size, step_size)
+    lote = extract_features_batch(window_view(values, window_size, step_size))
+
+    assert lote.shape == esperado.shape
+    np.testing.assert_allclose(lote, esperado, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('window_size,overlap', [(100, 50), (100, 0), (64, 48), (100, 90), (100, 33)])
+def test_sinal_continuo_igual_ao_laco(window_size, overlap):
+    values = sinal_sintetico()
+    step_size = window_size - overlap
+
+    esperado = features_laco(values, window_size, step_size)
+    sinal = extract_features_signal(values, window_size, step_size)
+
+    assert sinal.shape == esperado.shape
+    np.testing.assert_allclose(sinal, esperado, rtol=1e-9, atol=1e-9)
+
+
+def test_create_sliding_windows_lote_igual_ao_laco():
+    df = pd.DataFrame(sinal_sintetico(), columns=SENSORS)
+    df['Classe'] = 'Terra Batida'
+
+    laco = DataProcessor(window_size=100, overlap=50, batch=False).create_sliding_windows(df)
+    lote = DataProcessor(window_size=100, overlap=50, batch=True).create_sliding_windows(df)
+
+    assert list(lote.columns) == list(laco.columns) == FEATURE_NAMES + ['Classe']
+    assert (lote['Classe'] == laco['Classe']).all()
+    assert (lote.dtypes == laco.dtypes).all()
+    np.testing.assert_allclose(lote[FEATURE_NAMES].to_numpy(dtype=np.float64),
+                               laco[FEATURE_NAMES].to_numpy(dtype=np.float64),
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_features_selecionadas_preenchem_o_restante():
+    values = sinal_sintetico()
+    janelas = window_view(values, 100, 50)
+    selecionadas = [FEATURE_NAMES.index('AccX_median'), FEATURE_NAMES.index('acc_x_y_correlation')]
+
+    completo = extract_features_batch(janelas)
+    podado = extract_features_batch(janelas, features=selecionadas, fill_value=np.nan)
+
+    np.testing.assert_array_equal(podado[:, selecionadas], completo[:, selecionadas])
+    restantes = np.setdiff1d(np.arange(len(FEATURE_NAMES)), selecionadas)
+    assert np.isnan(podado[:, restantes]).all()
@@ -0,0 +1,112 @@
+"""
+Paridade da normalização incorporada ao modelo (pacote_modelo.fold_scaler)
+e da reexpressão de modelos em novas coordenadas (realign_model).
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from pacote_modelo import ModelBundle, fold_scaler
+from treinamento_incremental import realign_model
+
+
+def dados_sinteticos(n=600, seed=0):
+    """
+    Features em escalas muito diferentes (como as features de frequência e
+    de energia) e três classes.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5)) * [1e-3, 1.0, 50.0, 1e3, 3e4] + [0.0, 5.0, -20.0, 1e4, 0.0]
+    y = np.digitize(X[:, 0] / 1e-3 + X[:, 2] / 50.0 + rng.normal(scale=0.5, size=n), [-0.5, 0.5])
+    return X, y
+
+
+@pytest.mark.parametrize('model', [
+    GaussianNB(),
+    LogisticRegression(max_iter=1000),
+    SVC(kernel='linear'),
+    DecisionTreeClassifier(max_depth=6, random_state=42),
+    RandomForestClassifier(n_estimators=20, max_depth=6, random_state=42),
+    GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=42)
+], ids=lambda model: type(model).__name__)
+def test_fold_scaler_mesmas_predicoes(model):
+    X, y = dados_sinteticos()
+    # Features representáveis em float32 (como as lidas do cache): limiares exatos
+    X = X.astype(np.float32).astype(np.float64)
+    scaler = StandardScaler().fit(X[:400])
+    model.fit(scaler.transform(X[:400]), y[:400])
+
+    folded = fold_scaler(model, scaler)
+
+    np.testing.assert_array_equal(folded.predict(X[400:]), model.predict(scaler.transform(X[400:])))
+
+
+def test_fold_scaler_naive_bayes_probabilidades():
+    X, y = dados_sinteticos()
+    scaler = StandardScaler().fit(X)
+    model = GaussianNB().fit(scaler.transform(X), y)
+
+    folded = fold_scaler(model, scaler)
+
+    np.testing.assert_allclose(folded.predict_proba(X), model.predict_proba(scaler.transform(X)),
+                               rtol=1e-6, atol=1e-9)
+
+
+def test_fold_scaler_linear_mesmas_decisoes():
+    X, y = dados_sinteticos()
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+
+    folded = fold_scaler(model, scaler)
+
+    np.testing.assert_allclose(folded.decision_function(X), model.decision_function(scaler.transform(X)),
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_fold_scaler_kernel_nao_linear_falha():
+    X, y = dados_sinteticos()
+    scaler = StandardScaler().fit(X)
+    model = SVC(kernel='rbf').fit(scaler.transform(X), y)
+
+    with pytest.raises(ValueError):
+        fold_scaler(model, scaler)
+
+
+def test_pacote_com_scaler_incorporado(tmp_path):
+    X, y = dados_sinteticos()
+    X = X.astype(np.float32).astype(np.float64)
+    nomes = [f'f{i}' for i in range(X.shape[1])]
+    label_encoder = LabelEncoder().fit(np.array(['Asfalto', 'Cimento', 'Terra'])[y])
+    scaler = StandardScaler().fit(X)
+    model = DecisionTreeClassifier(max_depth=6, random_state=42).fit(scaler.transform(X), y)
+    bundle = ModelBundle(model, scaler, label_encoder, window_size=100, overlap=50,
+                         feature_mapping={f'S{i + 1}': nome for i, nome in enumerate(nomes)},
+                         feature_names=nomes)
+
+    folded = bundle.fold_scaler()
+    folded.save(tmp_path / 'modelo.bin')
+    loaded = ModelBundle.load(tmp_path / 'modelo.bin')
+
+    assert loaded.scaler is None
+    assert loaded.metadata['scaler_incorporado']
+    np.testing.assert_array_equal(loaded.predict(X), bundle.predict(X))
+
+
+def test_realign_naive_bayes_equivale_ao_treino_nas_novas_coordenadas():
+    X, y = dados_sinteticos()
+    a = np.array([2.0, 0.1, 30.0, 1.5, 1e-3])
+    c = np.array([1.0, -2.0, 0.5, 3.0, 0.0])
+
+    model = GaussianNB(var_smoothing=1e-2).fit(X, y)
+    realign_model(model, a, c)
+    expected = GaussianNB(var_smoothing=1e-2).fit(X * a + c, y)
+
+    np.testing.assert_allclose(model.theta_, expected.theta_)
+    np.testing.assert_allclose(model.var_, expected.var_)
+    assert model.epsilon_ == pytest.approx(expected.epsilon_)
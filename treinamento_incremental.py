@@ -0,0 +1,392 @@
+"""
+Treinamento Incremental - Classificação de Vias
+===============================================
+
+Atualização dos modelos a cada novo percurso gravado, sem retreinar tudo:
+- as features do percurso novo são extraídas sozinhas e anexadas ao armazém
+  (armazem_features.FeatureStore.append)
+- as estatísticas do StandardScaler são atualizadas com partial_fit
+- modelos com partial_fit (Naive Bayes, lineares com SGD) são atualizados
+  com os dados novos; florestas com warm_start ganham árvores novas
+- os demais modelos são retreinados a cada `retrain_every` percursos
+
+Quando o scaler muda, os modelos mantidos entre atualizações são
+reexpressos nas novas coordenadas (x' = a·x + c por feature): médias e
+variâncias do Naive Bayes, coeficientes dos modelos lineares e limiares das
+árvores. Os modelos retreinados por agenda guardam uma cópia do scaler com
+que foram treinados.
+
+OutOfCoreTrainer treina os modelos com partial_fit a partir de uma matriz
+de features em disco (memory-mapping, ver FeatureStore.get_arrays), em
+minilotes, com a divisão treino/teste feita por índices: a memória usada
+depende do tamanho do lote, não do número de janelas.
+"""
+
+import copy
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+
+def incremental_models(random_state=42):
+    """
+    Modelos de ModelTrainer.initialize_models com as variantes incrementais:
+    Regressão Logística e SVM linear viram SGDClassifier (log_loss / hinge)
+    e a Random Forest usa warm_start.
+    """
+    return {
+        'Random Forest': RandomForestClassifier(
+            n_estimators=100,
+            random_state=random_state,
+            n_jobs=-1,
+            warm_start=True
+        ),
+        'Gradient Boosting': GradientBoostingClassifier(
+            n_estimators=100,
+            random_state=random_state
+        ),
+        'SVM (RBF)': SVC(
+            kernel='rbf',
+            random_state=random_state
+        ),
+        'SGD (SVM Linear)': SGDClassifier(
+            loss='hinge',
+            random_state=random_state
+        ),
+        'K-Nearest Neighbors': KNeighborsClassifier(
+            n_neighbors=5
+        ),
+        'Decision Tree': DecisionTreeClassifier(
+            random_state=random_state,
+            max_depth=10,
+            min_samples_split=5,
+            min_samples_leaf=3,
+            class_weight='balanced'
+        ),
+        'Naive Bayes': GaussianNB(),
+        'SGD (Logística)': SGDClassifier(
+            loss='log_loss',
+            random_state=random_state
+        )
+    }
+
+
+def update_strategy(model):
+    """
+    Estratégia de atualização de um modelo: 'partial_fit', 'warm_start' ou
+    'retrain' (retreino completo por agenda).
+    """
+    if hasattr(model, 'partial_fit'):
+        return 'partial_fit'
+    if model.get_params().get('warm_start') and 'n_estimators' in model.get_params():
+        return 'warm_start'
+    return 'retrain'
+
+
+def realign_model(model, a, c):
+    """
+    Reexpressa um modelo treinado em features x_old nas coordenadas
+    x_new = a * x_old + c (a > 0, por feature), no próprio objeto.
+
+    Parâmetros:
+    -----------
+    model : estimador treinado
+        GaussianNB, modelo linear (coef_/intercept_) ou floresta/árvore
+    a, c : np.array
+        Escala e deslocamento de cada feature
+
+    Retorna:
+    --------
+    bool
+        True se o modelo foi reexpresso
+    """
+    if isinstance(model, GaussianNB):
+        # var_ inclui epsilon_ (var_smoothing * maior variância dos dados),
+        # que é recalculado nas novas unidades a partir das estatísticas por
+        # classe, como partial_fit faria (pacote_modelo.fold_scaler, que
+        # precisa das mesmas predições, escala epsilon_ junto com var_)
+        model.theta_[:] = model.theta_ * a + c
+        class_var = (model.var_ - model.epsilon_) * a ** 2
+        weights = (model.class_count_ / model.class_count_.sum())[:, None]
+        mean = (weights * model.theta_).sum(axis=0)
+        total_var = (weights * (class_var + (model.theta_ - mean) ** 2)).sum(axis=0)
+        model.epsilon_ = model.var_smoothing * total_var.max()
+        model.var_[:] = class_var + model.epsilon_
+        return True
+
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        # w·x_old + b = (w/a)·x_new + b - (w/a)·c
+        coef = model.coef_ / a
+        model.intercept_[:] = model.intercept_ - coef @ c
+        model.coef_[:] = coef
+        return True
+
+    trees = model.estimators_ if hasattr(model, 'estimators_') else [model]
+    if all(hasattr(tree, 'tree_') for tree in trees):
+        for tree in trees:
+            feature = tree.tree_.feature
+            internal = feature >= 0
+            threshold = tree.tree_.threshold
+            threshold[internal] = threshold[internal] * a[feature[internal]] + c[feature[internal]]
+        return True
+
+    return False
+
+
+class IncrementalTrainer:
+    """
+    Mantém scaler e modelos atualizados a cada novo percurso.
+    """
+
+    def __init__(self, models=None, retrain_every=3, trees_per_update=10, random_state=42):
+        """
+        Parâmetros:
+        -----------
+        models : dict, opcional
+            {nome: estimador não treinado} (incremental_models() por padrão)
+        retrain_every : int
+            Número de percursos entre retreinos completos dos modelos sem
+            atualização incremental
+        trees_per_update : int
+            Árvores acrescentadas às florestas com warm_start por percurso
+        random_state : int
+            Seed para reprodutibilidade
+        """
+        self.models = models if models is not None else incremental_models(random_state)
+        self.retrain_every = retrain_every
+        self.trees_per_update = trees_per_update
+        self.scaler = StandardScaler()
+        self.model_scalers = {}
+        self.updates = 0
+
+    def fit(self, X, y):
+        """
+        Treinamento inicial de todos os modelos (deve conter todas as classes).
+
+        Parâmetros:
+        -----------
+        X : np.array
+            Features (não normalizadas)
+        y : np.array
+            Rótulos das classes
+        """
+        X = np.asarray(X, dtype=np.float64)
+        X_scaled = self.scaler.fit_transform(X)
+        for name, model in self.models.items():
+            model.fit(X_scaled, y)
+            if update_strategy(model) == 'retrain':
+                self.model_scalers[name] = copy.deepcopy(self.scaler)
+        return self
+
+    def update(self, X_new, y_new, X_all, y_all):
+        """
+        Atualiza scaler e modelos com as janelas de um novo percurso.
+
+        Parâmetros:
+        -----------
+        X_new, y_new : np.array
+            Features (não normalizadas) e rótulos do percurso novo
+        X_all, y_all : np.array
+            Todas as janelas acumuladas, incluindo as novas (usadas pelas
+            florestas com warm_start e pelos retreinos agendados)
+
+        Retorna:
+        --------
+        dict
+            Tempo (s) de cada etapa: 'scaler' e um item por modelo
+        """
+        X_new = np.asarray(X_new, dtype=np.float64)
+        self.updates += 1
+        retrain = self.updates % self.retrain_every == 0
+        timings = {}
+
+        # Estatísticas do scaler e reexpressão dos modelos mantidos
+        start = time.perf_counter()
+        old_mean, old_scale = self.scaler.mean_.copy(), self.scaler.scale_.copy()
+        self.scaler.partial_fit(X_new)
+        a = old_scale / self.scaler.scale_
+        c = (old_mean - self.scaler.mean_) / self.scaler.scale_
+        X_new_scaled = self.scaler.transform(X_new)
+        timings['scaler'] = time.perf_counter() - start
+
+        X_all_scaled = None
+        for name, model in self.models.items():
+            start = time.perf_counter()
+            strategy = update_strategy(model)
+
+            if strategy == 'partial_fit':
+                realign_model(model, a, c)
+                model.partial_fit(X_new_scaled, y_new)
+            elif strategy == 'warm_start':
+                realign_model(model, a, c)
+                if X_all_scaled is None:
+                    X_all_scaled = self.scaler.transform(np.asarray(X_all, dtype=np.float64))
+                model.set_params(n_estimators=model.n_estimators + self.trees_per_update)
+                model.fit(X_all_scaled, y_all)
+            elif retrain:
+                if X_all_scaled is None:
+                    X_all_scaled = self.scaler.transform(np.asarray(X_all, dtype=np.float64))
+                self.models[name] = clone(model).fit(X_all_scaled, y_all)
+                self.model_scalers[name] = copy.deepcopy(self.scaler)
+
+            timings[name] = time.perf_counter() - start
+        return timings
+
+    def predict(self, name, X):
+        """
+        Predição do modelo `name` para features não normalizadas.
+        """
+        scaler = self.model_scalers.get(name, self.scaler)
+        return self.models[name].predict(scaler.transform(np.asarray(X, dtype=np.float64)))
+
+
+class OutOfCoreTrainer:
+    """
+    Treinamento em minilotes a partir de uma matriz de features em disco.
+    """
+
+    def __init__(self, models=None, batch_size=65536, epochs=3, random_state=42):
+        """
+        Parâmetros:
+        -----------
+        models : dict, opcional
+            {nome: estimador com partial_fit} (os modelos 'partial_fit' de
+            incremental_models() por padrão)
+        batch_size : int
+            Janelas por minilote
+        epochs : int
+            Passadas sobre o conjunto de treino (GaussianNB acumula
+            estatísticas exatas e usa só a primeira)
+        random_state : int
+            Seed da divisão treino/teste e da ordem dos lotes
+        """
+        if models is None:
+            models = {name: model for name, model in incremental_models(random_state).items()
+                      if update_strategy(model) == 'partial_fit'}
+        self.models = models
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.random_state = random_state
+        self.scaler = StandardScaler()
+        self.peak_memory = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Registra em self.peak_memory o pico de memória alocada (tracemalloc)
+        acima do que já estava em uso no início da etapa.
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            self.peak_memory[name] = tracemalloc.get_traced_memory()[1] - baseline
+            if started:
+                tracemalloc.stop()
+
+    def split(self, codes, test_size=0.3):
+        """
+        Divisão treino/teste estratificada por índices (sem copiar features).
+
+        Os índices usam int32 sempre que possível: 4 bytes por janela, contra
+        ~500 bytes por janela da matriz de 62 features em float64.
+
+        Retorna:
+        --------
+        tuple
+            (train_idx, test_idx), ordenados para leitura sequencial do disco
+        """
+        with self.stage('divisao'):
+            rng = np.random.RandomState(self.random_state)
+            index_dtype = np.int32 if len(codes) < np.iinfo(np.int32).max else np.int64
+            is_test = np.zeros(len(codes), dtype=bool)
+            for c in np.unique(codes):
+                idx = np.flatnonzero(codes == c).astype(index_dtype)
+                rng.shuffle(idx)
+                is_test[idx[:int(round(test_size * len(idx)))]] = True
+                del idx
+            train_idx = np.flatnonzero(~is_test).astype(index_dtype)
+            test_idx = np.flatnonzero(is_test).astype(index_dtype)
+        return train_idx, test_idx
+
+    def batches(self, idx, rng=None):
+        """
+        Minilotes de índices. Com rng, as janelas são embaralhadas (lotes com
+        todas as classes mesmo se o armazém estiver ordenado por arquivo);
+        cada lote é ordenado para leitura sequencial do disco.
+        """
+        order = rng.permutation(idx) if rng is not None else idx
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            yield np.sort(batch) if rng is not None else batch
+
+    def fit(self, features, codes, train_idx):
+        """
+        Ajusta o scaler (partial_fit) e os modelos em minilotes.
+
+        Parâmetros:
+        -----------
+        features : np.array or np.memmap
+            Matriz (n_janelas, n_features), tipicamente em disco
+        codes : np.array
+            Código inteiro da classe de cada janela
+        train_idx : np.array
+            Índices das janelas de treino
+        """
+        classes = np.unique(codes)
+
+        with self.stage('scaler'):
+            for batch in self.batches(train_idx):
+                self.scaler.partial_fit(features[batch])
+
+        with self.stage('treino'):
+            rng = np.random.RandomState(self.random_state)
+            for epoch in range(self.epochs):
+                for batch in self.batches(train_idx, rng):
+                    X = self.scaler.transform(features[batch])
+                    y = codes[batch]
+                    for model in self.models.values():
+                        if epoch > 0 and isinstance(model, GaussianNB):
+                            continue
+                        model.partial_fit(X, y, classes=classes)
+        return self
+
+    def evaluate(self, features, codes, test_idx):
+        """
+        Acurácia e F1 ponderado de cada modelo, predizendo em minilotes.
+
+        Retorna:
+        --------
+        dict
+            {nome: {'accuracy', 'f1_score'}}
+        """
+        with self.stage('avaliacao'):
+            y_pred = {name: np.empty(len(test_idx), dtype=codes.dtype) for name in self.models}
+            pos = 0
+            for batch in self.batches(test_idx):
+                X = self.scaler.transform(features[batch])
+                for name, model in self.models.items():
+                    y_pred[name][pos:pos + len(batch)] = model.predict(X)
+                pos += len(batch)
+
+            y_test = np.asarray(codes[test_idx])
+            return {
+                name: {'accuracy': accuracy_score(y_test, pred),
+                       'f1_score': f1_score(y_test, pred, average='weighted')}
+                for name, pred in y_pred.items()
+            }
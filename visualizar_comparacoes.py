@@ -18,6 +18,8 @@ import seaborn as sns
 from pathlib import Path
 import warnings
 
+from cache_dados import load_sensor_data
+
 warnings.filterwarnings('ignore')
 
 # Configurações de estilo
@@ -98,7 +100,7 @@ class VisualizadorComparativo:
         for tipo, arquivo in arquivos.items():
             caminho = self.dados_path / arquivo
             if caminho.exists():
-                df = pd.read_csv(caminho)
+                df = load_sensor_data(caminho)
                 dados[tipo] = df
                 print(f"  ✓ {tipo}: {len(df)} amostras")
             else: